@@ -0,0 +1,118 @@
+"""
+Benchmark: CPU cost per broadcast event vs. number of spectators.
+
+Compares the old per-socket `send_json` path (encode once per spectator)
+with the Broadcaster's serialize-once frames. Sockets are in-memory fakes,
+so the numbers are pure server-side CPU: encoding plus fan-out bookkeeping.
+
+Run with: python benchmarks/bench_broadcast.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from crucible.broadcaster import Broadcaster, Frame
+from crucible.encoding import backend
+from crucible.games import Chess
+
+
+class FakeSocket:
+    """Accepts frames instantly, like a fast client."""
+    
+    def __init__(self):
+        self.frames = 0
+    
+    async def send_text(self, text: str):
+        self.frames += 1
+    
+    async def send_json(self, data: dict):
+        # What Starlette's WebSocket.send_json does per call
+        text = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+        await self.send_text(text)
+
+
+def sample_event() -> dict:
+    """A typical mini_game_move broadcast (chess carries the largest state)."""
+    game = Chess("bot1", "bot2")
+    return {
+        "type": "mini_game_move",
+        "game_id": "game_1",
+        "player": "GLTCH_Prime",
+        "move": "e2e4",
+        "state": game.get_state(),
+    }
+
+
+def bench_encode_only(spectators: int, events: int) -> tuple[float, float]:
+    """Encoding CPU alone: once per socket vs. once per event."""
+    message = sample_event()
+    start = time.process_time()
+    for _ in range(events):
+        for _ in range(spectators):
+            json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+    per_socket = (time.process_time() - start) / events
+    start = time.process_time()
+    for _ in range(events):
+        Frame.encode(message)
+    once = (time.process_time() - start) / events
+    return per_socket, once
+
+
+async def bench_per_socket(spectators: int, events: int) -> float:
+    """End to end: the old ConnectionManager.broadcast loop."""
+    sockets = [FakeSocket() for _ in range(spectators)]
+    message = sample_event()
+    start = time.process_time()
+    for _ in range(events):
+        for ws in sockets:
+            await ws.send_json(message)
+    return (time.process_time() - start) / events
+
+
+async def bench_serialize_once(spectators: int, events: int) -> float:
+    """End to end: publish, pump, and per-spectator writer tasks."""
+    broadcaster = Broadcaster(max_queue=events + 1)
+    sockets = [FakeSocket() for _ in range(spectators)]
+    for ws in sockets:
+        broadcaster.subscribe(ws)
+    await asyncio.sleep(0)
+    message = sample_event()
+    start = time.process_time()
+    for i in range(1, events + 1):
+        broadcaster.publish(message)
+        while sockets[-1].frames < i:
+            await asyncio.sleep(0)
+    elapsed = (time.process_time() - start) / events
+    for ws in sockets:
+        broadcaster.unsubscribe(ws)
+    broadcaster._pump_task.cancel()
+    await asyncio.sleep(0)
+    return elapsed
+
+
+async def main():
+    print(f"JSON encoder: {backend()}")
+    print(f"Event size: {len(Frame.encode(sample_event()).text)} bytes")
+    print()
+    header = f"{'spectators':>10} {'per-socket ms/event':>20} {'serialize-once ms/event':>24} {'speedup':>8}"
+    print("Encoding only")
+    print(header)
+    for spectators, events in [(1_000, 50), (10_000, 10)]:
+        old, new = bench_encode_only(spectators, events)
+        print(f"{spectators:>10} {old * 1000:>20.3f} {new * 1000:>24.3f} {old / new:>7.0f}x")
+    print()
+    print("End to end (encode + fan-out + writer tasks)")
+    print(header)
+    for spectators, events in [(1_000, 50), (10_000, 10)]:
+        old = await bench_per_socket(spectators, events)
+        new = await bench_serialize_once(spectators, events)
+        print(f"{spectators:>10} {old * 1000:>20.2f} {new * 1000:>24.2f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
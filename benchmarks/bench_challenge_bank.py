@@ -0,0 +1,84 @@
+"""
+Benchmark: challenge bank startup and selection.
+
+Writes a synthetic bank of N challenges (JSON Lines) to a temp directory,
+then times the index scan, weighted picks, and a match's worth of
+no-repeat picks through a sampler - including a sampler that drains a
+whole bucket.
+
+Run with: python benchmarks/bench_challenge_bank.py [n_challenges]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from crucible.challenge_bank import ChallengeBank
+
+TYPES = ("trivia", "logic_puzzle", "code_golf")
+TAGS = ("history", "networking", "algorithms", "languages", "math")
+
+
+def write_bank(directory: str, n: int):
+    rng = random.Random(1)
+    for kind in TYPES:
+        with open(os.path.join(directory, f"{kind}.jsonl"), "w") as f:
+            for i in range(n // len(TYPES)):
+                f.write(json.dumps({
+                    "id": f"{kind}-{i}",
+                    "type": kind,
+                    "difficulty": rng.randint(1, 10),
+                    "tags": rng.sample(TAGS, 2),
+                    "weight": rng.choice((0.5, 1.0, 1.0, 2.0)),
+                    "q": f"Synthetic question {i}? " + "x" * 200,
+                    "a": str(i),
+                }) + "\n")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 60_000
+    with tempfile.TemporaryDirectory() as directory:
+        write_bank(directory, n)
+        
+        start = time.perf_counter()
+        bank = ChallengeBank(directory)
+        count = len(bank)
+        print(f"index scan: {count} challenges in {(time.perf_counter() - start) * 1000:.0f} ms")
+        
+        picks = 100_000
+        start = time.perf_counter()
+        for _ in range(picks):
+            bank.pick("trivia", 5)
+        print(f"weighted pick: {(time.perf_counter() - start) / picks * 1e6:.2f} us")
+        
+        start = time.perf_counter()
+        for _ in range(picks // 10):
+            bank.pick("trivia", 5, tag="history")
+        print(f"tagged pick: {(time.perf_counter() - start) / (picks // 10) * 1e6:.2f} us")
+        
+        sampler = bank.sampler()
+        start = time.perf_counter()
+        for _ in range(50):
+            sampler.pick(random.choice(TYPES), random.randint(1, 10))
+        print(f"match (50 no-repeat picks): {(time.perf_counter() - start) * 1000:.2f} ms")
+        
+        bucket_size = len(bank.candidates("trivia", 5)[0].entries)
+        sampler = bank.sampler()
+        start = time.perf_counter()
+        seen = {sampler.pick("trivia", 5).id for _ in range(bucket_size)}
+        elapsed = time.perf_counter() - start
+        print(f"drain a {bucket_size}-entry bucket: {elapsed * 1000:.0f} ms, {len(seen)} distinct")
+        
+        start = time.perf_counter()
+        for entry in (bank.pick("code_golf", 3) for _ in range(1000)):
+            bank.body(entry)
+        print(f"lazy body load: {(time.perf_counter() - start):.3f} ms per body")
+
+
+if __name__ == "__main__":
+    main()
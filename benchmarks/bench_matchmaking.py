@@ -0,0 +1,56 @@
+"""
+Benchmark: rating queue operations with a large queue.
+
+Fills a RatingQueue with N agents (ratings ~ N(1200, 300)), then times
+inserts/removes, match decisions (find and pop the best opponent) and the
+periodic widening re-check.
+
+Run with: python benchmarks/bench_matchmaking.py [n_agents]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from crucible.matchmaking import RatingQueue
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    rng = random.Random(1)
+    queue = RatingQueue()
+    
+    start = time.perf_counter()
+    for i in range(n):
+        queue.add(f"agent{i}", rng.gauss(1200, 300), i * 0.01)
+    elapsed = time.perf_counter() - start
+    print(f"insert: {elapsed / n * 1e6:.1f} us/agent ({n} queued, {queue.get_stats(n * 0.01)['bands']} bands)")
+    
+    now = n * 0.01
+    queue.widened(now)
+    start = time.perf_counter()
+    due = queue.widened(now + 1.0)
+    print(f"widening re-check (1 s later): {(time.perf_counter() - start) * 1000:.2f} ms, {len(due)} agents due")
+    
+    ids = list(queue.entries)
+    rng.shuffle(ids)
+    decisions = pairs = 0
+    worst = 0.0
+    start = time.perf_counter()
+    for agent_id in ids:
+        if agent_id not in queue:
+            continue
+        t = time.perf_counter()
+        pairs += queue.pop_pair(agent_id, now + 30) is not None
+        worst = max(worst, time.perf_counter() - t)
+        decisions += 1
+    elapsed = time.perf_counter() - start
+    print(f"match decision: {elapsed / decisions * 1e6:.1f} us avg, {worst * 1e6:.0f} us worst "
+          f"({pairs} pairs, {len(queue)} left unmatched)")
+
+
+if __name__ == "__main__":
+    main()
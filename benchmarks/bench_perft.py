@@ -0,0 +1,51 @@
+"""
+Benchmark: chess move generation speed (perft).
+
+Counts the leaf nodes of the legal move tree for the standard perft test
+positions, checks them against the published node counts, and reports
+nodes per second. A wrong count means move generation is broken.
+
+Run with: python benchmarks/bench_perft.py [max_depth]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from crucible.chess_engine import START_FEN, ChessBoard, perft
+
+# (name, fen, expected node counts for depth 1, 2, ...)
+POSITIONS = [
+    ("start", START_FEN, [20, 400, 8902, 197281]),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", [48, 2039, 97862]),
+    ("endgame", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", [14, 191, 2812, 43238]),
+    ("promotions", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", [6, 264, 9467]),
+    ("tricky", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", [44, 1486, 62379]),
+]
+
+
+def main():
+    max_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    print(f"{'position':<12} {'depth':>5} {'nodes':>10} {'seconds':>8} {'nodes/s':>10}")
+    total_nodes, total_time, failures = 0, 0.0, 0
+    for name, fen, expected in POSITIONS:
+        board = ChessBoard(fen)
+        for depth, want in enumerate(expected[:max_depth], 1):
+            start = time.perf_counter()
+            nodes = perft(board, depth)
+            elapsed = time.perf_counter() - start
+            total_nodes += nodes
+            total_time += elapsed
+            status = "" if nodes == want else f"  MISMATCH (expected {want})"
+            failures += nodes != want
+            print(f"{name:<12} {depth:>5} {nodes:>10} {elapsed:>8.3f} {nodes / max(elapsed, 1e-9):>10.0f}{status}")
+    print()
+    print(f"Total: {total_nodes} nodes in {total_time:.2f}s ({total_nodes / total_time:,.0f} nodes/s)")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark: search bot throughput (nodes/second) per game.
+
+Runs fixed-depth searches from the opening position of each searchable
+game with a fresh transposition table, then a timed move budget, and
+reports nodes, time, nodes/s and transposition-table hit rate.
+
+Run with: python benchmarks/bench_search.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from crucible.checkers_engine import CheckersBoard
+from crucible.chess_engine import ChessBoard
+from crucible.search import (
+    CheckersRules, ChessRules, Searcher, TicTacToePosition, TicTacToeRules,
+)
+
+CASES = [
+    ("tic_tac_toe", TicTacToeRules, TicTacToePosition, 9),
+    ("chess", ChessRules, ChessBoard, 4),
+    ("checkers", CheckersRules, CheckersBoard, 8),
+]
+
+
+def main():
+    print(f"{'game':<12} {'depth':>5} {'nodes':>10} {'seconds':>8} {'nodes/s':>10} {'tt hits':>8}")
+    for name, rules, position, depth in CASES:
+        searcher = Searcher(rules())
+        start = time.perf_counter()
+        searcher.search(position(), max_depth=depth, time_budget=float("inf"))
+        elapsed = time.perf_counter() - start
+        stats = searcher.get_stats()
+        print(f"{name:<12} {searcher.depth_reached:>5} {stats['nodes']:>10} {elapsed:>8.3f} "
+              f"{stats['nodes'] / elapsed:>10.0f} {stats['tt_hit_rate']:>8.1%}")
+    print()
+    print("Depth reached in a 50 ms move budget")
+    for name, rules, position, _ in CASES[1:]:  # Tic-tac-toe is solved at depth 9
+        searcher = Searcher(rules())
+        searcher.search(position(), max_depth=64, time_budget=0.05)
+        print(f"{name:<12} {searcher.depth_reached:>5}")
+
+
+if __name__ == "__main__":
+    main()
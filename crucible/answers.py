@@ -0,0 +1,82 @@
+"""
+Answers - Collect tribute answers for a challenge round.
+
+A round resolves as soon as every expected tribute has answered, or when
+its deadline passes, whichever comes first. Each submission records how
+long after the round opened it arrived.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+from .clock import Clock, real_clock
+
+
+@dataclass
+class Submission:
+    """One tribute's answer to a round."""
+    tribute_id: str
+    answer: Any
+    latency_ms: int
+    received_at: datetime = field(default_factory=datetime.now)
+
+
+class AnswerRound:
+    """Answers for one challenge, from a fixed set of tributes."""
+    
+    def __init__(self, expected: Iterable[str], time_limit: float, clock: Optional[Clock] = None):
+        self.clock = clock or real_clock
+        self.expected: set[str] = set(expected)
+        self.time_limit = time_limit
+        self.started = self.clock.now()
+        self.submissions: dict[str, Submission] = {}
+        self.closed = False
+        self._complete = asyncio.Event()
+        if not self.expected:
+            self._complete.set()
+    
+    def submit(self, tribute_id: str, answer: Any) -> str:
+        """
+        Record an answer. Returns "accepted", or why it was rejected:
+        "closed", "not_in_round" or "already_answered".
+        """
+        if self.closed:
+            return "closed"
+        if tribute_id not in self.expected:
+            return "not_in_round"
+        if tribute_id in self.submissions:
+            return "already_answered"
+        
+        self.submissions[tribute_id] = Submission(
+            tribute_id=tribute_id,
+            answer=answer,
+            latency_ms=int((self.clock.now() - self.started) * 1000),
+        )
+        if self.expected.issubset(self.submissions):
+            self._complete.set()
+        return "accepted"
+    
+    def withdraw(self, tribute_id: str):
+        """Stop waiting for a tribute (e.g. it disconnected or died)."""
+        self.expected.discard(tribute_id)
+        if self.expected.issubset(self.submissions):
+            self._complete.set()
+    
+    async def wait(self) -> dict[str, Submission]:
+        """Wait for all answers or the deadline, then close the round."""
+        remaining = self.time_limit - (self.clock.now() - self.started)
+        try:
+            await self.clock.wait_for(self._complete.wait(), timeout=max(0, remaining))
+        except asyncio.TimeoutError:
+            pass
+        self.closed = True
+        return self.submissions
+    
+    def missing(self) -> set[str]:
+        """Tributes that never answered."""
+        return self.expected - set(self.submissions)
+    
+    def duration_ms(self) -> int:
+        return int((self.clock.now() - self.started) * 1000)
@@ -3,12 +3,15 @@ Arena - Main orchestrator for matches and spectators.
 """
 
 import asyncio
-from typing import Optional
+from typing import Callable, Iterable, Optional
 from datetime import datetime
 
+from .encoding import dumpb
 from .tribute import Tribute, TributeType
 from .match import Match, MatchPhase
 from .game_master import GameMaster
+from .clock import Clock, real_clock
+from .expiry import scheduler_for
 
 
 class Arena:
@@ -16,11 +19,34 @@ class Arena:
     The Arena manages active matches, matchmaking queue, and spectators.
     """
     
-    def __init__(self):
+    FINISHED_TTL = 300.0  # Keep a finished match's data for 5 minutes
+    MAX_FINISHED = 1000  # ...but no more than this many finished matches
+    
+    def __init__(self, clock: Optional[Clock] = None):
+        self.clock = clock or real_clock
         self.active_matches: dict[str, Match] = {}
         self.game_masters: dict[str, GameMaster] = {}
         self.queue: list[Tribute] = []
         self.leaderboard: dict[str, dict] = {}  # wallet_address -> stats
+        self.tribute_matches: dict[str, str] = {}  # tribute_id -> match_id
+        
+        # Set by the server: spectator broadcast and per-tribute delivery
+        self.broadcast: Optional[Callable] = None
+        self.send_to_tribute: Optional[Callable] = None
+        
+        # Bumped whenever the queue, the set of matches or the leaderboard
+        # changes. Changes inside a match are tracked by its own seq.
+        self.version = 0
+        
+        # Pre-serialized to_dict() JSON per match, tagged with the match seq
+        # it was rendered at. Re-rendered only when the match has changed.
+        self._fragments: dict[str, tuple[int, bytes]] = {}
+        self.fragment_renders = 0
+        
+        # Finished matches are evicted by the shared expiry scheduler
+        self.finished = scheduler_for(self.clock).store(
+            "matches", self.FINISHED_TTL, self._evict_match, self.MAX_FINISHED,
+        )
         
         # Settings
         self.min_tributes = 4
@@ -35,6 +61,7 @@ class Arena:
             return {"error": "Already in queue"}
         
         self.queue.append(tribute)
+        self.version += 1
         
         # Check if we can start a match
         if len(self.queue) >= self.min_tributes:
@@ -62,11 +89,15 @@ class Arena:
         
         for tribute in tributes:
             match.add_tribute(tribute)
+            self.tribute_matches[tribute.id] = match.id
         
         self.active_matches[match.id] = match
+        self.version += 1
         
         # Create game master
-        gm = GameMaster(match)
+        gm = GameMaster(match, clock=self.clock)
+        gm.broadcast_callback = self.broadcast
+        gm.send_callback = self.send_to_tribute
         self.game_masters[match.id] = gm
         
         # Start match in background
@@ -89,12 +120,22 @@ class Arena:
                 await self._update_leaderboard(match)
             
             # Cleanup after some time
-            await asyncio.sleep(300)  # Keep match data for 5 minutes
-            self.active_matches.pop(match_id, None)
-            self.game_masters.pop(match_id, None)
+            self.finished.expire(match_id)
+    
+    def _evict_match(self, match_id: str):
+        """Drop a finished match and everything indexed by it."""
+        match = self.active_matches.pop(match_id, None)
+        self.game_masters.pop(match_id, None)
+        if match:
+            for tribute in match.tributes:
+                if self.tribute_matches.get(tribute.id) == match_id:
+                    del self.tribute_matches[tribute.id]
+        self._fragments.pop(match_id, None)
+        self.version += 1
     
     async def _update_leaderboard(self, match: Match):
         """Update leaderboard after match completion."""
+        self.version += 1
         for tribute in match.tributes:
             if tribute.wallet_address not in self.leaderboard:
                 self.leaderboard[tribute.wallet_address] = {
@@ -117,6 +158,32 @@ class Arena:
                 stats["losses"] += 1
                 stats["elo"] = max(0, stats["elo"] - 15)
     
+    def matches_version(self) -> str:
+        """
+        Changes whenever get_active_matches() would return something new.
+        Both parts only ever grow, so their pair never repeats.
+        """
+        return f"{self.version}.{sum(m.seq for m in self.active_matches.values())}"
+    
+    def submit_answer(self, tribute_id: str, answer, match_id: Optional[str] = None) -> str:
+        """
+        Route a tribute's answer to its match's open round.
+        Returns "accepted" or the reason it was rejected.
+        """
+        match_id = match_id or self.tribute_matches.get(tribute_id)
+        gm = self.game_masters.get(match_id) if match_id else None
+        if not gm:
+            return "no_match"
+        return gm.submit_answer(tribute_id, answer)
+    
+    async def forfeit(self, tribute_id: str, reason: str = "went silent") -> bool:
+        """Eliminate a tribute from the match it is playing (e.g. its connection died)."""
+        match_id = self.tribute_matches.get(tribute_id)
+        gm = self.game_masters.get(match_id) if match_id else None
+        if not gm:
+            return False
+        return await gm.forfeit(tribute_id, reason)
+    
     def get_match(self, match_id: str) -> Optional[Match]:
         """Get a match by ID."""
         return self.active_matches.get(match_id)
@@ -125,6 +192,34 @@ class Arena:
         """Get all active matches."""
         return [m.to_dict() for m in self.active_matches.values()]
     
+    def _match_fragment(self, match: Match) -> bytes:
+        """JSON for one match, re-rendered only if it changed since last time."""
+        cached = self._fragments.get(match.id)
+        if cached and cached[0] == match.seq:
+            return cached[1]
+        fragment = dumpb(match.to_dict())
+        self._fragments[match.id] = (match.seq, fragment)
+        self.fragment_renders += 1
+        return fragment
+    
+    def get_active_matches_json(self, match_ids: Optional[Iterable[str]] = None) -> bytes:
+        """
+        get_active_matches() as a JSON array, stitched from cached fragments.
+        Pass match_ids to only include those matches.
+        """
+        if match_ids is None:
+            matches = list(self.active_matches.values())
+        else:
+            matches = [self.active_matches[i] for i in match_ids if i in self.active_matches]
+        
+        # Drop fragments of matches removed without going through _run_match
+        if len(self._fragments) > len(self.active_matches):
+            for match_id in list(self._fragments):
+                if match_id not in self.active_matches:
+                    del self._fragments[match_id]
+        
+        return b"[" + b",".join(self._match_fragment(m) for m in matches) + b"]"
+    
     def get_leaderboard(self, limit: int = 20) -> list[dict]:
         """Get top players by ELO."""
         sorted_players = sorted(
@@ -0,0 +1,346 @@
+"""
+Broadcaster - Non-blocking fan-out of arena events to spectator sockets.
+
+Producers (GameMaster, Matchmaker, the simulators) hand a message to
+`Broadcaster.publish`, which only appends it to a pending list. A single pump
+task copies each message into every subscriber's bounded outbox, and each
+subscriber has its own writer task draining that outbox onto the socket. A
+stalled browser tab therefore only ever fills its own outbox.
+
+Each message is JSON-encoded once, by the pump, and the same text frame is
+shared by every outbox, so encoding cost does not grow with spectator count.
+
+Subscribers only receive the topics they asked for. Every message maps to
+one topic: `match:<match_id>`, `game:<game_id>` or `lobby` for queue traffic.
+Subscribers may also use `match:*`, `game:*` or `*` for everything, which is
+the default so existing clients keep working.
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Optional
+
+from .encoding import backend, dumps
+
+
+class SlowConsumerPolicy(Enum):
+    """What to do when a subscriber's outbox is full."""
+    DROP_OLDEST = "drop_oldest"   # Discard the oldest queued message
+    COALESCE = "coalesce"         # Replace a queued state snapshot for the same game
+    DISCONNECT = "disconnect"     # Close the socket, the client can reconnect
+
+
+# Message types whose payload is a full state snapshot, so a newer one
+# makes an older queued one for the same match/game redundant.
+COALESCABLE_TYPES = {"game_move", "mini_game_move", "queue_update"}
+
+
+ALL_TOPICS = "*"
+LOBBY_TOPIC = "lobby"
+
+
+def topic_for(message: Any) -> str:
+    """Topic a broadcast message is published under."""
+    if isinstance(message, dict):
+        if message.get("match_id"):
+            return f"match:{message['match_id']}"
+        if message.get("game_id"):
+            return f"game:{message['game_id']}"
+    return LOBBY_TOPIC
+
+
+def wildcard_for(topic: str) -> Optional[str]:
+    """The `kind:*` topic that also covers a concrete topic."""
+    kind, sep, _ = topic.partition(":")
+    return f"{kind}:*" if sep else None
+
+
+def coalesce_key(message: Any) -> Optional[tuple]:
+    """Key under which a queued message may be replaced by a newer one."""
+    if not isinstance(message, dict) or message.get("type") not in COALESCABLE_TYPES:
+        return None
+    return (message["type"], message.get("match_id") or message.get("game_id"))
+
+
+@dataclass(frozen=True)
+class Frame:
+    """An encoded message, shared by every outbox it is queued in."""
+    text: str
+    key: Optional[tuple] = None
+    
+    @classmethod
+    def encode(cls, message: Any) -> "Frame":
+        if isinstance(message, str):
+            return cls(text=message)
+        return cls(text=dumps(message), key=coalesce_key(message))
+
+
+class Subscriber:
+    """A spectator socket with its own bounded outbox and writer task."""
+    
+    def __init__(
+        self,
+        websocket,
+        max_queue: int = 256,
+        policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST,
+        on_close: Optional[Callable[["Subscriber"], None]] = None,
+    ):
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.policy = policy
+        self.outbox: deque = deque()
+        self.dropped = 0
+        self.coalesced = 0
+        self.topics: set[str] = set()
+        self.closed = False
+        self._on_close = on_close
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start the writer task."""
+        self._task = asyncio.create_task(self._writer())
+    
+    def offer(self, frame: Frame) -> bool:
+        """
+        Queue a frame without blocking.
+        Returns False if the subscriber should be disconnected.
+        """
+        if self.closed:
+            return False
+        
+        if len(self.outbox) >= self.max_queue:
+            if self.policy == SlowConsumerPolicy.DISCONNECT:
+                return False
+            if self.policy == SlowConsumerPolicy.COALESCE and self._coalesce(frame):
+                return True
+            self.outbox.popleft()
+            self.dropped += 1
+        
+        self.outbox.append(frame)
+        self._wakeup.set()
+        return True
+    
+    def _coalesce(self, frame: Frame) -> bool:
+        """Overwrite the newest queued frame with the same key, if any."""
+        if frame.key is None:
+            return False
+        for i in range(len(self.outbox) - 1, -1, -1):
+            if self.outbox[i].key == frame.key:
+                del self.outbox[i]
+                self.outbox.append(frame)
+                self.coalesced += 1
+                return True
+        return False
+    
+    async def _writer(self):
+        """Drain the outbox onto the socket, one message at a time."""
+        try:
+            while True:
+                while not self.outbox:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                frame = self.outbox.popleft()
+                await self.websocket.send_text(frame.text)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            # Socket is gone - the receive loop will notice too
+            pass
+        finally:
+            self._finish()
+    
+    def close(self):
+        """Stop writing and close the socket."""
+        if self.closed:
+            return
+        if self._task and not self._task.done():
+            self._task.cancel()
+        else:
+            self._finish()
+        asyncio.create_task(self._close_socket())
+    
+    async def _close_socket(self):
+        try:
+            await self.websocket.close()
+        except Exception:
+            pass
+    
+    def _finish(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.outbox.clear()
+        if self._on_close:
+            self._on_close(self)
+
+
+class Broadcaster:
+    """Fan messages out to topic subscribers through a single pump task."""
+    
+    def __init__(
+        self,
+        max_queue: int = 256,
+        policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST,
+    ):
+        self.max_queue = max_queue
+        self.policy = policy
+        self.subscribers: dict[Any, Subscriber] = {}  # websocket -> subscriber
+        self.topics: dict[str, set[Subscriber]] = {}  # topic -> subscribers
+        self.disconnected_slow = 0
+        self.frames_encoded = 0
+        self.unencodable = 0  # Messages dropped because they couldn't be serialized
+        # Drop counters of subscribers that have left, so totals never go down
+        self._dropped_closed = 0
+        self._coalesced_closed = 0
+        self._pending: deque = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._pump_task: Optional[asyncio.Task] = None
+    
+    def __len__(self) -> int:
+        return len(self.subscribers)
+    
+    def subscribe(self, websocket, topics: Optional[set[str]] = None) -> Subscriber:
+        """Register an (already accepted) socket and start its writer."""
+        subscriber = Subscriber(
+            websocket,
+            max_queue=self.max_queue,
+            policy=self.policy,
+            on_close=self._forget,
+        )
+        self.subscribers[websocket] = subscriber
+        self.add_topics(websocket, topics if topics is not None else {ALL_TOPICS})
+        subscriber.start()
+        return subscriber
+    
+    def unsubscribe(self, websocket):
+        """Drop a socket and stop its writer."""
+        subscriber = self.subscribers.pop(websocket, None)
+        if subscriber:
+            self._dropped_closed += subscriber.dropped
+            self._coalesced_closed += subscriber.coalesced
+            self._unindex(subscriber, set(subscriber.topics))
+            if not subscriber.closed:
+                subscriber._on_close = None
+                if subscriber._task:
+                    subscriber._task.cancel()
+    
+    def add_topics(self, websocket, topics: set[str]) -> set[str]:
+        """Subscribe a socket to more topics. Returns its topic set."""
+        subscriber = self.subscribers.get(websocket)
+        if not subscriber:
+            return set()
+        for topic in topics:
+            self.topics.setdefault(topic, set()).add(subscriber)
+        subscriber.topics |= topics
+        return subscriber.topics
+    
+    def remove_topics(self, websocket, topics: set[str]) -> set[str]:
+        """Unsubscribe a socket from topics. Returns its topic set."""
+        subscriber = self.subscribers.get(websocket)
+        if not subscriber:
+            return set()
+        self._unindex(subscriber, topics)
+        return subscriber.topics
+    
+    def _unindex(self, subscriber: Subscriber, topics: set[str]):
+        for topic in topics & subscriber.topics:
+            members = self.topics.get(topic)
+            if members is not None:
+                members.discard(subscriber)
+                if not members:
+                    del self.topics[topic]
+        subscriber.topics -= topics
+    
+    def recipients(self, topic: str) -> set[Subscriber]:
+        """Subscribers of a topic, including wildcard subscribers."""
+        found = set(self.topics.get(topic, ()))
+        wildcard = wildcard_for(topic)
+        if wildcard:
+            found |= self.topics.get(wildcard, set())
+        found |= self.topics.get(ALL_TOPICS, set())
+        return found
+    
+    def send(self, websocket, message: Any):
+        """Queue a message for one subscriber, in order with broadcasts."""
+        subscriber = self.subscribers.get(websocket)
+        if not subscriber:
+            return
+        frame = self._encode(message)
+        if frame is not None and not subscriber.offer(frame):
+            self._drop_slow(subscriber)
+    
+    def _encode(self, message: Any) -> Optional[Frame]:
+        """Encode a message, or count it as dropped if it can't be serialized."""
+        try:
+            frame = Frame.encode(message)
+        except (TypeError, ValueError) as e:
+            self.unencodable += 1
+            kind = message.get("type") if isinstance(message, dict) else type(message).__name__
+            print(f"Broadcaster: dropped unserializable {kind!r} message: {e}")
+            return None
+        self.frames_encoded += 1
+        return frame
+    
+    def publish(self, message: Any):
+        """Queue a message for its topic's subscribers. O(1) for the caller."""
+        self._pending.append(message)
+        self._ensure_pump()
+        self._wakeup.set()
+    
+    def _ensure_pump(self):
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._pump_task is None or self._pump_task.done():
+            self._pump_task = asyncio.create_task(self._pump())
+    
+    async def _pump(self):
+        """Copy pending messages into each interested subscriber's outbox."""
+        while True:
+            while not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            # Take everything published since the last pass; writers only
+            # run once the pump yields, so a burst wakes each writer once
+            messages = list(self._pending)
+            self._pending.clear()
+            for message in messages:
+                recipients = self.recipients(topic_for(message))
+                if not recipients:
+                    continue  # Nobody watching - don't even encode it
+                frame = self._encode(message)
+                if frame is None:
+                    continue  # One bad payload mustn't stop the pump
+                for subscriber in recipients:
+                    if not subscriber.offer(frame):
+                        self._drop_slow(subscriber)
+            # Let writers and producers run between large fan-outs
+            await asyncio.sleep(0)
+    
+    def _drop_slow(self, subscriber: Subscriber):
+        if not subscriber.closed:
+            self.disconnected_slow += 1
+        subscriber.close()
+        self.unsubscribe(subscriber.websocket)
+    
+    def _forget(self, subscriber: Subscriber):
+        if self.subscribers.get(subscriber.websocket) is subscriber:
+            self.unsubscribe(subscriber.websocket)
+    
+    def get_stats(self) -> dict:
+        """Queue depth and drop counters for monitoring."""
+        return {
+            "subscribers": len(self.subscribers),
+            "topics": len(self.topics),
+            "pending": len(self._pending),
+            "queued": sum(len(s.outbox) for s in self.subscribers.values()),
+            "dropped": self._dropped_closed + self.unencodable + sum(s.dropped for s in self.subscribers.values()),
+            "coalesced": self._coalesced_closed + sum(s.coalesced for s in self.subscribers.values()),
+            "unencodable": self.unencodable,
+            "disconnected_slow": self.disconnected_slow,
+            "frames_encoded": self.frames_encoded,
+            "encoder": backend(),
+            "policy": self.policy.value,
+        }
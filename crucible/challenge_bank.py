@@ -0,0 +1,284 @@
+"""
+Challenge Bank - Indexed store of challenges loaded from data files.
+
+Challenges live in JSON Lines files (one challenge per line) under
+CHALLENGE_BANK_PATH, default crucible/data/challenges/. Each line is a
+challenge body plus index fields:
+
+    {"id": "trivia-0042", "type": "trivia", "difficulty": 3,
+     "tags": ["networking"], "weight": 1.0, "q": "...", "a": "..."}
+
+Loading scans the files once and keeps only the index fields and each
+line's byte offset; a body is re-read from disk (and LRU-cached) when its
+challenge is actually played. Entries are grouped into buckets by
+(type, difficulty) and (type, difficulty, tag), and each bucket draws
+weighted picks in O(1) with an alias table.
+
+A ChallengeSampler gives one match a no-repeat view of the bank: it
+rejects already-played picks, and if a bucket gets crowded with them it
+switches that bucket to a pre-shuffled weighted order, so a pick never
+rescans the bucket.
+"""
+
+import json
+import os
+import random
+import threading
+from functools import lru_cache
+from typing import Iterable, NamedTuple, Optional
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "data", "challenges")
+
+
+class BankEntry(NamedTuple):
+    """Index record for one challenge; the body stays on disk until needed."""
+    id: str
+    type: str
+    difficulty: int
+    tags: tuple[str, ...]
+    weight: float
+    source: Optional[str]  # File holding the body, or None for built-ins
+    offset: int
+
+
+class AliasTable:
+    """Vose's alias method: O(n) build, O(1) weighted sampling."""
+    
+    __slots__ = ("prob", "alias")
+    
+    def __init__(self, weights: list[float]):
+        n = len(weights)
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+    
+    def sample(self, rng: random.Random) -> int:
+        i = int(rng.random() * len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+class Bucket:
+    """Challenges sharing a (type, difficulty[, tag]) key."""
+    
+    __slots__ = ("key", "entries", "_alias")
+    
+    def __init__(self, key: tuple):
+        self.key = key
+        self.entries: list[BankEntry] = []
+        self._alias: Optional[AliasTable] = None
+    
+    def add(self, entry: BankEntry):
+        self.entries.append(entry)
+        self._alias = None
+    
+    def sample(self, rng: random.Random) -> BankEntry:
+        if self._alias is None:
+            self._alias = AliasTable([e.weight for e in self.entries])
+        return self.entries[self._alias.sample(rng)]
+    
+    def weighted_order(self, rng: random.Random) -> list[BankEntry]:
+        """All entries in a weighted random order, first pick last (Efraimidis-Spirakis)."""
+        return sorted(self.entries, key=lambda e: rng.random() ** (1.0 / e.weight))
+
+
+@lru_cache(maxsize=2048)
+def _read_body(path: str, offset: int) -> dict:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return json.loads(f.readline())
+
+
+class ChallengeBank:
+    """All known challenges, indexed for weighted selection by type and difficulty."""
+    
+    def __init__(self, path: Optional[str] = DEFAULT_PATH):
+        self.path = path
+        self.skipped = 0  # Malformed lines ignored while loading
+        self._buckets: dict[tuple, Bucket] = {}
+        self._difficulties: dict[str, set[int]] = {}
+        self._builtin: dict[str, dict] = {}
+        self._loaded = False
+        self._lock = threading.RLock()
+    
+    # --- Loading ---
+    
+    def _files(self) -> list[str]:
+        if not self.path or not os.path.exists(self.path):
+            return []
+        if os.path.isfile(self.path):
+            return [self.path]
+        return sorted(
+            os.path.join(self.path, name)
+            for name in os.listdir(self.path)
+            if name.endswith(".jsonl")
+        )
+    
+    def load(self):
+        """Scan the data files (once); safe to call from a warm-up thread."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            for path in self._files():
+                self._scan(path)
+            self._loaded = True
+    
+    def _scan(self, path: str):
+        name = os.path.splitext(os.path.basename(path))[0]
+        decode = json.JSONDecoder().decode
+        offset = 0
+        with open(path, "rb") as f:
+            for lineno, line in enumerate(f, 1):
+                start, offset = offset, offset + len(line)
+                if not line.strip():
+                    continue
+                try:
+                    entry = self._entry(decode(line.decode("utf-8")), f"{name}:{lineno}", path, start)
+                except (ValueError, TypeError, KeyError):
+                    self.skipped += 1
+                    continue
+                self._index(entry)
+    
+    @staticmethod
+    def _entry(item: dict, default_id: str, source: Optional[str], offset: int) -> BankEntry:
+        weight = float(item.get("weight", 1.0))
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        return BankEntry(
+            str(item.get("id", default_id)),
+            item["type"],
+            int(item["difficulty"]),
+            tuple(item.get("tags", ())),
+            weight,
+            source,
+            offset,
+        )
+    
+    def _bucket(self, key: tuple) -> Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = Bucket(key)
+        return bucket
+    
+    def _index(self, entry: BankEntry):
+        kind, difficulty = entry.type, entry.difficulty
+        self._bucket((kind, difficulty)).add(entry)
+        for tag in entry.tags:
+            self._bucket((kind, difficulty, tag)).add(entry)
+        self._difficulties.setdefault(kind, set()).add(difficulty)
+    
+    def add_builtin(self, challenge_type: str, items: Iterable[dict], difficulty: int = 5):
+        """Register in-memory challenges (e.g. a class's built-in list) alongside the files."""
+        with self._lock:
+            for i, item in enumerate(items):
+                item = {"type": challenge_type, "difficulty": difficulty, **item}
+                entry = self._entry(item, f"{challenge_type}:builtin:{i}", None, 0)
+                self._builtin[entry.id] = item
+                self._index(entry)
+    
+    # --- Selection ---
+    
+    def types(self) -> list[str]:
+        self.load()
+        return list(self._difficulties)
+    
+    def __len__(self) -> int:
+        self.load()
+        return sum(len(b.entries) for key, b in self._buckets.items() if len(key) == 2)
+    
+    def candidates(self, challenge_type: str, difficulty: int, tag: Optional[str] = None) -> list[Bucket]:
+        """Buckets for a request, nearest difficulty first (ties go to the easier one)."""
+        self.load()
+        difficulties = sorted(self._difficulties.get(challenge_type, ()), key=lambda d: (abs(d - difficulty), d))
+        buckets = []
+        for d in difficulties:
+            bucket = self._buckets.get((challenge_type, d, tag) if tag else (challenge_type, d))
+            if bucket is not None:
+                buckets.append(bucket)
+        return buckets
+    
+    def pick(
+        self,
+        challenge_type: str,
+        difficulty: int,
+        tag: Optional[str] = None,
+        rng: Optional[random.Random] = None,
+    ) -> Optional[BankEntry]:
+        """Weighted random challenge at the nearest available difficulty, or None."""
+        buckets = self.candidates(challenge_type, difficulty, tag)
+        return buckets[0].sample(rng or random) if buckets else None
+    
+    def body(self, entry: BankEntry) -> dict:
+        """The full challenge (prompt, answer, test cases...), read on demand."""
+        if entry.source is None:
+            return self._builtin[entry.id]
+        return _read_body(entry.source, entry.offset)
+    
+    def sampler(self, rng: Optional[random.Random] = None) -> "ChallengeSampler":
+        return ChallengeSampler(self, rng)
+    
+    def get_stats(self) -> dict:
+        self.load()
+        cache = _read_body.cache_info()
+        return {
+            "challenges": len(self),
+            "buckets": len(self._buckets),
+            "types": {t: sorted(d) for t, d in self._difficulties.items()},
+            "skipped": self.skipped,
+            "body_cache_hits": cache.hits,
+            "body_cache_misses": cache.misses,
+        }
+
+
+class ChallengeSampler:
+    """
+    One match's no-repeat view of the bank. Picks are alias-table draws
+    with already-played challenges rejected; after MAX_REJECTIONS misses in
+    a row a bucket switches to a one-off weighted shuffle that is consumed
+    from the end. Once every candidate has been played, repeats are allowed.
+    """
+    
+    MAX_REJECTIONS = 8
+    
+    def __init__(self, bank: ChallengeBank, rng: Optional[random.Random] = None):
+        self.bank = bank
+        self.rng = rng or random
+        self.used: set[str] = set()
+        self._orders: dict[tuple, list[BankEntry]] = {}
+    
+    def pick(self, challenge_type: str, difficulty: int, tag: Optional[str] = None) -> Optional[BankEntry]:
+        buckets = self.bank.candidates(challenge_type, difficulty, tag)
+        for bucket in buckets:
+            entry = self._draw(bucket)
+            if entry is not None:
+                self.used.add(entry.id)
+                return entry
+        return buckets[0].sample(self.rng) if buckets else None
+    
+    def _draw(self, bucket: Bucket) -> Optional[BankEntry]:
+        order = self._orders.get(bucket.key)
+        if order is None:
+            for _ in range(self.MAX_REJECTIONS):
+                entry = bucket.sample(self.rng)
+                if entry.id not in self.used:
+                    return entry
+            order = self._orders[bucket.key] = bucket.weighted_order(self.rng)
+        while order:
+            entry = order.pop()
+            if entry.id not in self.used:
+                return entry
+        return None
+
+
+# Shared bank; files are scanned on first use
+challenge_bank = ChallengeBank(os.getenv("CHALLENGE_BANK_PATH") or DEFAULT_PATH)
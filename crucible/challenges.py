@@ -4,10 +4,16 @@ Challenges - Skill tests that tributes must complete to survive.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Optional
 from enum import Enum
 import random
 
+from .grading import AnswerKey, build_keys, normalize
+from .challenge_bank import ChallengeSampler, challenge_bank
+from .generators import PUZZLE_KINDS, problem_buffer
+from .sandbox import Verdict, sandbox
+
 
 class ChallengeType(Enum):
     """Types of challenges tributes can face."""
@@ -44,6 +50,14 @@ class Challenge(ABC):
     def evaluate(self, answer: Any) -> ChallengeResult:
         """Evaluate a tribute's answer."""
         pass
+    
+    def evaluate_many(self, answers: dict[str, Any]) -> dict[str, ChallengeResult]:
+        """Evaluate a whole round's answers, keyed by tribute id."""
+        return {tribute_id: self.evaluate(answer) for tribute_id, answer in answers.items()}
+    
+    async def evaluate_round(self, answers: dict[str, Any]) -> dict[str, ChallengeResult]:
+        """Like evaluate_many, for challenges whose grading must not block the event loop."""
+        return self.evaluate_many(answers)
 
 
 class CodeGolfChallenge(Challenge):
@@ -59,11 +73,13 @@ class CodeGolfChallenge(Challenge):
         },
         {
             "prompt": "Write a function that reverses a string",
+            "difficulty": 3,
             "test_cases": [("hello", "olleh"), ("a", "a"), ("", "")],
             "optimal_length": 12,
         },
         {
             "prompt": "Write a function that checks if a number is prime",
+            "difficulty": 6,
             "test_cases": [(2, True), (4, False), (17, True), (1, False)],
             "optimal_length": 45,
         },
@@ -74,13 +90,14 @@ class CodeGolfChallenge(Challenge):
         },
     ]
     
-    def __init__(self, difficulty: int = 5):
+    def __init__(self, difficulty: int = 5, item: Optional[dict] = None):
         self.difficulty = difficulty
         self.time_limit_seconds = 120
+        self.item = item  # Bank entry to play; random built-in problem if None
         self.current_problem = None
     
     def generate(self) -> dict:
-        self.current_problem = random.choice(self.PROBLEMS)
+        self.current_problem = self.item or random.choice(self.PROBLEMS)
         return {
             "type": self.challenge_type.value,
             "prompt": self.current_problem["prompt"],
@@ -89,10 +106,26 @@ class CodeGolfChallenge(Challenge):
         }
     
     def evaluate(self, answer: str) -> ChallengeResult:
-        # In production, this would run the code in a sandbox
-        # For now, score based on length
         if not answer or not isinstance(answer, str):
             return ChallengeResult(success=False, damage_taken=100)
+        problem = self.current_problem
+        return self._score(answer, sandbox.run(problem["prompt"], answer, problem["test_cases"]))
+    
+    async def evaluate_round(self, answers: dict[str, Any]) -> dict[str, ChallengeResult]:
+        """Run every submission in the sandbox pool at once."""
+        problem = self.current_problem
+        codes = {tid: a for tid, a in answers.items() if a and isinstance(a, str)}
+        verdicts = await sandbox.run_many(problem["prompt"], problem["test_cases"], codes)
+        return {
+            tid: self._score(answers[tid], verdicts[tid]) if tid in verdicts
+            else ChallengeResult(success=False, damage_taken=100)
+            for tid in answers
+        }
+    
+    def _score(self, answer: str, verdict: Verdict) -> ChallengeResult:
+        """Working code scores by length; anything else is eliminated."""
+        if not verdict.passed:
+            return ChallengeResult(success=False, answer=answer, damage_taken=100)
         
         code_length = len(answer.replace(" ", "").replace("\n", ""))
         optimal = self.current_problem["optimal_length"]
@@ -107,101 +140,165 @@ class CodeGolfChallenge(Challenge):
         )
 
 
-class TriviaChallenge(Challenge):
+@lru_cache(maxsize=2048)
+def _answer_key(answer: str, aliases: tuple[str, ...]) -> AnswerKey:
+    return AnswerKey(answer, aliases)
+
+
+def key_for(item: dict, answer_field: str) -> AnswerKey:
+    """Answer key for a bank item that isn't in a class's precomputed KEYS (built once, then cached)."""
+    return _answer_key(item[answer_field], tuple(item.get("aliases", ())))
+
+
+class KeyedChallenge(Challenge):
+    """A challenge graded against a precomputed AnswerKey."""
+    
+    wrong_answer_damage = 25
+    
+    @abstractmethod
+    def answer_key(self) -> AnswerKey:
+        """Key for the current question."""
+        pass
+    
+    def evaluate(self, answer: str) -> ChallengeResult:
+        return self.evaluate_many({"": answer})[""]
+    
+    def evaluate_many(self, answers: dict[str, Any]) -> dict[str, ChallengeResult]:
+        correct = self.answer_key().grade_many(answers.values())
+        results = {}
+        for (tribute_id, answer), ok in zip(answers.items(), correct):
+            if ok:
+                results[tribute_id] = ChallengeResult(success=True, score=100, answer=answer)
+            elif not normalize(answer):
+                results[tribute_id] = ChallengeResult(success=False, damage_taken=50)
+            else:
+                results[tribute_id] = ChallengeResult(
+                    success=False, score=0, answer=answer, damage_taken=self.wrong_answer_damage,
+                )
+        return results
+
+
+class TriviaChallenge(KeyedChallenge):
     """Answer trivia questions correctly."""
     
     challenge_type = ChallengeType.TRIVIA
     
     QUESTIONS = [
-        {"q": "What year was Python first released?", "a": "1991"},
-        {"q": "Who created Linux?", "a": "linus torvalds"},
-        {"q": "What does HTTP stand for?", "a": "hypertext transfer protocol"},
-        {"q": "What is the time complexity of binary search?", "a": "o(log n)"},
-        {"q": "What port does HTTPS use by default?", "a": "443"},
-        {"q": "What language is the Linux kernel written in?", "a": "c"},
-        {"q": "What does SQL stand for?", "a": "structured query language"},
-        {"q": "What year was Bitcoin created?", "a": "2009"},
+        {"q": "What year was Python first released?", "difficulty": 3, "a": "1991"},
+        {"q": "Who created Linux?", "difficulty": 2, "a": "linus torvalds", "aliases": ["torvalds"]},
+        {"q": "What does HTTP stand for?", "difficulty": 2, "a": "hypertext transfer protocol",
+         "aliases": ["hyper text transfer protocol"]},
+        {"q": "What is the time complexity of binary search?", "difficulty": 5, "a": "o(log n)",
+         "aliases": ["log n", "logarithmic", "o(lg n)"]},
+        {"q": "What port does HTTPS use by default?", "difficulty": 4, "a": "443", "aliases": ["port 443"]},
+        {"q": "What language is the Linux kernel written in?", "difficulty": 3, "a": "c", "aliases": ["c language"]},
+        {"q": "What does SQL stand for?", "difficulty": 2, "a": "structured query language"},
+        {"q": "What year was Bitcoin created?", "difficulty": 4, "a": "2009"},
     ]
+    KEYS = build_keys(QUESTIONS, "q", "a")
     
-    def __init__(self, difficulty: int = 3):
+    def __init__(self, difficulty: int = 3, item: Optional[dict] = None):
         self.difficulty = difficulty
         self.time_limit_seconds = 30
+        self.item = item
         self.current_question = None
     
     def generate(self) -> dict:
-        self.current_question = random.choice(self.QUESTIONS)
+        self.current_question = self.item or random.choice(self.QUESTIONS)
         return {
             "type": self.challenge_type.value,
             "question": self.current_question["q"],
             "time_limit": self.time_limit_seconds,
         }
     
-    def evaluate(self, answer: str) -> ChallengeResult:
-        if not answer:
-            return ChallengeResult(success=False, damage_taken=50)
-        
-        correct = self.current_question["a"].lower()
-        given = str(answer).lower().strip()
-        
-        if given == correct or correct in given:
-            return ChallengeResult(success=True, score=100)
-        else:
-            return ChallengeResult(success=False, score=0, damage_taken=25)
+    def answer_key(self) -> AnswerKey:
+        return self.KEYS.get(self.current_question["q"]) or key_for(self.current_question, "a")
 
 
-class LogicPuzzleChallenge(Challenge):
+class LogicPuzzleChallenge(KeyedChallenge):
     """Solve logic puzzles."""
     
     challenge_type = ChallengeType.LOGIC_PUZZLE
+    wrong_answer_damage = 30
     
     PUZZLES = [
         {
             "prompt": "What is the next number in the sequence: 2, 6, 12, 20, 30, ?",
+            "difficulty": 5,
             "answer": "42",
             "hint": "Differences increase by 2 each time",
         },
         {
             "prompt": "If all Bloops are Razzies and all Razzies are Lazzies, are all Bloops Lazzies?",
+            "difficulty": 3,
             "answer": "yes",
+            "aliases": ["y", "true"],
         },
         {
             "prompt": "What is 15% of 80?",
+            "difficulty": 2,
             "answer": "12",
         },
         {
             "prompt": "A farmer has 17 sheep. All but 9 die. How many are left?",
+            "difficulty": 4,
             "answer": "9",
         },
     ]
+    KEYS = build_keys(PUZZLES, "prompt", "answer")
     
-    def __init__(self, difficulty: int = 4):
+    def __init__(self, difficulty: int = 4, item: Optional[dict] = None):
         self.difficulty = difficulty
         self.time_limit_seconds = 60
+        self.item = item
         self.current_puzzle = None
     
     def generate(self) -> dict:
-        self.current_puzzle = random.choice(self.PUZZLES)
+        self.current_puzzle = self.item or random.choice(self.PUZZLES)
         return {
             "type": self.challenge_type.value,
             "puzzle": self.current_puzzle["prompt"],
             "time_limit": self.time_limit_seconds,
         }
     
-    def evaluate(self, answer: str) -> ChallengeResult:
-        if not answer:
-            return ChallengeResult(success=False, damage_taken=50)
-        
-        correct = self.current_puzzle["answer"].lower()
-        given = str(answer).lower().strip()
-        
-        if given == correct:
-            return ChallengeResult(success=True, score=100)
-        else:
-            return ChallengeResult(success=False, score=0, damage_taken=30)
+    def answer_key(self) -> AnswerKey:
+        return self.KEYS.get(self.current_puzzle["prompt"]) or key_for(self.current_puzzle, "answer")
+
+
+CHALLENGE_CLASSES: dict[str, type[Challenge]] = {
+    cls.challenge_type.value: cls
+    for cls in (CodeGolfChallenge, TriviaChallenge, LogicPuzzleChallenge)
+}
+
+# The built-in lists are always in the bank; data files add to them
+challenge_bank.add_builtin(ChallengeType.CODE_GOLF.value, CodeGolfChallenge.PROBLEMS)
+challenge_bank.add_builtin(ChallengeType.TRIVIA.value, TriviaChallenge.QUESTIONS)
+challenge_bank.add_builtin(ChallengeType.LOGIC_PUZZLE.value, LogicPuzzleChallenge.PUZZLES)
+
+# Share of logic puzzle rounds that use a freshly generated puzzle instead of the bank
+GENERATED_PUZZLE_SHARE = 0.5
+ROUND_DIFFICULTIES = (3, 5, 7)  # Bloodbath, hunt and arena event rounds
+for _kind in PUZZLE_KINDS:
+    problem_buffer.warm(_kind, ROUND_DIFFICULTIES)
 
 
-def get_random_challenge(difficulty: int = 5) -> Challenge:
-    """Get a random challenge of the given difficulty."""
-    challenge_classes = [CodeGolfChallenge, TriviaChallenge, LogicPuzzleChallenge]
-    cls = random.choice(challenge_classes)
-    return cls(difficulty=difficulty)
+def get_random_challenge(
+    difficulty: int = 5,
+    sampler: Optional[ChallengeSampler] = None,
+    challenge_type: Optional[str] = None,
+    tag: Optional[str] = None,
+) -> Challenge:
+    """
+    Get a random challenge at (or nearest to) the given difficulty.
+    Pass a match's sampler so the match never sees the same challenge twice.
+    """
+    if challenge_type is None:
+        challenge_type = random.choice([t for t in challenge_bank.types() if t in CHALLENGE_CLASSES])
+    cls = CHALLENGE_CLASSES[challenge_type]
+    if cls is LogicPuzzleChallenge and tag is None and random.random() < GENERATED_PUZZLE_SHARE:
+        problem = problem_buffer.take(random.choice(PUZZLE_KINDS), difficulty)
+        return cls(difficulty=problem.difficulty, item=problem.as_item())
+    entry = (sampler or challenge_bank).pick(challenge_type, difficulty, tag)
+    if entry is None:
+        return cls(difficulty=difficulty)
+    return cls(difficulty=entry.difficulty, item=challenge_bank.body(entry))
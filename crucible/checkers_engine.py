@@ -0,0 +1,229 @@
+"""
+Checkers Engine - 32-square board with forced captures and multi-jumps.
+
+Only the 32 dark squares are stored, numbered 0-31 row by row from the top
+(black's side). Neighbour and jump tables are built once at import, so move
+generation is table lookups. Pieces are +1/+2 for a red man/king and -1/-2
+for black; red moves up the board (towards row 0).
+
+American rules: captures are mandatory, a move is the whole jump chain, and
+a man that reaches the far row is crowned and its move ends. Piece counts
+and the Zobrist hash are maintained incrementally by make()/unmake().
+"""
+
+import random
+import re
+from array import array
+from typing import NamedTuple, Optional
+
+RED, BLACK = 1, -1
+MAN, KING = 1, 2
+
+# Diagonal directions: up-left, up-right, down-left, down-right
+DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+UP, DOWN = (0, 1), (2, 3)
+
+
+def square_coords(index: int) -> tuple[int, int]:
+    """(row, col) of a playable square."""
+    row = index // 4
+    return row, 2 * (index % 4) + (1 if row % 2 == 0 else 0)
+
+
+def square_index(row: int, col: int) -> Optional[int]:
+    """Playable square at (row, col), or None for a light/off-board square."""
+    if not (0 <= row <= 7 and 0 <= col <= 7) or (row + col) % 2 == 0:
+        return None
+    return row * 4 + col // 2
+
+
+# NEIGHBORS[sq][direction] -> adjacent square or -1
+NEIGHBORS = tuple(
+    tuple(
+        square_index(square_coords(sq)[0] + dr, square_coords(sq)[1] + dc)
+        if square_index(square_coords(sq)[0] + dr, square_coords(sq)[1] + dc) is not None else -1
+        for dr, dc in DIRECTIONS
+    )
+    for sq in range(32)
+)
+# JUMPS[sq][direction] -> (jumped square, landing square) or None
+JUMPS = tuple(
+    tuple(
+        (NEIGHBORS[sq][d], NEIGHBORS[NEIGHBORS[sq][d]][d])
+        if NEIGHBORS[sq][d] != -1 and NEIGHBORS[NEIGHBORS[sq][d]][d] != -1 else None
+        for d in range(4)
+    )
+    for sq in range(32)
+)
+# Squares where a man of each side is crowned
+CROWN_ROW = {RED: range(0, 4), BLACK: range(28, 32)}
+
+# Zobrist keys, indexed by piece value (negative wraps) then square
+_rng = random.Random(0xC4EC)
+Z_PIECE = [[_rng.getrandbits(64) for _ in range(32)] for _ in range(5)]
+Z_SIDE = _rng.getrandbits(64)
+
+PIECE_CHARS = ".rRBb"  # Indexed by piece value (negative wraps)
+
+
+class CheckersMove(NamedTuple):
+    """A full move: the squares visited and the pieces jumped."""
+    path: tuple[int, ...]
+    captured: tuple[int, ...] = ()
+    
+    def to_text(self) -> str:
+        """e.g. "5,0-4,1", or "5,0-3,2-1,4" for a double jump."""
+        return "-".join("%d,%d" % square_coords(sq) for sq in self.path)
+
+
+class CheckersBoard:
+    """A checkers position with make/unmake and legal move generation."""
+    
+    def __init__(self):
+        self.squares = array("b", [BLACK * MAN] * 12 + [0] * 8 + [RED * MAN] * 12)
+        self.side = RED
+        self.counts = [0, 12, 12]  # Indexed by side: counts[RED], counts[BLACK]
+        self.history: list[tuple] = []
+        self.hash = self._compute_hash()
+        self._legal: Optional[list[CheckersMove]] = None
+    
+    def _compute_hash(self) -> int:
+        h = Z_SIDE if self.side == BLACK else 0
+        for sq, piece in enumerate(self.squares):
+            if piece:
+                h ^= Z_PIECE[piece][sq]
+        return h
+    
+    def piece_at(self, row: int, col: int) -> str:
+        """'r' / 'b' for men, 'R' / 'B' for kings, '.' for empty."""
+        sq = square_index(row, col)
+        return '.' if sq is None else PIECE_CHARS[self.squares[sq]]
+    
+    def rows(self) -> list[list[str]]:
+        return [[self.piece_at(row, col) for col in range(8)] for row in range(8)]
+    
+    # ------------------------------------------------------------- generation
+    
+    def legal_moves(self) -> list[CheckersMove]:
+        """Legal moves for the side to move; captures only, if any exist."""
+        if self._legal is None:
+            captures = self._captures()
+            self._legal = captures if captures else self._simple_moves()
+        return self._legal
+    
+    def _directions(self, piece: int) -> tuple[int, ...]:
+        if abs(piece) == KING:
+            return (0, 1, 2, 3)
+        return UP if piece > 0 else DOWN
+    
+    def _simple_moves(self) -> list[CheckersMove]:
+        squares = self.squares
+        side = self.side
+        moves = []
+        for sq in range(32):
+            piece = squares[sq]
+            if piece * side <= 0:
+                continue
+            for d in self._directions(piece):
+                to = NEIGHBORS[sq][d]
+                if to != -1 and squares[to] == 0:
+                    moves.append(CheckersMove((sq, to)))
+        return moves
+    
+    def _captures(self) -> list[CheckersMove]:
+        squares = self.squares
+        side = self.side
+        moves: list[CheckersMove] = []
+        for sq in range(32):
+            piece = squares[sq]
+            if piece * side > 0:
+                self._jump_chains(sq, piece, sq, (sq,), (), moves)
+        return moves
+    
+    def _jump_chains(self, start: int, piece: int, sq: int, path: tuple, captured: tuple, out: list):
+        """Depth-first search for every maximal jump chain from `sq`."""
+        squares = self.squares
+        extended = False
+        for d in self._directions(piece):
+            jump = JUMPS[sq][d]
+            if jump is None:
+                continue
+            over, land = jump
+            if squares[over] * self.side >= 0 or over in captured:
+                continue
+            if squares[land] != 0 and land != start:
+                continue
+            extended = True
+            if abs(piece) == MAN and land in CROWN_ROW[self.side]:
+                out.append(CheckersMove(path + (land,), captured + (over,)))
+            else:
+                self._jump_chains(start, piece, land, path + (land,), captured + (over,), out)
+        if not extended and captured:
+            out.append(CheckersMove(path, captured))
+    
+    # ------------------------------------------------------------ make/unmake
+    
+    def make(self, move: CheckersMove):
+        """Play a legal move."""
+        squares = self.squares
+        side = self.side
+        frm, to = move.path[0], move.path[-1]
+        piece = squares[frm]
+        h = self.hash ^ Z_SIDE ^ Z_PIECE[piece][frm]
+        
+        taken = []
+        for sq in move.captured:
+            victim = squares[sq]
+            taken.append(victim)
+            h ^= Z_PIECE[victim][sq]
+            squares[sq] = 0
+        self.counts[-side] -= len(move.captured)
+        
+        crowned = abs(piece) == MAN and to in CROWN_ROW[side]
+        placed = side * KING if crowned else piece
+        squares[frm] = 0
+        squares[to] = placed
+        h ^= Z_PIECE[placed][to]
+        
+        self.history.append((move, piece, tuple(taken), self.hash))
+        self.hash = h
+        self.side = -side
+        self._legal = None
+    
+    def unmake(self):
+        """Take back the last move."""
+        move, piece, taken, self.hash = self.history.pop()
+        squares = self.squares
+        self.side = side = -self.side
+        squares[move.path[-1]] = 0
+        squares[move.path[0]] = piece
+        for sq, victim in zip(move.captured, taken):
+            squares[sq] = victim
+        self.counts[-side] += len(taken)
+        self._legal = None
+    
+    # ---------------------------------------------------------------- helpers
+    
+    def parse_move(self, text: str) -> Optional[CheckersMove]:
+        """
+        The legal move for "5,0 to 4,1" / "5,0-4,1" / "5 0 4 1" style input,
+        or None. A jump chain may list every landing square or only the last.
+        """
+        nums = [int(n) for n in re.findall(r'\d+', text)]
+        if len(nums) < 4 or len(nums) % 2:
+            return None
+        path = []
+        for i in range(0, len(nums), 2):
+            sq = square_index(nums[i], nums[i + 1])
+            if sq is None:
+                return None
+            path.append(sq)
+        path = tuple(path)
+        for move in self.legal_moves():
+            if move.path == path:
+                return move
+        if len(path) == 2:
+            for move in self.legal_moves():
+                if move.path[0] == path[0] and move.path[-1] == path[1]:
+                    return move
+        return None
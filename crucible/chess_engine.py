@@ -0,0 +1,450 @@
+"""
+Chess Engine - 0x88 board with legal move generation and Zobrist hashing.
+
+The board is a 128-entry signed byte array: square = rank * 16 + file, with
+a1 = 0 and h8 = 0x77; any square with `sq & 0x88` set is off the board, so
+sliding pieces need no edge tables. Pieces are +1..+6 for white and -1..-6
+for black (pawn, knight, bishop, rook, queen, king).
+
+Moves are plain ints (from | to << 7 | promotion << 14 | flag << 17) and are
+applied with make()/unmake(), which also update the Zobrist hash
+incrementally. legal_moves() is the one move-generation API: game
+validation, the bots and search all use it.
+"""
+
+import random
+from array import array
+from typing import Optional
+
+WHITE, BLACK = 1, -1
+EMPTY, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(7)
+
+# Move flags
+NORMAL, DOUBLE_PUSH, EN_PASSANT, CASTLE = range(4)
+
+# Castling rights
+WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE = 1, 2, 4, 8
+
+KNIGHT_DELTAS = (33, 31, 18, 14, -14, -18, -31, -33)
+BISHOP_DELTAS = (17, 15, -15, -17)
+ROOK_DELTAS = (16, -16, 1, -1)
+KING_DELTAS = BISHOP_DELTAS + ROOK_DELTAS
+PROMOTIONS = (QUEEN, ROOK, BISHOP, KNIGHT)
+
+SQUARES = tuple(rank * 16 + file for rank in range(8) for file in range(8))
+
+PIECE_CHARS = ".PNBRQKkqrbnp"  # Indexed by piece value (negative wraps)
+CHAR_PIECES = {c: (i if i <= 6 else i - 13) for i, c in enumerate(PIECE_CHARS) if c != "."}
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# Rights that survive a move touching a square (king/rook moved or captured)
+CASTLE_MASK = [15] * 128
+CASTLE_MASK[0x00] = 15 & ~WHITE_QUEENSIDE
+CASTLE_MASK[0x04] = 15 & ~(WHITE_KINGSIDE | WHITE_QUEENSIDE)
+CASTLE_MASK[0x07] = 15 & ~WHITE_KINGSIDE
+CASTLE_MASK[0x70] = 15 & ~BLACK_QUEENSIDE
+CASTLE_MASK[0x74] = 15 & ~(BLACK_KINGSIDE | BLACK_QUEENSIDE)
+CASTLE_MASK[0x77] = 15 & ~BLACK_KINGSIDE
+
+# King destination -> (rook from, rook to)
+CASTLE_ROOKS = {0x06: (0x07, 0x05), 0x02: (0x00, 0x03), 0x76: (0x77, 0x75), 0x72: (0x70, 0x73)}
+
+# Zobrist keys, fixed seed so hashes are stable across processes
+_rng = random.Random(0xC0FFEE)
+Z_PIECE = [[_rng.getrandbits(64) for _ in range(128)] for _ in range(13)]  # Indexed by piece value
+Z_SIDE = _rng.getrandbits(64)
+Z_CASTLE = [_rng.getrandbits(64) for _ in range(16)]
+Z_EP = [_rng.getrandbits(64) for _ in range(8)]
+
+
+def square_name(sq: int) -> str:
+    return "abcdefgh"[sq & 7] + str((sq >> 4) + 1)
+
+
+def parse_square(name: str) -> Optional[int]:
+    if len(name) != 2 or name[0] not in "abcdefgh" or name[1] not in "12345678":
+        return None
+    return (int(name[1]) - 1) * 16 + "abcdefgh".index(name[0])
+
+
+def encode_move(frm: int, to: int, promotion: int = 0, flag: int = NORMAL) -> int:
+    return frm | to << 7 | promotion << 14 | flag << 17
+
+
+def move_to_uci(move: int) -> str:
+    """e.g. "e2e4", or "e7e8q" for a promotion."""
+    promotion = move >> 14 & 7
+    text = square_name(move & 0x7F) + square_name(move >> 7 & 0x7F)
+    return text + "nbrq"[promotion - KNIGHT] if promotion else text
+
+
+class ChessBoard:
+    """A chess position with make/unmake and legal move generation."""
+    
+    def __init__(self, fen: str = START_FEN):
+        self.board = array("b", [EMPTY] * 128)
+        self.kings = [0, 0, 0]  # Indexed by side: kings[WHITE], kings[BLACK]
+        self.side = WHITE
+        self.castling = 0
+        self.ep = -1  # En passant target square, only set if a capture is possible
+        self.halfmove = 0
+        self.fullmove = 1
+        self.hash = 0
+        self.history: list[tuple] = []
+        self._legal: Optional[list[int]] = None
+        self.set_fen(fen)
+    
+    # ----------------------------------------------------------------- setup
+    
+    def set_fen(self, fen: str):
+        """Load a position from FEN."""
+        fields = fen.split()
+        placement, side = fields[0], fields[1] if len(fields) > 1 else "w"
+        castling = fields[2] if len(fields) > 2 else "-"
+        ep = fields[3] if len(fields) > 3 else "-"
+        
+        self.board = array("b", [EMPTY] * 128)
+        for rank_idx, row in enumerate(placement.split("/")):
+            sq = (7 - rank_idx) * 16
+            for c in row:
+                if c.isdigit():
+                    sq += int(c)
+                else:
+                    piece = CHAR_PIECES[c]
+                    self.board[sq] = piece
+                    if abs(piece) == KING:
+                        self.kings[1 if piece > 0 else -1] = sq
+                    sq += 1
+        
+        self.side = WHITE if side == "w" else BLACK
+        self.castling = sum(bit for c, bit in zip("KQkq", (1, 2, 4, 8)) if c in castling)
+        self.ep = parse_square(ep) if ep != "-" else -1
+        self.halfmove = int(fields[4]) if len(fields) > 4 else 0
+        self.fullmove = int(fields[5]) if len(fields) > 5 else 1
+        self.history = []
+        self._legal = None
+        self.hash = self._compute_hash()
+    
+    def fen(self) -> str:
+        rows = []
+        for rank in range(7, -1, -1):
+            row, empty = "", 0
+            for file in range(8):
+                piece = self.board[rank * 16 + file]
+                if piece == EMPTY:
+                    empty += 1
+                    continue
+                if empty:
+                    row += str(empty)
+                    empty = 0
+                row += PIECE_CHARS[piece]
+            rows.append(row + (str(empty) if empty else ""))
+        castling = "".join(c for c, bit in zip("KQkq", (1, 2, 4, 8)) if self.castling & bit) or "-"
+        ep = square_name(self.ep) if self.ep != -1 else "-"
+        side = "w" if self.side == WHITE else "b"
+        return f"{'/'.join(rows)} {side} {castling} {ep} {self.halfmove} {self.fullmove}"
+    
+    def _compute_hash(self) -> int:
+        h = 0
+        for sq in SQUARES:
+            if self.board[sq]:
+                h ^= Z_PIECE[self.board[sq]][sq]
+        if self.side == BLACK:
+            h ^= Z_SIDE
+        h ^= Z_CASTLE[self.castling]
+        if self.ep != -1:
+            h ^= Z_EP[self.ep & 7]
+        return h
+    
+    # ---------------------------------------------------------------- attacks
+    
+    def is_attacked(self, sq: int, by: int) -> bool:
+        """Is `sq` attacked by any piece of side `by`?"""
+        b = self.board
+        # Pawns attack diagonally forward, so look diagonally backward from sq
+        pawn = by * PAWN
+        for d in ((-15, -17) if by == WHITE else (15, 17)):
+            t = sq + d
+            if not t & 0x88 and b[t] == pawn:
+                return True
+        knight = by * KNIGHT
+        for d in KNIGHT_DELTAS:
+            t = sq + d
+            if not t & 0x88 and b[t] == knight:
+                return True
+        king = by * KING
+        for d in KING_DELTAS:
+            t = sq + d
+            if not t & 0x88 and b[t] == king:
+                return True
+        queen = by * QUEEN
+        for sliders, deltas in ((by * BISHOP, BISHOP_DELTAS), (by * ROOK, ROOK_DELTAS)):
+            for d in deltas:
+                t = sq + d
+                while not t & 0x88:
+                    piece = b[t]
+                    if piece:
+                        if piece == sliders or piece == queen:
+                            return True
+                        break
+                    t += d
+        return False
+    
+    def in_check(self, side: Optional[int] = None) -> bool:
+        side = side or self.side
+        return self.is_attacked(self.kings[side], -side)
+    
+    # ------------------------------------------------------------- generation
+    
+    def pseudo_legal_moves(self) -> list[int]:
+        """Moves that obey piece movement but may leave the king in check."""
+        b = self.board
+        side = self.side
+        moves = []
+        add = moves.append
+        
+        for sq in SQUARES:
+            piece = b[sq] * side
+            if piece <= 0:
+                continue
+            
+            if piece == PAWN:
+                forward = 16 * side
+                last_rank = 7 if side == WHITE else 0
+                one = sq + forward
+                if not one & 0x88 and b[one] == EMPTY:
+                    if one >> 4 == last_rank:
+                        for promotion in PROMOTIONS:
+                            add(sq | one << 7 | promotion << 14)
+                    else:
+                        add(sq | one << 7)
+                        two = one + forward
+                        if sq >> 4 == (1 if side == WHITE else 6) and b[two] == EMPTY:
+                            add(sq | two << 7 | DOUBLE_PUSH << 17)
+                for t in (one - 1, one + 1):
+                    if t & 0x88:
+                        continue
+                    if b[t] * side < 0:
+                        if t >> 4 == last_rank:
+                            for promotion in PROMOTIONS:
+                                add(sq | t << 7 | promotion << 14)
+                        else:
+                            add(sq | t << 7)
+                    elif t == self.ep:
+                        add(sq | t << 7 | EN_PASSANT << 17)
+            
+            elif piece == KNIGHT or piece == KING:
+                for d in (KNIGHT_DELTAS if piece == KNIGHT else KING_DELTAS):
+                    t = sq + d
+                    if not t & 0x88 and b[t] * side <= 0:
+                        add(sq | t << 7)
+            
+            else:
+                deltas = BISHOP_DELTAS if piece == BISHOP else ROOK_DELTAS if piece == ROOK else KING_DELTAS
+                for d in deltas:
+                    t = sq + d
+                    while not t & 0x88:
+                        target = b[t] * side
+                        if target > 0:
+                            break
+                        add(sq | t << 7)
+                        if target < 0:
+                            break
+                        t += d
+        
+        self._castling_moves(add)
+        return moves
+    
+    def _castling_moves(self, add):
+        b = self.board
+        if self.side == WHITE:
+            king, kingside, queenside, them = 0x04, WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK
+        else:
+            king, kingside, queenside, them = 0x74, BLACK_KINGSIDE, BLACK_QUEENSIDE, WHITE
+        if not self.castling & (kingside | queenside) or self.is_attacked(king, them):
+            return
+        if (self.castling & kingside and b[king + 1] == EMPTY and b[king + 2] == EMPTY
+                and not self.is_attacked(king + 1, them) and not self.is_attacked(king + 2, them)):
+            add(king | (king + 2) << 7 | CASTLE << 17)
+        if (self.castling & queenside and b[king - 1] == EMPTY and b[king - 2] == EMPTY
+                and b[king - 3] == EMPTY
+                and not self.is_attacked(king - 1, them) and not self.is_attacked(king - 2, them)):
+            add(king | (king - 2) << 7 | CASTLE << 17)
+    
+    def legal_moves(self) -> list[int]:
+        """All legal moves in this position (cached until the next make/unmake)."""
+        if self._legal is None:
+            side = self.side
+            legal = []
+            for move in self.pseudo_legal_moves():
+                self.make(move)
+                if not self.is_attacked(self.kings[side], -side):
+                    legal.append(move)
+                self.unmake()
+            self._legal = legal
+        return self._legal
+    
+    # ------------------------------------------------------------ make/unmake
+    
+    def make(self, move: int):
+        """Play a (pseudo-)legal move."""
+        b = self.board
+        side = self.side
+        frm = move & 0x7F
+        to = move >> 7 & 0x7F
+        promotion = move >> 14 & 7
+        flag = move >> 17
+        piece = b[frm]
+        captured = b[to]
+        
+        self.history.append((move, captured, self.castling, self.ep, self.halfmove, self.hash))
+        h = self.hash ^ Z_CASTLE[self.castling] ^ Z_SIDE
+        if self.ep != -1:
+            h ^= Z_EP[self.ep & 7]
+        
+        b[frm] = EMPTY
+        h ^= Z_PIECE[piece][frm]
+        if captured:
+            h ^= Z_PIECE[captured][to]
+        placed = side * promotion if promotion else piece
+        b[to] = placed
+        h ^= Z_PIECE[placed][to]
+        
+        if flag == EN_PASSANT:
+            victim = to - 16 * side
+            h ^= Z_PIECE[b[victim]][victim]
+            b[victim] = EMPTY
+        elif flag == CASTLE:
+            rook_from, rook_to = CASTLE_ROOKS[to]
+            rook = b[rook_from]
+            b[rook_from] = EMPTY
+            b[rook_to] = rook
+            h ^= Z_PIECE[rook][rook_from] ^ Z_PIECE[rook][rook_to]
+        
+        if piece == side * KING:
+            self.kings[side] = to
+        
+        self.castling &= CASTLE_MASK[frm] & CASTLE_MASK[to]
+        h ^= Z_CASTLE[self.castling]
+        
+        # Only record an en passant square if an enemy pawn could take it,
+        # so transpositions hash the same
+        self.ep = -1
+        if flag == DOUBLE_PUSH:
+            enemy_pawn = -side * PAWN
+            if ((not (to - 1) & 0x88 and b[to - 1] == enemy_pawn)
+                    or (not (to + 1) & 0x88 and b[to + 1] == enemy_pawn)):
+                self.ep = (frm + to) // 2
+                h ^= Z_EP[self.ep & 7]
+        
+        self.halfmove = 0 if captured or piece == side * PAWN else self.halfmove + 1
+        if side == BLACK:
+            self.fullmove += 1
+        self.side = -side
+        self.hash = h
+        self._legal = None
+    
+    def unmake(self):
+        """Take back the last move."""
+        move, captured, self.castling, self.ep, self.halfmove, self.hash = self.history.pop()
+        b = self.board
+        self.side = side = -self.side
+        frm = move & 0x7F
+        to = move >> 7 & 0x7F
+        flag = move >> 17
+        
+        piece = side * PAWN if move >> 14 & 7 else b[to]
+        b[frm] = piece
+        b[to] = captured
+        
+        if flag == EN_PASSANT:
+            b[to - 16 * side] = -side * PAWN
+        elif flag == CASTLE:
+            rook_from, rook_to = CASTLE_ROOKS[to]
+            b[rook_from] = b[rook_to]
+            b[rook_to] = EMPTY
+        
+        if piece == side * KING:
+            self.kings[side] = frm
+        if side == BLACK:
+            self.fullmove -= 1
+        self._legal = None
+    
+    # ---------------------------------------------------------------- helpers
+    
+    def parse_move(self, text: str) -> Optional[int]:
+        """
+        The legal move for "e2e4" / "e2-e4" / "e7e8q" style input, or None.
+        A pawn reaching the last rank without a piece letter promotes to a queen.
+        """
+        text = text.strip().lower().replace("-", "").replace(" ", "")
+        frm, to = parse_square(text[0:2]), parse_square(text[2:4])
+        if frm is None or to is None:
+            return None
+        promotion = "nbrq".find(text[4]) + KNIGHT if len(text) > 4 else 0
+        wanted = promotion or QUEEN
+        for move in self.legal_moves():
+            if move & 0x7F == frm and move >> 7 & 0x7F == to and (move >> 14 & 7) in (0, wanted):
+                return move
+        return None
+    
+    def is_capture(self, move: int) -> bool:
+        return bool(self.board[move >> 7 & 0x7F]) or move >> 17 == EN_PASSANT
+    
+    def piece_at(self, row: int, col: int) -> str:
+        """Piece letter at a display row (0 = rank 8) and column, '.' if empty."""
+        return PIECE_CHARS[self.board[(7 - row) * 16 + col]]
+    
+    def rows(self) -> list[list[str]]:
+        """Board as 8 rows of piece letters, rank 8 first."""
+        return [[self.piece_at(row, col) for col in range(8)] for row in range(8)]
+    
+    def is_repetition(self, times: int = 3) -> bool:
+        """Has the current position occurred `times` times (since the last capture/pawn move)?"""
+        count = 1
+        for i in range(len(self.history) - 2, max(-1, len(self.history) - self.halfmove - 1), -2):
+            if self.history[i][5] == self.hash:
+                count += 1
+                if count >= times:
+                    return True
+        return False
+    
+    def insufficient_material(self) -> bool:
+        """Only kings, or king and one minor piece against a bare king."""
+        minors = 0
+        for sq in SQUARES:
+            piece = abs(self.board[sq])
+            if piece in (PAWN, ROOK, QUEEN):
+                return False
+            if piece in (KNIGHT, BISHOP):
+                minors += 1
+        return minors <= 1
+    
+    def outcome(self) -> Optional[str]:
+        """
+        None while the game goes on, otherwise "checkmate" (the side to move
+        lost), "stalemate", "fifty_moves", "repetition" or "insufficient_material".
+        """
+        if not self.legal_moves():
+            return "checkmate" if self.in_check() else "stalemate"
+        if self.halfmove >= 100:
+            return "fifty_moves"
+        if self.insufficient_material():
+            return "insufficient_material"
+        if self.is_repetition():
+            return "repetition"
+        return None
+
+
+def perft(board: ChessBoard, depth: int) -> int:
+    """Count leaf nodes of the legal move tree (the standard move-gen check)."""
+    moves = board.legal_moves()
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    nodes = 0
+    for move in moves:
+        board.make(move)
+        nodes += perft(board, depth - 1)
+        board.unmake()
+    return nodes
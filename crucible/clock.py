@@ -0,0 +1,125 @@
+"""
+Clock - Injectable time source for match and game pacing.
+
+Everything that paces a match (countdowns, answer deadlines, bot "thinking"
+delays, cleanup delays) goes through a Clock. RealClock uses the event loop.
+VirtualClock never actually waits: sleeping just moves its time forward, so
+whole matches and tournaments run at CPU speed in tests and simulations.
+
+Background housekeeping (expiry, heartbeat checks) waits with sleep_until(),
+which never moves the clock itself: on a VirtualClock it returns once
+something else has advanced time past the deadline.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from abc import ABC, abstractmethod
+from typing import Awaitable, TypeVar
+
+T = TypeVar("T")
+
+
+class Clock(ABC):
+    """Source of (monotonic) time and of delays."""
+    
+    @abstractmethod
+    def now(self) -> float:
+        """Seconds on a monotonic scale."""
+        pass
+    
+    @abstractmethod
+    async def sleep(self, seconds: float):
+        """Wait for `seconds` of this clock's time."""
+        pass
+    
+    @abstractmethod
+    async def sleep_until(self, deadline: float):
+        """Wait until now() >= deadline, without moving the clock."""
+        pass
+    
+    @abstractmethod
+    async def wait_for(self, awaitable: Awaitable[T], timeout: float) -> T:
+        """Like asyncio.wait_for, with the timeout measured on this clock."""
+        pass
+
+
+class RealClock(Clock):
+    """Wall-clock time via the running event loop."""
+    
+    def now(self) -> float:
+        return time.monotonic()
+    
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds)
+    
+    async def sleep_until(self, deadline: float):
+        await asyncio.sleep(max(0.0, deadline - self.now()))
+    
+    async def wait_for(self, awaitable: Awaitable[T], timeout: float) -> T:
+        return await asyncio.wait_for(awaitable, timeout=timeout)
+
+
+class VirtualClock(Clock):
+    """
+    Time that only moves when something waits on it.
+    
+    sleep() advances the clock and returns after a single loop iteration.
+    wait_for() gives the awaitable a few loop iterations to finish (enough
+    for answers submitted via call_soon or other ready tasks), and otherwise
+    jumps the clock to the deadline and times out. sleep_until() is passive:
+    it parks until an advance() reaches the deadline.
+    """
+    
+    def __init__(self, start: float = 0.0, settle_steps: int = 10):
+        self._now = start
+        self.settle_steps = settle_steps
+        self.slept = 0.0  # Total virtual seconds skipped
+        self._sleepers: list[tuple[float, int, asyncio.Future]] = []  # Heap of sleep_until() waiters
+        self._order = itertools.count()
+    
+    def now(self) -> float:
+        return self._now
+    
+    def advance(self, seconds: float):
+        seconds = max(0.0, seconds)
+        self._now += seconds
+        self.slept += seconds
+        while self._sleepers and self._sleepers[0][0] <= self._now:
+            _, _, waiter = heapq.heappop(self._sleepers)
+            if not waiter.done():
+                waiter.set_result(None)
+    
+    async def sleep(self, seconds: float):
+        self.advance(seconds)
+        await asyncio.sleep(0)
+    
+    async def sleep_until(self, deadline: float):
+        if deadline <= self._now:
+            await asyncio.sleep(0)
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (deadline, next(self._order), waiter))
+        await waiter
+    
+    async def wait_for(self, awaitable: Awaitable[T], timeout: float) -> T:
+        task = asyncio.ensure_future(awaitable)
+        for _ in range(self.settle_steps):
+            if task.done():
+                return task.result()
+            await asyncio.sleep(0)
+        if task.done():
+            return task.result()
+        
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        self.advance(timeout)
+        raise asyncio.TimeoutError()
+
+
+# Default for everything that isn't given a clock explicitly
+real_clock = RealClock()
@@ -0,0 +1,43 @@
+"""
+Encoding - Shared JSON encoding for frames sent to many sockets.
+
+Uses orjson when it is installed (pip install the-crucible[fast]) and falls
+back to the standard library otherwise. Output is compact UTF-8 JSON like
+Starlette's `send_json`. orjson is run with non-str dict keys allowed (ints
+become "1", as with json.dumps), and anything it still can't encode, such as
+integers over 64 bits, is retried with json.dumps. So a message the standard
+library could send is never dropped. The bytes may differ in edge cases: orjson
+writes NaN as null and encodes datetimes where json.dumps raises.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Optional speedup
+    orjson = None
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def dumps(obj: Any) -> str:
+    """Encode an object as a compact JSON string."""
+    return dumpb(obj).decode() if orjson is not None else _stdlib_dumps(obj)
+
+
+def dumpb(obj: Any) -> bytes:
+    """Encode an object as compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # Let the standard library encode it, or raise its own error
+    return _stdlib_dumps(obj).encode()
+
+
+def backend() -> str:
+    """Name of the active JSON encoder."""
+    return "orjson" if orjson is not None else "json"
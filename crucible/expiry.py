@@ -0,0 +1,186 @@
+"""
+Expiry - One scheduler for evicting finished matches and games.
+
+Finished matches and games stay visible for a while (so spectators see the
+result) and are then dropped. Rather than parking a sleeping task per item,
+each kind of item gets an ExpiryStore with a fixed time-to-live, and one
+ExpiryScheduler task per clock wakes when the earliest deadline across its
+stores comes due.
+
+With a fixed TTL, deadlines in a store are in insertion order, so a store is
+an OrderedDict used as a FIFO: scheduling, cancelling and evicting are O(1)
+and finding the next deadline means looking at the head of each store.
+A store can also cap how many finished items it keeps (max_count); past
+that, the oldest are evicted early.
+"""
+
+import asyncio
+import weakref
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+from .clock import Clock, real_clock
+
+
+class ExpiryStore:
+    """Items of one kind waiting to be evicted `ttl` seconds after they finished."""
+    
+    def __init__(
+        self,
+        scheduler: "ExpiryScheduler",
+        name: str,
+        ttl: float,
+        evict: Callable[[Hashable], None],
+        max_count: Optional[int] = None,
+    ):
+        self.scheduler = scheduler
+        self.name = name
+        self.ttl = ttl
+        self.evict = evict
+        self.max_count = max_count
+        self.pending: OrderedDict[Hashable, float] = OrderedDict()  # key -> deadline, oldest first
+        self.expired = 0
+        self.evicted_early = 0  # Over max_count before their time
+    
+    def __len__(self) -> int:
+        return len(self.pending)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.pending
+    
+    def expire(self, key: Hashable):
+        """Evict `key` after the TTL (restarting it if already pending)."""
+        deadline = self.scheduler.clock.now() + self.ttl
+        self.pending[key] = deadline
+        self.pending.move_to_end(key)
+        while self.max_count is not None and len(self.pending) > self.max_count:
+            oldest, _ = self.pending.popitem(last=False)
+            self.evicted_early += 1
+            self.evict(oldest)
+        self.scheduler.wake(deadline)
+    
+    def cancel(self, key: Hashable) -> bool:
+        """Keep `key` after all."""
+        return self.pending.pop(key, None) is not None
+    
+    def next_deadline(self) -> Optional[float]:
+        for deadline in self.pending.values():
+            return deadline
+        return None
+    
+    def evict_due(self, now: float) -> int:
+        evicted = 0
+        while self.pending:
+            key, deadline = next(iter(self.pending.items()))
+            if deadline > now:
+                break
+            del self.pending[key]
+            self.evict(key)
+            evicted += 1
+        self.expired += evicted
+        return evicted
+    
+    def get_stats(self) -> dict:
+        return {
+            "pending": len(self.pending),
+            "ttl": self.ttl,
+            "max_count": self.max_count,
+            "expired": self.expired,
+            "evicted_early": self.evicted_early,
+        }
+
+
+class ExpiryScheduler:
+    """Runs every store's evictions from one task, started while anything is pending."""
+    
+    def __init__(self, clock: Optional[Clock] = None):
+        self.clock = clock or real_clock
+        self.stores: dict[str, ExpiryStore] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._waiting_until: Optional[float] = None
+        self.wakeups = 0
+    
+    def store(
+        self,
+        name: str,
+        ttl: float,
+        evict: Callable[[Hashable], None],
+        max_count: Optional[int] = None,
+    ) -> ExpiryStore:
+        """A new store; `evict(key)` is called when one of its items expires."""
+        unique, n = name, 1
+        while unique in self.stores:
+            n += 1
+            unique = f"{name}#{n}"
+        store = self.stores[unique] = ExpiryStore(self, unique, ttl, evict, max_count)
+        return store
+    
+    def pending(self) -> int:
+        return sum(len(store) for store in self.stores.values())
+    
+    def next_deadline(self) -> Optional[float]:
+        deadlines = [d for d in (store.next_deadline() for store in self.stores.values()) if d is not None]
+        return min(deadlines) if deadlines else None
+    
+    def wake(self, deadline: float):
+        """A deadline was added: start the task, or wake it if this is sooner than it planned."""
+        if self._task is None or self._task.done() or self._task.get_loop() is not asyncio.get_running_loop():
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self.run())
+        elif self._waiting_until is not None and deadline < self._waiting_until:
+            self._wake.set()
+    
+    def evict_due(self) -> int:
+        now = self.clock.now()
+        return sum(store.evict_due(now) for store in self.stores.values())
+    
+    async def run(self):
+        """Sleep until the next deadline, evict, repeat; exit when nothing is pending."""
+        while True:
+            self.evict_due()
+            deadline = self.next_deadline()
+            if deadline is None:
+                break
+            self._waiting_until = deadline
+            self._wake.clear()
+            # sleep_until never moves a shared VirtualClock: matches own its time
+            due = asyncio.ensure_future(self.clock.sleep_until(deadline))
+            woken = asyncio.ensure_future(self._wake.wait())
+            try:
+                await asyncio.wait((due, woken), return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                due.cancel()
+                woken.cancel()
+            self._waiting_until = None
+            self.wakeups += 1
+    
+    def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+    
+    def get_stats(self) -> dict:
+        deadline = self.next_deadline()
+        return {
+            "pending": self.pending(),
+            "next_in": None if deadline is None else round(max(0.0, deadline - self.clock.now()), 1),
+            "wakeups": self.wakeups,
+            "stores": {name: store.get_stats() for name, store in self.stores.items()},
+        }
+
+
+# Shared scheduler for everything on the real clock
+expiry_scheduler = ExpiryScheduler()
+
+_schedulers: "weakref.WeakKeyDictionary[Clock, ExpiryScheduler]" = weakref.WeakKeyDictionary()
+
+
+def scheduler_for(clock: Clock) -> ExpiryScheduler:
+    """The scheduler shared by everything running on `clock`."""
+    if clock is real_clock:
+        return expiry_scheduler
+    scheduler = _schedulers.get(clock)
+    if scheduler is None:
+        scheduler = _schedulers[clock] = ExpiryScheduler(clock)
+    return scheduler
@@ -10,6 +10,9 @@ from typing import Optional, Callable
 from .match import Match, MatchPhase
 from .tribute import Tribute, TributeStatus
 from .challenges import Challenge, get_random_challenge, ChallengeResult
+from .challenge_bank import challenge_bank
+from .answers import AnswerRound, Submission
+from .clock import Clock, real_clock
 
 
 class GameMaster:
@@ -18,10 +21,18 @@ class GameMaster:
     Think of it as the AI overlord running the Hunger Games.
     """
     
-    def __init__(self, match: Match):
+    def __init__(self, match: Match, clock: Optional[Clock] = None):
         self.match = match
+        self.clock = clock or real_clock
         self.current_challenge: Optional[Challenge] = None
+        self.current_round: Optional[AnswerRound] = None
+        self.challenge_sampler = challenge_bank.sampler()  # No repeats within a match
         self.broadcast_callback: Optional[Callable] = None
+        self.send_callback: Optional[Callable] = None  # (tribute_id, message)
+        
+        # Answer latency per tribute across all rounds (ms), and rounds it sat out
+        self.latencies: dict[str, list[int]] = {}
+        self.missed: dict[str, int] = {}
         
         # Phase timings (seconds)
         self.bloodbath_duration = 60
@@ -39,13 +50,114 @@ class GameMaster:
                 **data,
             })
     
+    async def send_to_tributes(self, tributes: list[Tribute], message: dict):
+        """Send a message to each tribute's own connection."""
+        if self.send_callback:
+            await asyncio.gather(*(
+                self.send_callback(t.id, {"match_id": self.match.id, **message})
+                for t in tributes
+            ))
+    
+    async def forfeit(self, tribute_id: str, reason: str = "went silent") -> bool:
+        """Eliminate a tribute that left the match; False if it wasn't alive in it."""
+        tribute = next((t for t in self.match.alive_tributes() if t.id == tribute_id), None)
+        if tribute is None:
+            return False
+        tribute.eliminate()
+        if self.current_round:
+            self.current_round.withdraw(tribute_id)  # Don't hold the round open for it
+        self.match.log_event("elimination", f"💀 {tribute.name} {reason} and forfeits")
+        await self.broadcast("elimination", {"tribute": tribute.to_dict(), "forfeit": True})
+        return True
+    
+    def submit_answer(self, tribute_id: str, answer) -> str:
+        """
+        Feed an answer into the open round.
+        Returns "accepted" or the reason it was rejected.
+        """
+        if not self.current_round:
+            return "no_active_round"
+        return self.current_round.submit(tribute_id, answer)
+    
+    async def collect_answers(
+        self,
+        challenge: Challenge,
+        tributes: list[Tribute],
+        prompt: dict,
+        time_limit: Optional[float] = None,
+    ) -> dict[str, tuple[Submission, ChallengeResult]]:
+        """
+        Send the challenge to the tributes and wait until all of them have
+        answered or the time limit (default: the challenge's) passes. Returns graded answers by tribute id;
+        tributes that didn't answer are missing from the result.
+        """
+        self.current_challenge = challenge
+        self.current_round = AnswerRound(
+            expected=[t.id for t in tributes],
+            time_limit=time_limit if time_limit is not None else challenge.time_limit_seconds,
+            clock=self.clock,
+        )
+        answer_round = self.current_round
+        
+        await self.send_to_tributes(tributes, {"type": "challenge", "challenge": prompt})
+        submissions = await answer_round.wait()
+        self.current_round = None
+        
+        results = await challenge.evaluate_round({tid: s.answer for tid, s in submissions.items()})
+        graded = {}
+        for tribute_id, submission in submissions.items():
+            graded[tribute_id] = (submission, results[tribute_id])
+            self.latencies.setdefault(tribute_id, []).append(submission.latency_ms)
+        missing = answer_round.missing()
+        for tribute_id in missing:
+            self.missed[tribute_id] = self.missed.get(tribute_id, 0) + 1
+        
+        names = {t.id: t.name for t in tributes}
+        await self.broadcast("round_complete", {
+            "answered": len(submissions),
+            "expected": len(tributes),
+            "duration_ms": answer_round.duration_ms(),
+            "latencies": {names[tid]: s.latency_ms for tid, s in submissions.items()},
+            "missing": sorted(names[tid] for tid in missing),
+        })
+        return graded
+    
+    def get_stats(self) -> dict:
+        """Per-tribute answer stats for the match so far, by name."""
+        stats = {}
+        for tribute in self.match.tributes:
+            latencies = self.latencies.get(tribute.id, [])
+            stats[tribute.name] = {
+                "answered": len(latencies),
+                "missed": self.missed.get(tribute.id, 0),
+                "avg_latency_ms": round(sum(latencies) / len(latencies)) if latencies else None,
+                "best_latency_ms": min(latencies, default=None),
+            }
+        return stats
+    
+    @staticmethod
+    def rank_worst_first(
+        tributes: list[Tribute],
+        graded: dict[str, tuple[Submission, ChallengeResult]],
+    ) -> list[Tribute]:
+        """
+        Order tributes from worst to best: no answer, then wrong answers,
+        then correct answers from slowest to fastest. Ties are shuffled.
+        """
+        def badness(t: Tribute) -> tuple:
+            if t.id not in graded:
+                return (0, 0, random.random())
+            submission, result = graded[t.id]
+            return (2 if result.success else 1, -submission.latency_ms, random.random())
+        return sorted(tributes, key=badness)
+    
     async def run_match(self):
         """Execute the full match lifecycle."""
         
         # Countdown
         self.match.phase = MatchPhase.COUNTDOWN
         await self.broadcast("phase", {"phase": "countdown", "message": "Match starting in 10 seconds..."})
-        await asyncio.sleep(10)
+        await self.clock.sleep(10)
         
         # Start the games
         self.match.start()
@@ -82,7 +194,7 @@ class GameMaster:
         """
         self.match.phase = MatchPhase.BLOODBATH
         
-        challenge = get_random_challenge(difficulty=3)
+        challenge = get_random_challenge(difficulty=3, sampler=self.challenge_sampler)
         prompt = challenge.generate()
         
         await self.broadcast("challenge", {
@@ -91,13 +203,13 @@ class GameMaster:
             "message": "🩸 BLOODBATH - First to solve survives unscathed!",
         })
         
-        # In a real implementation, we'd wait for responses
-        # For now, simulate some tributes failing
-        await asyncio.sleep(self.bloodbath_duration)
+        # Wait for every tribute to answer, or the bloodbath to run out
+        alive = self.match.alive_tributes()
+        graded = await self.collect_answers(challenge, alive, prompt, time_limit=self.bloodbath_duration)
         
-        # Eliminate slowest 25%
+        # Damage the slowest/failing 25%
         alive = self.match.alive_tributes()
-        to_damage = random.sample(alive, k=max(1, len(alive) // 4))
+        to_damage = self.rank_worst_first(alive, graded)[:max(1, len(alive) // 4)]
         
         for tribute in to_damage:
             damage = random.randint(20, 40)
@@ -120,7 +232,7 @@ class GameMaster:
             if len(self.match.alive_tributes()) <= 2:
                 break
             
-            challenge = get_random_challenge(difficulty=5)
+            challenge = get_random_challenge(difficulty=5, sampler=self.challenge_sampler)
             prompt = challenge.generate()
             
             await self.broadcast("challenge", {
@@ -128,12 +240,12 @@ class GameMaster:
                 "challenge": prompt,
             })
             
-            await asyncio.sleep(challenge.time_limit_seconds)
+            graded = await self.collect_answers(challenge, self.match.alive_tributes(), prompt)
             
-            # Simulate: random tribute fails and takes damage
+            # The worst answer (none, wrong, or slowest) takes damage
             alive = self.match.alive_tributes()
             if alive:
-                victim = random.choice(alive)
+                victim = self.rank_worst_first(alive, graded)[0]
                 damage = random.randint(15, 35)
                 eliminated = victim.take_damage(damage)
                 
@@ -180,7 +292,7 @@ class GameMaster:
             if len(alive) >= 2:
                 t1, t2 = random.sample(alive, k=2)
                 
-                challenge = get_random_challenge(difficulty=7)
+                challenge = get_random_challenge(difficulty=7, sampler=self.challenge_sampler)
                 prompt = challenge.generate()
                 
                 await self.broadcast("duel", {
@@ -190,10 +302,12 @@ class GameMaster:
                     "message": f"⚔️ {t1.name} vs {t2.name}",
                 })
                 
-                await asyncio.sleep(challenge.time_limit_seconds)
+                graded = await self.collect_answers(challenge, [t1, t2], prompt)
+                if not (t1.is_alive() and t2.is_alive()):
+                    continue  # A duelist forfeited mid-duel: forfeit() already eliminated it
                 
-                # Random winner for now
-                loser = random.choice([t1, t2])
+                # Correct beats wrong beats silent; faster wins a tie
+                loser = self.rank_worst_first([t1, t2], graded)[0]
                 winner = t1 if loser == t2 else t2
                 
                 loser.eliminate(killed_by=winner)
@@ -9,6 +9,12 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Optional, Any
 
+from .checkers_engine import BLACK, RED, CheckersBoard
+from .chess_engine import ChessBoard, move_to_uci
+from .generators import problem_buffer
+from .grading import AnswerKey
+from .wordlist import wordlist
+
 
 class GameType(Enum):
     """Available game modes."""
@@ -73,20 +79,55 @@ class Game(ABC):
 # TIC-TAC-TOE
 # =============================================================================
 
+# Cell i of the board is bit i: row i // 3, column i % 3
+TTT_FULL = 0b111111111
+TTT_WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,  # Rows
+    0b001001001, 0b010010010, 0b100100100,  # Columns
+    0b100010001, 0b001010100,               # Diagonals
+)
+# Indexed by a player's 9-bit board: does it contain a line?
+TTT_WINS = tuple(
+    any(bits & mask == mask for mask in TTT_WIN_MASKS)
+    for bits in range(TTT_FULL + 1)
+)
+# Indexed by the occupied bits: the empty cells, in row-major order
+TTT_LEGAL_MOVES = tuple(
+    tuple(cell for cell in range(9) if not occupied >> cell & 1)
+    for occupied in range(TTT_FULL + 1)
+)
+
+
 class TicTacToe(Game):
-    """Classic Tic-Tac-Toe between two bots."""
+    """Classic Tic-Tac-Toe between two bots, on a pair of 9-bit boards."""
     
     game_type = GameType.TIC_TAC_TOE
     name = "Tic-Tac-Toe"
     description = "Classic 3x3 grid game. Get 3 in a row to win!"
     
     def __init__(self, player1_id: str, player2_id: str):
-        self.board = [["", "", ""], ["", "", ""], ["", "", ""]]
+        self.bits = [0, 0]  # X, O
         self.players = {player1_id: "X", player2_id: "O"}
         self.current_turn = player1_id
         self.player1_id = player1_id
         self.player2_id = player2_id
         self.moves = 0
+        self._board: Optional[list[list[str]]] = None
+    
+    @property
+    def board(self) -> list[list[str]]:
+        """The board as rows of "X" / "O" / "" (rendered once per move)."""
+        if self._board is None:
+            x, o = self.bits
+            self._board = [
+                ["X" if x >> i & 1 else "O" if o >> i & 1 else "" for i in range(row, row + 3)]
+                for row in (0, 3, 6)
+            ]
+        return self._board
+    
+    def legal_moves(self) -> tuple[int, ...]:
+        """Empty cells (0-8, row-major)."""
+        return TTT_LEGAL_MOVES[self.bits[0] | self.bits[1]]
     
     def get_prompt(self, player_id: str) -> dict:
         return {
@@ -109,15 +150,18 @@ class TicTacToe(Game):
         
         if not (0 <= row <= 2 and 0 <= col <= 2):
             return None
-        if self.board[row][col] != "":
+        cell = 1 << (row * 3 + col)
+        if (self.bits[0] | self.bits[1]) & cell:
             return None
         
         symbol = self.players[player_id]
-        self.board[row][col] = symbol
+        side = 0 if symbol == "X" else 1
+        self.bits[side] |= cell
         self.moves += 1
+        self._board = None
         
         # Check win
-        if self._check_win(symbol):
+        if TTT_WINS[self.bits[side]]:
             loser_id = self.player2_id if player_id == self.player1_id else self.player1_id
             return GameResult(
                 winner_id=player_id,
@@ -139,21 +183,7 @@ class TicTacToe(Game):
         return None
     
     def _check_win(self, symbol: str) -> bool:
-        b = self.board
-        # Rows
-        for row in b:
-            if all(cell == symbol for cell in row):
-                return True
-        # Columns
-        for col in range(3):
-            if all(b[row][col] == symbol for row in range(3)):
-                return True
-        # Diagonals
-        if all(b[i][i] == symbol for i in range(3)):
-            return True
-        if all(b[i][2-i] == symbol for i in range(3)):
-            return True
-        return False
+        return TTT_WINS[self.bits[0 if symbol == "X" else 1]]
     
     def get_state(self) -> dict:
         return {
@@ -320,29 +350,15 @@ class MathDuel(Game):
     name = "Math Duel"
     description = "Solve the math problem first to win!"
     
-    def __init__(self, player1_id: str, player2_id: str):
+    DIFFICULTY = 3
+    
+    def __init__(self, player1_id: str, player2_id: str, difficulty: int = DIFFICULTY):
         self.player1_id = player1_id
         self.player2_id = player2_id
-        self.problem, self.answer = self._generate_problem()
+        problem = problem_buffer.take("arithmetic", difficulty)  # Pre-generated
+        self.problem, self.answer = problem.prompt, int(problem.answer)
         self.solved = False
     
-    def _generate_problem(self) -> tuple[str, int]:
-        ops = [
-            ("+", lambda a, b: a + b),
-            ("-", lambda a, b: a - b),
-            ("*", lambda a, b: a * b),
-        ]
-        op_symbol, op_func = random.choice(ops)
-        
-        if op_symbol == "*":
-            a = random.randint(2, 15)
-            b = random.randint(2, 15)
-        else:
-            a = random.randint(10, 100)
-            b = random.randint(10, 100)
-        
-        return f"{a} {op_symbol} {b}", op_func(a, b)
-    
     def get_prompt(self, player_id: str) -> dict:
         return {
             "game": "math_duel",
@@ -380,6 +396,9 @@ class MathDuel(Game):
         }
 
 
+problem_buffer.warm("arithmetic", [MathDuel.DIFFICULTY])
+
+
 # =============================================================================
 # WORD CHAIN
 # =============================================================================
@@ -391,14 +410,6 @@ class WordChain(Game):
     name = "Word Chain"
     description = "Say a word starting with the last letter. No repeats! Fail = damage."
     
-    COMMON_WORDS = {
-        "apple", "banana", "cat", "dog", "elephant", "fox", "grape", "house",
-        "island", "jungle", "king", "lion", "moon", "night", "ocean", "piano",
-        "queen", "river", "star", "tiger", "umbrella", "violin", "water", "xray",
-        "yellow", "zebra", "tree", "eagle", "earth", "north", "south", "east",
-        "west", "train", "novel", "light", "tower", "robot", "table", "energy",
-    }
-    
     def __init__(self, player1_id: str, player2_id: str):
         self.player1_id = player1_id
         self.player2_id = player2_id
@@ -407,6 +418,11 @@ class WordChain(Game):
         self.last_word = random.choice(["apple", "tiger", "ocean", "eagle"])
         self.words_used.add(self.last_word)
         self.chain_length = 1
+        self.cursor = wordlist.cursor()
+    
+    def pick_unused(self, letter: str) -> Optional[str]:
+        """A dictionary word starting with `letter` not yet used in this game."""
+        return self.cursor.next_unused(letter, self.words_used)
     
     def get_prompt(self, player_id: str) -> dict:
         return {
@@ -430,7 +446,7 @@ class WordChain(Game):
             len(word) >= 2 and
             word[0] == required_letter and
             word not in self.words_used and
-            word.isalpha()
+            wordlist.is_valid(word)
         )
         
         if not is_valid:
@@ -465,11 +481,11 @@ class WordChain(Game):
 # =============================================================================
 
 class Chess(Game):
-    """Simplified Chess between two bots. First to capture King or checkmate wins."""
+    """Chess between two bots with full move validation. Checkmate wins."""
     
     game_type = GameType.CHESS
     name = "Chess"
-    description = "Classic Chess - capture the King to win!"
+    description = "Classic Chess - checkmate the King to win!"
     
     PIECES = {
         'K': '♔', 'Q': '♕', 'R': '♖', 'B': '♗', 'N': '♘', 'P': '♙',  # White
@@ -481,19 +497,17 @@ class Chess(Game):
         self.player2_id = player2_id  # Black
         self.current_turn = player1_id
         self.move_count = 0
-        self.king_captured = None
-        
-        # Standard chess starting position
-        self.board = [
-            ['r', 'n', 'b', 'q', 'k', 'b', 'n', 'r'],  # Row 0 (Black back)
-            ['p', 'p', 'p', 'p', 'p', 'p', 'p', 'p'],  # Row 1 (Black pawns)
-            ['.', '.', '.', '.', '.', '.', '.', '.'],
-            ['.', '.', '.', '.', '.', '.', '.', '.'],
-            ['.', '.', '.', '.', '.', '.', '.', '.'],
-            ['.', '.', '.', '.', '.', '.', '.', '.'],
-            ['P', 'P', 'P', 'P', 'P', 'P', 'P', 'P'],  # Row 6 (White pawns)
-            ['R', 'N', 'B', 'Q', 'K', 'B', 'N', 'R'],  # Row 7 (White back)
-        ]
+        self.engine = ChessBoard()
+        self._rendered: Optional[tuple[int, str]] = None  # (move_count, text)
+    
+    @property
+    def board(self) -> list[list[str]]:
+        """Rows of piece letters ('.' for empty), rank 8 first."""
+        return self.engine.rows()
+    
+    def legal_moves(self) -> list[str]:
+        """Legal moves for the side to move, e.g. ["e2e4", ...]."""
+        return [move_to_uci(m) for m in self.engine.legal_moves()]
     
     def get_prompt(self, player_id: str) -> dict:
         color = "white" if player_id == self.player1_id else "black"
@@ -508,76 +522,45 @@ class Chess(Game):
         }
     
     def _render_board(self) -> str:
+        if self._rendered and self._rendered[0] == self.move_count:
+            return self._rendered[1]
         lines = ["  a b c d e f g h"]
-        for row_idx, row in enumerate(self.board):
-            row_num = 8 - row_idx
-            pieces = ' '.join(self.PIECES.get(p, '·') for p in row)
-            lines.append(f"{row_num} {pieces}")
-        return '\n'.join(lines)
-    
-    def _parse_move(self, move: str) -> tuple:
-        """Parse 'e2e4' format to ((row, col), (row, col))."""
-        move = move.lower().replace(' ', '').replace('-', '')
-        if len(move) < 4:
-            return None, None
-        
-        try:
-            from_col = ord(move[0]) - ord('a')
-            from_row = 8 - int(move[1])
-            to_col = ord(move[2]) - ord('a')
-            to_row = 8 - int(move[3])
-            
-            if all(0 <= x <= 7 for x in [from_row, from_col, to_row, to_col]):
-                return (from_row, from_col), (to_row, to_col)
-        except:
-            pass
-        return None, None
-    
-    def _is_own_piece(self, piece: str, player_id: str) -> bool:
-        if player_id == self.player1_id:
-            return piece.isupper()
-        return piece.islower()
+        for row_idx in range(8):
+            pieces = ' '.join(self.PIECES.get(self.engine.piece_at(row_idx, col), '·') for col in range(8))
+            lines.append(f"{8 - row_idx} {pieces}")
+        text = '\n'.join(lines)
+        self._rendered = (self.move_count, text)
+        return text
     
     def submit_move(self, player_id: str, move: str) -> Optional[GameResult]:
         if player_id != self.current_turn:
             return None
         
-        from_pos, to_pos = self._parse_move(move)
-        if from_pos is None:
-            return None
-        
-        from_row, from_col = from_pos
-        to_row, to_col = to_pos
-        
-        piece = self.board[from_row][from_col]
-        target = self.board[to_row][to_col]
-        
-        # Validate own piece
-        if not self._is_own_piece(piece, player_id):
-            return None
-        
-        # Can't capture own piece
-        if target != '.' and self._is_own_piece(target, player_id):
+        parsed = self.engine.parse_move(move)
+        if parsed is None:
             return None
         
-        # Execute move (simplified - no full move validation)
-        self.board[to_row][to_col] = piece
-        self.board[from_row][from_col] = '.'
+        self.engine.make(parsed)
         self.move_count += 1
+        opponent = self.player2_id if player_id == self.player1_id else self.player1_id
         
-        # Check for king capture
-        if target.lower() == 'k':
-            loser = self.player2_id if player_id == self.player1_id else self.player1_id
+        outcome = self.engine.outcome()
+        if outcome == "checkmate":
             return GameResult(
                 winner_id=player_id,
-                loser_id=loser,
+                loser_id=opponent,
                 damage_to_loser=50,
                 reward_to_winner=25,
-                message=f"♔ CHECKMATE! King captured in {self.move_count} moves!"
+                message=f"♔ CHECKMATE in {self.move_count} moves!"
+            )
+        if outcome:
+            return GameResult(
+                is_draw=True,
+                message=f"♔ Chess draw by {outcome.replace('_', ' ')} after {self.move_count} moves."
             )
         
         # Switch turn
-        self.current_turn = self.player2_id if player_id == self.player1_id else self.player1_id
+        self.current_turn = opponent
         return None
     
     def get_state(self) -> dict:
@@ -586,6 +569,7 @@ class Chess(Game):
             "board": self._render_board(),
             "current_turn": self.current_turn,
             "move_count": self.move_count,
+            "in_check": self.engine.in_check(),
         }
 
 
@@ -605,26 +589,29 @@ class Checkers(Game):
         self.player2_id = player2_id  # Black (top)
         self.current_turn = player1_id
         self.move_count = 0
-        
-        # 8x8 board: 'r' = red, 'b' = black, 'R'/'B' = kings, '.' = empty
-        self.board = [
-            ['.', 'b', '.', 'b', '.', 'b', '.', 'b'],
-            ['b', '.', 'b', '.', 'b', '.', 'b', '.'],
-            ['.', 'b', '.', 'b', '.', 'b', '.', 'b'],
-            ['.', '.', '.', '.', '.', '.', '.', '.'],
-            ['.', '.', '.', '.', '.', '.', '.', '.'],
-            ['r', '.', 'r', '.', 'r', '.', 'r', '.'],
-            ['.', 'r', '.', 'r', '.', 'r', '.', 'r'],
-            ['r', '.', 'r', '.', 'r', '.', 'r', '.'],
-        ]
+        self.engine = CheckersBoard()
+        self._rendered: Optional[tuple[int, str]] = None  # (move_count, text)
+    
+    @property
+    def board(self) -> list[list[str]]:
+        """8x8 rows: 'r' = red, 'b' = black, 'R'/'B' = kings, '.' = empty."""
+        return self.engine.rows()
+    
+    def legal_moves(self) -> list[str]:
+        """Legal moves for the side to move, e.g. ["5,0-4,1", ...]."""
+        return [m.to_text() for m in self.engine.legal_moves()]
     
     def _render_board(self) -> str:
+        if self._rendered and self._rendered[0] == self.move_count:
+            return self._rendered[1]
         symbols = {'r': '🔴', 'b': '⚫', 'R': '👑', 'B': '♛', '.': '·'}
         lines = ["  0 1 2 3 4 5 6 7"]
-        for row_idx, row in enumerate(self.board):
-            pieces = ' '.join(symbols.get(p, p) for p in row)
+        for row_idx in range(8):
+            pieces = ' '.join(symbols[self.engine.piece_at(row_idx, col)] for col in range(8))
             lines.append(f"{row_idx} {pieces}")
-        return '\n'.join(lines)
+        text = '\n'.join(lines)
+        self._rendered = (self.move_count, text)
+        return text
     
     def get_prompt(self, player_id: str) -> dict:
         color = "red" if player_id == self.player1_id else "black"
@@ -633,65 +620,22 @@ class Checkers(Game):
             "your_color": color,
             "board": self._render_board(),
             "your_turn": self.current_turn == player_id,
-            "instruction": "Reply with move: row,col to row,col (e.g., '5,0 to 4,1')",
+            "instruction": "Reply with move: row,col to row,col (e.g., '5,0 to 4,1'). "
+                           "Captures are mandatory; list each landing square for multi-jumps.",
         }
     
-    def _is_own_piece(self, piece: str, player_id: str) -> bool:
-        if player_id == self.player1_id:
-            return piece.lower() == 'r'
-        return piece.lower() == 'b'
-    
     def _count_pieces(self, player_id: str) -> int:
-        count = 0
-        for row in self.board:
-            for piece in row:
-                if self._is_own_piece(piece, player_id):
-                    count += 1
-        return count
+        return self.engine.counts[RED if player_id == self.player1_id else BLACK]
     
     def submit_move(self, player_id: str, move: str) -> Optional[GameResult]:
         if player_id != self.current_turn:
             return None
         
-        # Parse move like "5,0 to 4,1" or "5,0-4,1" or "5 0 4 1"
-        import re
-        nums = re.findall(r'\d+', move)
-        if len(nums) < 4:
-            return None
-        
-        try:
-            from_row, from_col = int(nums[0]), int(nums[1])
-            to_row, to_col = int(nums[2]), int(nums[3])
-        except:
-            return None
-        
-        if not all(0 <= x <= 7 for x in [from_row, from_col, to_row, to_col]):
-            return None
-        
-        piece = self.board[from_row][from_col]
-        
-        if not self._is_own_piece(piece, player_id):
-            return None
-        
-        if self.board[to_row][to_col] != '.':
+        parsed = self.engine.parse_move(move)
+        if parsed is None:
             return None
         
-        # Execute move
-        self.board[to_row][to_col] = piece
-        self.board[from_row][from_col] = '.'
-        
-        # Check for jump/capture (simplified)
-        if abs(to_row - from_row) == 2:
-            mid_row = (from_row + to_row) // 2
-            mid_col = (from_col + to_col) // 2
-            self.board[mid_row][mid_col] = '.'  # Remove captured piece
-        
-        # King promotion
-        if piece == 'r' and to_row == 0:
-            self.board[to_row][to_col] = 'R'
-        elif piece == 'b' and to_row == 7:
-            self.board[to_row][to_col] = 'B'
-        
+        self.engine.make(parsed)
         self.move_count += 1
         
         # Check for winner
@@ -704,6 +648,14 @@ class Checkers(Game):
                 reward_to_winner=20,
                 message=f"🔴 Checkers Winner! All pieces captured in {self.move_count} moves!"
             )
+        if not self.engine.legal_moves():
+            return GameResult(
+                winner_id=player_id,
+                loser_id=opponent,
+                damage_to_loser=40,
+                reward_to_winner=20,
+                message=f"🔴 Checkers Winner! Opponent blocked in {self.move_count} moves!"
+            )
         
         # Switch turn
         self.current_turn = opponent
@@ -724,6 +676,14 @@ class Checkers(Game):
 # TRIVIA
 # =============================================================================
 
+# Other accepted forms of Trivia answers
+TRIVIA_ALIASES = {
+    "pacific": ["pacific ocean"],
+    "da vinci": ["leonardo da vinci", "leonardo"],
+    "carbon dioxide": ["co2"],
+}
+
+
 class Trivia(Game):
     """Answer trivia questions."""
     
@@ -743,6 +703,7 @@ class Trivia(Game):
         ("What gas do plants absorb?", "carbon dioxide"),
         ("What is the hardest natural substance?", "diamond"),
     ]
+    KEYS = {q: AnswerKey(a, TRIVIA_ALIASES.get(a, ())) for q, a in QUESTIONS}
     
     def __init__(self, player1_id: str, player2_id: str):
         self.player1_id = player1_id
@@ -761,9 +722,7 @@ class Trivia(Game):
         if self.solved:
             return None
         
-        guess = move.lower().strip()
-        
-        if self.answer in guess or guess in self.answer:
+        if self.KEYS[self.question].accepts(move):
             self.solved = True
             loser = self.player2_id if player_id == self.player1_id else self.player1_id
             return GameResult(
@@ -788,20 +747,22 @@ class Trivia(Game):
 # GAME FACTORY
 # =============================================================================
 
+# Game types that have a two-player implementation
+GAME_CLASSES: dict[GameType, type[Game]] = {
+    GameType.TIC_TAC_TOE: TicTacToe,
+    GameType.ROCK_PAPER_SCISSORS: RockPaperScissors,
+    GameType.NUMBER_GUESS: NumberGuess,
+    GameType.MATH_DUEL: MathDuel,
+    GameType.WORD_CHAIN: WordChain,
+    GameType.TRIVIA: Trivia,
+    GameType.CHESS: Chess,
+    GameType.CHECKERS: Checkers,
+}
+
+
 def create_game(game_type: GameType, player1_id: str, player2_id: str) -> Game:
     """Create a game instance of the specified type."""
-    games = {
-        GameType.TIC_TAC_TOE: TicTacToe,
-        GameType.ROCK_PAPER_SCISSORS: RockPaperScissors,
-        GameType.NUMBER_GUESS: NumberGuess,
-        GameType.MATH_DUEL: MathDuel,
-        GameType.WORD_CHAIN: WordChain,
-        GameType.TRIVIA: Trivia,
-        GameType.CHESS: Chess,
-        GameType.CHECKERS: Checkers,
-    }
-    
-    game_class = games.get(game_type)
+    game_class = GAME_CLASSES.get(game_type)
     if game_class:
         return game_class(player1_id, player2_id)
     
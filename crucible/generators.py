@@ -0,0 +1,339 @@
+"""
+Generators - Procedural puzzles with a pre-generated buffer.
+
+Each generator turns (rng, difficulty 1-10) into a Problem: a prompt and
+its precomputed answer. Kinds:
+- arithmetic: a bare expression ("12 + 7 * 3"), used by Math Duel
+- sequence:   next number in a progression
+- logic:      word problems and syllogisms
+- string:     reverse / count / sort / strip / shift a word
+
+ProblemBuffer keeps a queue of ready problems per (kind, difficulty) and a
+background task tops the queues up, so creating a game or a challenge
+round just pops one. If a queue runs dry the problem is generated inline
+and counted as a miss.
+"""
+
+import asyncio
+import random
+from collections import deque
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from .wordlist import FALLBACK_WORDS
+
+
+class Problem(NamedTuple):
+    """A generated puzzle with its answer already worked out."""
+    kind: str
+    difficulty: int
+    prompt: str
+    answer: str
+    aliases: tuple[str, ...] = ()
+    
+    def as_item(self) -> dict:
+        """The problem as a challenge bank item (prompt / answer / aliases)."""
+        return {"prompt": self.prompt, "answer": self.answer, "aliases": list(self.aliases)}
+
+
+def clamp_difficulty(difficulty: int) -> int:
+    return max(1, min(10, int(difficulty)))
+
+
+# =============================================================================
+# GENERATORS
+# =============================================================================
+
+def _evaluate(numbers: list[int], ops: list[str]) -> int:
+    """Value of numbers joined by + - * with the usual precedence."""
+    total, term, sign = 0, numbers[0], 1
+    for op, n in zip(ops, numbers[1:]):
+        if op == "*":
+            term *= n
+        else:
+            total += sign * term
+            sign, term = (1 if op == "+" else -1), n
+    return total + sign * term
+
+
+def arithmetic(rng: random.Random, difficulty: int) -> Problem:
+    """+, - and * with operands and term count growing with difficulty."""
+    terms = 2 if difficulty <= 4 else 3 if difficulty <= 7 else 4
+    big = 10 + 30 * difficulty  # +/- operands (10-100 at difficulty 3)
+    small = 3 + 4 * difficulty  # * operands (2-15 at difficulty 3)
+    ops = [rng.choice("+-*") for _ in range(terms - 1)]
+    numbers = [
+        rng.randint(2, small) if "*" in ops[max(0, i - 1):i + 1] else rng.randint(10, big)
+        for i in range(terms)
+    ]
+    expression = " ".join([str(numbers[0])] + [f"{op} {n}" for op, n in zip(ops, numbers[1:])])
+    return Problem("arithmetic", difficulty, expression, str(_evaluate(numbers, ops)))
+
+
+def sequence(rng: random.Random, difficulty: int) -> Problem:
+    """Next term of a progression; harder ones are quadratic, recursive or interleaved."""
+    if difficulty <= 2:
+        start, step = rng.randint(1, 20), rng.randint(2, 9) * rng.choice((1, -1) if difficulty == 2 else (1,))
+        seq = [start + step * i for i in range(6)]
+    elif difficulty <= 4:
+        if rng.random() < 0.5:
+            start, ratio = rng.randint(1, 5), rng.randint(2, 3)
+            seq = [start * ratio ** i for i in range(6)]
+        else:
+            offset = rng.randint(0, 5)
+            seq = [(i + 1) ** 2 + offset for i in range(6)]
+    elif difficulty <= 6:
+        if rng.random() < 0.5:
+            a, b, c = rng.randint(0, 9), rng.randint(1, 5), rng.randint(1, 3)
+            seq = [a + b * i + c * i * i for i in range(6)]
+        else:
+            seq = [rng.randint(1, 5), rng.randint(1, 5)]
+            while len(seq) < 6:
+                seq.append(seq[-1] + seq[-2])
+    else:
+        if rng.random() < 0.5:
+            a, da, b, db = rng.randint(1, 9), rng.randint(2, 7), rng.randint(20, 40), -rng.randint(1, 4)
+            seq = [a + da * (i // 2) if i % 2 == 0 else b + db * (i // 2) for i in range(7)]
+        else:
+            offset = rng.randint(-5, 5)
+            seq = [(i + 1) ** 3 + offset for i in range(6)]
+    shown, answer = seq[:-1], seq[-1]
+    prompt = f"What is the next number in the sequence: {', '.join(map(str, shown))}, ?"
+    return Problem("sequence", difficulty, prompt, str(answer))
+
+
+SYLLABLES = ("bl", "oop", "raz", "zie", "laz", "glo", "rp", "fen", "dax", "wu", "mib", "tor")
+
+
+def _nonsense(rng: random.Random) -> str:
+    return (rng.choice(SYLLABLES) + rng.choice(SYLLABLES)).capitalize()
+
+
+def _syllogism(rng: random.Random, difficulty: int) -> tuple[str, str]:
+    a, b, c = _nonsense(rng), _nonsense(rng), _nonsense(rng)
+    form = rng.randrange(3 if difficulty >= 3 else 1)
+    if form == 0:
+        return f"If all {a}s are {b}s and all {b}s are {c}s, are all {a}s {c}s?", "yes"
+    if form == 1:
+        return f"If all {a}s are {b}s and some {b}s are {c}s, must every {a} be a {c}?", "no"
+    return f"If no {a}s are {b}s and all {c}s are {a}s, can a {c} be a {b}?", "no"
+
+
+def _all_but(rng: random.Random, difficulty: int) -> tuple[str, str]:
+    total = rng.randint(10, 40)
+    left = rng.randint(2, total - 2)
+    animal = rng.choice(("sheep", "goats", "cows", "chickens"))
+    return f"A farmer has {total} {animal}. All but {left} run away. How many are left?", str(left)
+
+
+def _percent(rng: random.Random, difficulty: int) -> tuple[str, str]:
+    percent = rng.choice((5, 10, 15, 20, 25, 50, 75))
+    whole = rng.randint(1, 5 * difficulty) * 20
+    return f"What is {percent}% of {whole}?", str(percent * whole // 100)
+
+
+def _ages(rng: random.Random, difficulty: int) -> tuple[str, str]:
+    younger = rng.randint(5, 40)
+    gap = rng.randint(1, 15)
+    return (
+        f"Ann is {gap} years older than Ben. Together their ages add up to {2 * younger + gap}. "
+        f"How old is Ann?",
+        str(younger + gap),
+    )
+
+
+def _handshakes(rng: random.Random, difficulty: int) -> tuple[str, str]:
+    people = rng.randint(4, 4 + 3 * difficulty)
+    return (
+        f"{people} people each shake hands with everyone else exactly once. How many handshakes happen?",
+        str(people * (people - 1) // 2),
+    )
+
+
+def _machines(rng: random.Random, difficulty: int) -> tuple[str, str]:
+    machines = rng.randint(3, 9)
+    minutes = rng.randint(2, 12)
+    more = machines * rng.randint(5, 20)
+    return (
+        f"If {machines} machines make {machines} widgets in {minutes} minutes, how many minutes "
+        f"do {more} machines take to make {more} widgets?",
+        str(minutes),
+    )
+
+
+# (template, minimum difficulty)
+LOGIC_TEMPLATES: list[tuple[Callable[[random.Random, int], tuple[str, str]], int]] = [
+    (_syllogism, 1),
+    (_all_but, 2),
+    (_percent, 3),
+    (_ages, 4),
+    (_handshakes, 5),
+    (_machines, 6),
+]
+
+
+def logic(rng: random.Random, difficulty: int) -> Problem:
+    """A word problem from the templates unlocked at this difficulty."""
+    template = rng.choice([t for t, min_difficulty in LOGIC_TEMPLATES if min_difficulty <= difficulty])
+    prompt, answer = template(rng, difficulty)
+    aliases = {"yes": ("y", "true"), "no": ("n", "false")}.get(answer, ())
+    return Problem("logic", difficulty, prompt, answer, aliases)
+
+
+def _shift(word: str, k: int) -> str:
+    return "".join(chr((ord(c) - 97 + k) % 26 + 97) for c in word)
+
+
+def string(rng: random.Random, difficulty: int) -> Problem:
+    """Word manipulation; longer words and more operations as difficulty grows."""
+    word = rng.choice(FALLBACK_WORDS)
+    if difficulty >= 7:
+        word += rng.choice(FALLBACK_WORDS)
+    ops = ["reverse", "count"]
+    if difficulty >= 3:
+        ops.append("sort")
+    if difficulty >= 5:
+        ops.append("strip")
+    if difficulty >= 6:
+        ops.append("shift")
+    op = rng.choice(ops)
+    
+    if op == "reverse":
+        return Problem("string", difficulty, f"Write the word '{word}' backwards.", word[::-1])
+    if op == "count":
+        letter = rng.choice(word)
+        return Problem("string", difficulty, f"How many times does the letter '{letter}' appear in '{word}'?",
+                       str(word.count(letter)))
+    if op == "sort":
+        return Problem("string", difficulty, f"Write the letters of '{word}' in alphabetical order.",
+                       "".join(sorted(word)))
+    if op == "strip":
+        stripped = "".join(c for c in word if c not in "aeiou")
+        if stripped:
+            return Problem("string", difficulty, f"Write '{word}' with every vowel (a, e, i, o, u) removed.",
+                           stripped)
+        return Problem("string", difficulty, f"Write the word '{word}' backwards.", word[::-1])
+    k = rng.randint(1, 3 + difficulty)
+    return Problem(
+        "string", difficulty,
+        f"Shift each letter of '{word}' forward {k} places in the alphabet (z wraps to a).",
+        _shift(word, k),
+    )
+
+
+GENERATORS: dict[str, Callable[[random.Random, int], Problem]] = {
+    "arithmetic": arithmetic,
+    "sequence": sequence,
+    "logic": logic,
+    "string": string,
+}
+
+# Kinds that read as challenge-round puzzles (arithmetic is a bare expression)
+PUZZLE_KINDS = ("sequence", "logic", "string")
+
+
+def generate(kind: str, difficulty: int, rng: Optional[random.Random] = None) -> Problem:
+    """Generate one problem now."""
+    return GENERATORS[kind](rng or random, clamp_difficulty(difficulty))
+
+
+# =============================================================================
+# BUFFER
+# =============================================================================
+
+class ProblemBuffer:
+    """Ready-made problems per (kind, difficulty), refilled in the background."""
+    
+    BATCH = 16  # Problems generated between yields to the event loop
+    
+    def __init__(self, size: int = 64, rng: Optional[random.Random] = None):
+        self.size = size
+        self.low_water = size // 2
+        self.rng = rng or random.Random()
+        self._ready: dict[tuple[str, int], deque[Problem]] = {}
+        self._wanted: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+    
+    def _queue(self, kind: str, difficulty: int) -> deque[Problem]:
+        key = (kind, clamp_difficulty(difficulty))
+        ready = self._ready.get(key)
+        if ready is None:
+            if kind not in GENERATORS:
+                raise KeyError(f"unknown problem kind: {kind}")
+            ready = self._ready[key] = deque()
+        return ready
+    
+    def warm(self, kind: str, difficulties: Iterable[int]):
+        """Register keys for the background task to keep full."""
+        for difficulty in difficulties:
+            self._queue(kind, difficulty)
+        if self._wanted:
+            self._wanted.set()
+    
+    def take(self, kind: str, difficulty: int) -> Problem:
+        """A ready problem, or one generated inline if the buffer is empty."""
+        ready = self._queue(kind, difficulty)
+        if ready:
+            self.hits += 1
+            problem = ready.popleft()
+        else:
+            self.misses += 1
+            problem = generate(kind, difficulty, self.rng)
+        if len(ready) < self.low_water and self._wanted:
+            self._wanted.set()
+        return problem
+    
+    def fill(self) -> int:
+        """Synchronously top up every queue. Returns the number generated."""
+        count = 0
+        for (kind, difficulty), ready in list(self._ready.items()):
+            while len(ready) < self.size:
+                ready.append(GENERATORS[kind](self.rng, difficulty))
+                count += 1
+        self.generated += count
+        return count
+    
+    async def run(self):
+        """Refill loop: wakes when a queue drops below the low-water mark."""
+        self._wanted = asyncio.Event()
+        self._wanted.set()
+        while True:
+            await self._wanted.wait()
+            self._wanted.clear()
+            for (kind, difficulty), ready in list(self._ready.items()):
+                generator = GENERATORS[kind]
+                while len(ready) < self.size:
+                    for _ in range(min(self.BATCH, self.size - len(ready))):
+                        ready.append(generator(self.rng, difficulty))
+                        self.generated += 1
+                    await asyncio.sleep(0)
+    
+    def start(self):
+        """Start the background refill task (call from a running loop)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+    
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._wanted = None
+    
+    def get_stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "generated": self.generated,
+            "ready": {f"{kind}:{difficulty}": len(q) for (kind, difficulty), q in sorted(self._ready.items())},
+        }
+
+
+# Shared buffer; the server starts its refill task
+problem_buffer = ProblemBuffer()
@@ -0,0 +1,80 @@
+"""
+Grading - Normalized answer matching for trivia and puzzle questions.
+
+Every accepted answer (the canonical one plus aliases) is normalized once,
+when the question bank is loaded, into a frozenset. Grading a submission is
+then one normalization and one set lookup, and grade_many() grades a whole
+round's answers in a single pass.
+
+Normalization: lowercase, accents stripped, thousands separators and
+punctuation dropped, number words turned into digits ("eight" -> "8",
+"8.0" -> "8"), a leading article dropped, and whitespace removed, so
+"The Pacific Ocean", "pacific-ocean" and "Pacific ocean." all agree.
+Symbols that change a word's meaning are kept: trailing "+" / "#" and dots
+inside a word, so "C", "C++", "C#" and "Node.js" stay distinct.
+"""
+
+import re
+import unicodedata
+from typing import Any, Iterable
+
+NUMBER_WORDS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16,
+    "seventeen": 17, "eighteen": 18, "nineteen": 19, "twenty": 20,
+    "thirty": 30, "forty": 40, "fifty": 50, "sixty": 60, "seventy": 70,
+    "eighty": 80, "ninety": 90, "hundred": 100,
+}
+ARTICLES = {"the", "a", "an"}
+
+_THOUSANDS = re.compile(r"(?<=\d),(?=\d{3}\b)")
+_TOKENS = re.compile(r"-?\d+(?:\.\d+)?|[a-z]+(?:\.[a-z]+)*[+#]*")
+
+
+def _number(token: str) -> str:
+    """Canonical digits for a numeric token ("8.0" -> "8", "0.50" -> "0.5")."""
+    value = float(token)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def normalize(answer: Any) -> str:
+    """Canonical lookup key for an answer; "" if there is nothing to grade."""
+    if answer is None:
+        return ""
+    text = unicodedata.normalize("NFKD", str(answer).lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    tokens = _TOKENS.findall(_THOUSANDS.sub("", text))
+    if len(tokens) > 1 and tokens[0] in ARTICLES:
+        tokens = tokens[1:]
+    out = []
+    for token in tokens:
+        if token in NUMBER_WORDS:
+            token = str(NUMBER_WORDS[token])
+        elif token[0].isdigit() or token[0] == "-":
+            token = _number(token)
+        out.append(token)
+    return "".join(out)
+
+
+class AnswerKey:
+    """The normalized set of accepted answers for one question."""
+    
+    __slots__ = ("answer", "accepted")
+    
+    def __init__(self, answer: str, aliases: Iterable[str] = ()):
+        self.answer = answer
+        self.accepted = frozenset(k for k in map(normalize, (answer, *aliases)) if k)
+    
+    def accepts(self, answer: Any) -> bool:
+        return normalize(answer) in self.accepted
+    
+    def grade_many(self, answers: Iterable[Any]) -> list[bool]:
+        """Grade a batch of answers against this key, in order."""
+        accepted = self.accepted
+        return [normalize(a) in accepted for a in answers]
+
+
+def build_keys(questions: Iterable[dict], question: str, answer: str) -> dict[str, AnswerKey]:
+    """Answer keys for a question bank, by question text. Aliases come from "aliases"."""
+    return {q[question]: AnswerKey(q[answer], q.get("aliases", ())) for q in questions}
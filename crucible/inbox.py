@@ -0,0 +1,211 @@
+"""
+Inbox - Rate-limited, serialized move processing for live games.
+
+Moves from agents don't run the game inline in the socket handler. Each
+move first has to get a token from two buckets - the agent's own, and the
+agent's bucket for this game type (speed games, where spamming guesses
+pays off, get a tighter budget) - and is then queued in the agent's bounded
+inbox for that game. One GameActor per live game drains its players'
+inboxes in turn, so a game's moves are applied one at a time and a flooding
+player can't starve their opponent. The actor task exits when the inboxes
+are empty and is restarted by the next move.
+
+A move that finds its inbox full is handled per OverflowPolicy. Moves
+dropped by either check never reach the game, so they never cause a state
+broadcast to spectators.
+"""
+
+import asyncio
+from collections import deque
+from enum import Enum
+from typing import Any, Awaitable, Callable, Optional
+
+from .clock import Clock, real_clock
+
+
+class OverflowPolicy(Enum):
+    """What to do with a move when the agent's inbox is full."""
+    DROP_NEWEST = "drop_newest"   # Reject the incoming move
+    DROP_OLDEST = "drop_oldest"   # Discard the agent's oldest queued move
+    DISCONNECT = "disconnect"     # Drop the agent (forfeiting its game)
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `burst`; refilled lazily on take()."""
+    
+    __slots__ = ("rate", "burst", "tokens", "updated")
+    
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+    
+    def refill(self, now: float) -> bool:
+        """Top up for the time passed; True if a token is available."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens >= 1.0
+    
+    def take(self, now: float) -> bool:
+        if not self.refill(now):
+            return False
+        self.tokens -= 1.0
+        return True
+    
+    def refund(self):
+        """Give back a token taken for a move that was never queued."""
+        self.tokens = min(self.burst, self.tokens + 1.0)
+
+
+class GameActor:
+    """Applies one game's moves in order, taking the players' inboxes in turn."""
+    
+    def __init__(
+        self,
+        game_id: str,
+        handler: Callable[[str, Any], Awaitable[None]],
+        inbox_size: int,
+        policy: OverflowPolicy,
+    ):
+        self.game_id = game_id
+        self.handler = handler
+        self.inbox_size = inbox_size
+        self.policy = policy
+        self.inboxes: dict[str, deque] = {}
+        self._task: Optional[asyncio.Task] = None
+    
+    def queued(self) -> int:
+        return sum(len(inbox) for inbox in self.inboxes.values())
+    
+    def put(self, agent_id: str, move: Any) -> str:
+        """Queue a move: "accepted", "replaced" (oldest queued one dropped), "inbox_full" or "disconnect"."""
+        inbox = self.inboxes.get(agent_id)
+        if inbox is None:
+            inbox = self.inboxes[agent_id] = deque()
+        status = "accepted"
+        if len(inbox) >= self.inbox_size:
+            if self.policy is OverflowPolicy.DROP_NEWEST:
+                return "inbox_full"
+            if self.policy is OverflowPolicy.DISCONNECT:
+                return "disconnect"
+            inbox.popleft()
+            status = "replaced"
+        inbox.append(move)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return status
+    
+    async def run(self):
+        """Drain the inboxes round-robin; exit when they are empty."""
+        while True:
+            progressed = False
+            for agent_id, inbox in list(self.inboxes.items()):
+                if not inbox:
+                    continue
+                move = inbox.popleft()
+                progressed = True
+                try:
+                    await self.handler(agent_id, move)
+                except Exception as e:
+                    print(f"Move error in {self.game_id}: {e}")
+            if not progressed:
+                break
+    
+    def close(self):
+        """Discard queued moves; a move being applied finishes, nothing after it runs."""
+        for inbox in self.inboxes.values():
+            inbox.clear()
+
+
+class MoveRouter:
+    """Rate limits moves and hands them to their game's actor."""
+    
+    def __init__(
+        self,
+        handler: Callable[[str, Any], Awaitable[None]],
+        clock: Optional[Clock] = None,
+        rate: float = 5.0,
+        burst: float = 10,
+        game_rates: Optional[dict[str, tuple[float, float]]] = None,
+        inbox_size: int = 8,
+        policy: OverflowPolicy = OverflowPolicy.DROP_NEWEST,
+    ):
+        self.handler = handler
+        self.clock = clock or real_clock
+        self.rate = rate
+        self.burst = burst
+        self.game_rates = game_rates or {}  # Game type -> (rate, burst) per agent
+        self.inbox_size = inbox_size
+        self.policy = policy
+        self.actors: dict[str, GameActor] = {}
+        self._agent_buckets: dict[str, TokenBucket] = {}
+        self._game_buckets: dict[str, dict[str, TokenBucket]] = {}  # agent -> game type -> bucket
+        self.accepted = 0
+        self.processed = 0
+        self.dropped = {"rate_limited": 0, "inbox_full": 0, "replaced": 0, "disconnect": 0}
+    
+    async def _apply(self, agent_id: str, move: Any):
+        self.processed += 1
+        await self.handler(agent_id, move)
+    
+    def _allowed(self, agent_id: str, game_type: str, now: float) -> bool:
+        bucket = self._agent_buckets.get(agent_id)
+        if bucket is None:
+            bucket = self._agent_buckets[agent_id] = TokenBucket(self.rate, self.burst, now)
+        buckets = self._game_buckets.setdefault(agent_id, {})
+        game_bucket = buckets.get(game_type)
+        if game_bucket is None:
+            rate, burst = self.game_rates.get(game_type, (self.rate, self.burst))
+            game_bucket = buckets[game_type] = TokenBucket(rate, burst, now)
+        # Both must have a token before either is spent
+        if not (game_bucket.refill(now) and bucket.refill(now)):
+            return False
+        game_bucket.take(now)
+        bucket.take(now)
+        return True
+    
+    def submit(self, agent_id: str, game_id: str, game_type: str, move: Any) -> str:
+        """
+        Admit a move. Returns "accepted" or "replaced" if it was queued,
+        otherwise why not: "rate_limited", "inbox_full" or "disconnect".
+        """
+        if not self._allowed(agent_id, game_type, self.clock.now()):
+            self.dropped["rate_limited"] += 1
+            return "rate_limited"
+        actor = self.actors.get(game_id)
+        if actor is None:
+            actor = self.actors[game_id] = GameActor(game_id, self._apply, self.inbox_size, self.policy)
+        status = actor.put(agent_id, move)
+        if status == "inbox_full":
+            # Not queued, so it shouldn't count against the sender's rate
+            self._agent_buckets[agent_id].refund()
+            self._game_buckets[agent_id][game_type].refund()
+        if status == "accepted":
+            self.accepted += 1
+        else:
+            self.dropped[status] += 1
+            if status == "replaced":
+                self.accepted += 1
+        return status
+    
+    def end_game(self, game_id: str):
+        """The game is over: drop its actor and any moves still queued."""
+        actor = self.actors.pop(game_id, None)
+        if actor:
+            actor.close()
+    
+    def forget(self, agent_id: str):
+        self._agent_buckets.pop(agent_id, None)
+        self._game_buckets.pop(agent_id, None)
+    
+    def get_stats(self) -> dict:
+        return {
+            "actors": len(self.actors),
+            "queued": sum(actor.queued() for actor in self.actors.values()),
+            "accepted": self.accepted,
+            "processed": self.processed,
+            "dropped": dict(self.dropped),
+            "policy": self.policy.value,
+            "inbox_size": self.inbox_size,
+        }
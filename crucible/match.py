@@ -2,8 +2,10 @@
 Match - A single battle royale game instance.
 """
 
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
+from itertools import islice
 from typing import Optional
 from datetime import datetime
 import uuid
@@ -23,6 +25,14 @@ class MatchPhase(Enum):
     COMPLETE = "complete"     # Match ended
 
 
+# How many state changes a match keeps for clients resuming a delta stream.
+# Clients further behind than this get a fresh snapshot instead.
+DELTA_HISTORY = 512
+
+# Match fields that show up in to_dict() and are streamed when they change
+TRACKED_FIELDS = frozenset({"phase", "prize_pool"})
+
+
 @dataclass
 class Match:
     """A single Crucible match."""
@@ -47,6 +57,18 @@ class Match:
     min_tributes: int = 4
     max_tributes: int = 16
     
+    # Versioned state: every change gets the next sequence number
+    seq: int = 0
+    deltas: deque = field(default_factory=lambda: deque(maxlen=DELTA_HISTORY), repr=False)
+    watchers: set = field(default_factory=set, repr=False)  # asyncio.Events
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in TRACKED_FIELDS and "watchers" in self.__dict__:
+            if isinstance(value, Enum):
+                value = value.value
+            self._record({"op": "match", "changes": {name: value}})
+    
     def add_tribute(self, tribute: Tribute) -> bool:
         """Add a tribute to the match. Returns False if full."""
         if len(self.tributes) >= self.max_tributes:
@@ -56,6 +78,8 @@ class Match:
         
         tribute.status = TributeStatus.ALIVE
         self.tributes.append(tribute)
+        tribute.on_change = self._tribute_changed
+        self._record({"op": "tribute_add", "tribute": tribute.to_dict()})
         self.prize_pool += self.entry_fee
         self.log_event("join", f"{tribute.name} entered the arena")
         return True
@@ -116,12 +140,52 @@ class Match:
     
     def log_event(self, event_type: str, message: str):
         """Add event to match log."""
-        self.events.append({
+        event = {
             "type": event_type,
             "message": message,
             "timestamp": datetime.now().isoformat(),
             "alive_count": len(self.alive_tributes()),
-        })
+        }
+        self.events.append(event)
+        self._record({"op": "event", "event": event})
+    
+    # --- Delta stream ---
+    
+    def _tribute_changed(self, tribute: Tribute, name: str, value):
+        key, value = tribute.serialize_field(name)
+        self._record({"op": "tribute", "id": tribute.id, "changes": {key: value}})
+    
+    def _record(self, delta: dict):
+        """Assign the next sequence number to a change and wake watchers."""
+        self.seq += 1
+        delta["seq"] = self.seq
+        self.deltas.append(delta)
+        for event in self.watchers:
+            event.set()
+    
+    def watch(self, event: asyncio.Event):
+        """Have `event` set whenever the match changes."""
+        self.watchers.add(event)
+    
+    def unwatch(self, event: asyncio.Event):
+        self.watchers.discard(event)
+    
+    def deltas_since(self, seq: int) -> Optional[list[dict]]:
+        """
+        Changes after `seq`, oldest first.
+        Returns None if they are no longer retained and a snapshot is needed.
+        """
+        if seq == self.seq:
+            return []
+        if seq > self.seq or not self.deltas or seq < self.deltas[0]["seq"] - 1:
+            return None
+        # Retained deltas have consecutive sequence numbers
+        start = seq - self.deltas[0]["seq"] + 1
+        return list(islice(self.deltas, start, None))
+    
+    def snapshot(self) -> dict:
+        """Full state plus the sequence number it corresponds to."""
+        return {"seq": self.seq, "match": self.to_dict()}
     
     def to_dict(self) -> dict:
         """Serialize for API responses."""
@@ -3,6 +3,7 @@ Matchmaker - Handles real agent connections, queuing, and game matchmaking.
 """
 
 import asyncio
+import os
 from dataclasses import dataclass, field
 from typing import Optional, Any
 from datetime import datetime
@@ -10,6 +11,30 @@ from fastapi import WebSocket
 import random
 
 from .games import GameType, create_game, Game, GameResult
+from .clock import Clock, real_clock
+from .matchmaking import DEFAULT_RATING, GameQueues, update_ratings
+from .timing_wheel import HeartbeatMonitor
+from .expiry import scheduler_for
+from .inbox import MoveRouter, OverflowPolicy
+
+# Game types real agents can be matched into
+LIVE_GAME_TYPES = (
+    GameType.TIC_TAC_TOE,
+    GameType.ROCK_PAPER_SCISSORS,
+    GameType.MATH_DUEL,
+    GameType.TRIVIA,
+    GameType.CHESS,
+    GameType.CHECKERS,
+)
+
+# Moves per second and burst allowed per agent in each game type, where
+# faster than a human would answer is already spam. Others use the agent limit.
+MOVE_RATES = {
+    GameType.MATH_DUEL.value: (2.0, 4),
+    GameType.TRIVIA.value: (2.0, 4),
+    GameType.NUMBER_GUESS.value: (2.0, 4),
+    GameType.ROCK_PAPER_SCISSORS.value: (2.0, 4),
+}
 
 
 @dataclass
@@ -22,6 +47,40 @@ class AgentConnection:
     last_heartbeat: datetime = field(default_factory=datetime.now)
     in_game: bool = False
     current_game_id: Optional[str] = None
+    games: Optional[frozenset[str]] = None  # Game types the agent can play (None = all)
+    send_latency_ms: float = 0.0  # Moving average of how long a write to this agent takes
+    sends: int = 0
+    send_failures: int = 0
+    moves_dropped: int = 0
+    drop_notified: bool = False  # Told about a dropped move since its last accepted one
+
+
+@dataclass
+class Delivery:
+    """One message written to one agent, timed on the matchmaker's clock."""
+    agent_id: str
+    sent_at: float  # Write started
+    delivered_at: Optional[float] = None  # Write finished; None if it failed
+    error: Optional[str] = None
+    
+    @property
+    def ok(self) -> bool:
+        return self.delivered_at is not None
+    
+    @property
+    def latency_ms(self) -> Optional[float]:
+        return None if self.delivered_at is None else round((self.delivered_at - self.sent_at) * 1000, 2)
+
+
+def parse_game_types(values: Any) -> Optional[frozenset[str]]:
+    """Declared game types from a join/queue message; unknown names are dropped, None = any."""
+    if not values:
+        return None
+    if isinstance(values, str):
+        values = [values]
+    live = {t.value for t in LIVE_GAME_TYPES}
+    games = frozenset(v for v in values if isinstance(v, str) and v in live)
+    return games or None
 
 
 @dataclass
@@ -35,23 +94,59 @@ class LiveGame:
     started_at: datetime = field(default_factory=datetime.now)
     moves: list = field(default_factory=list)
     finished: bool = False
+    # Latest challenge delivery per player; a move's response time is measured from it
+    deliveries: dict[str, Delivery] = field(default_factory=dict)
 
 
 class Matchmaker:
     """Manages agent connections, matchmaking queue, and live games."""
     
-    def __init__(self, broadcast_callback=None):
+    FINISHED_TTL = 10.0  # Finished games stay listed this long
+    MAX_FINISHED = 1000
+    LATENCY_SMOOTHING = 0.2  # Weight of the newest sample in send_latency_ms
+    
+    def __init__(
+        self,
+        broadcast_callback=None,
+        clock: Optional[Clock] = None,
+        move_rate: float = 5.0,
+        move_burst: float = 10,
+        move_inbox_size: int = 8,
+        move_policy: OverflowPolicy = OverflowPolicy.DROP_NEWEST,
+    ):
+        self.clock = clock or real_clock
         self.agents: dict[str, AgentConnection] = {}
-        self.queue: list[str] = []  # agent_ids waiting for match
+        self.queue = GameQueues(t.value for t in LIVE_GAME_TYPES)  # agent_ids waiting, by game type and rating
         self.live_games: dict[str, LiveGame] = {}
         self.game_counter = 0
+        self._widen_task: Optional[asyncio.Task] = None
         self.broadcast = broadcast_callback
         
+        # Silent agents are warned, then dropped (forfeiting any game)
+        self.heartbeats = HeartbeatMonitor(self._on_idle, clock=self.clock)
+        self.finished = scheduler_for(self.clock).store(
+            "live_games", self.FINISHED_TTL, self._evict_game, self.MAX_FINISHED,
+        )
+        
+        # Incoming moves: rate limited, then applied one at a time per game
+        self.moves = MoveRouter(
+            self.handle_move,
+            clock=self.clock,
+            rate=move_rate,
+            burst=move_burst,
+            game_rates=MOVE_RATES,
+            inbox_size=move_inbox_size,
+            policy=move_policy,
+        )
+        
+        # Bumped on every change to agents, queue, games or scores (for ETags)
+        self.version = 0
+        
         # Scores tracked separately
         self.scores: dict[str, dict] = {}
     
-    async def connect_agent(self, websocket: WebSocket, name: str) -> AgentConnection:
-        """Register a new agent connection."""
+    async def connect_agent(self, websocket: WebSocket, name: str, games: Any = None) -> AgentConnection:
+        """Register a new agent connection, with the game types it declared it can play."""
         await websocket.accept()
         
         agent_id = f"agent_{len(self.agents) + 1}_{random.randint(1000, 9999)}"
@@ -59,14 +154,18 @@ class Matchmaker:
             agent_id=agent_id,
             name=name,
             websocket=websocket,
+            games=parse_game_types(games),
         )
         self.agents[agent_id] = agent
+        self.heartbeats.track(agent_id)
+        self.version += 1
         
         # Send confirmation
         await websocket.send_json({
             "type": "connected",
             "agent_id": agent_id,
             "name": name,
+            "games": sorted(agent.games) if agent.games else "any",
         })
         
         print(f"🤖 Agent connected: {name} ({agent_id})")
@@ -76,9 +175,11 @@ class Matchmaker:
         """Handle agent disconnect."""
         agent = self.agents.pop(agent_id, None)
         if agent:
+            self.heartbeats.forget(agent_id)
+            self.moves.forget(agent_id)
+            self.version += 1
             # Remove from queue
-            if agent_id in self.queue:
-                self.queue.remove(agent_id)
+            self.queue.remove(agent_id)
             
             # Handle in-game disconnect
             if agent.current_game_id:
@@ -86,19 +187,24 @@ class Matchmaker:
             
             print(f"🔌 Agent disconnected: {agent.name}")
     
-    async def join_queue(self, agent_id: str, game_type: Optional[str] = None):
-        """Add agent to matchmaking queue."""
+    async def join_queue(self, agent_id: str, game_type: Any = None):
+        """Add agent to matchmaking queue, for `game_type` (one or a list) or its declared games."""
         agent = self.agents.get(agent_id)
         if not agent:
             return
         
         if agent_id not in self.queue and not agent.in_game:
-            self.queue.append(agent_id)
+            games = parse_game_types(game_type) or agent.games
+            if games and agent.games:
+                games = (games & agent.games) or agent.games
+            self.queue.add(agent_id, self.rating(agent.name), self.clock.now(), games)
+            self.version += 1
             
             await agent.websocket.send_json({
                 "type": "queued",
                 "position": len(self.queue),
                 "queue_size": len(self.queue),
+                "games": sorted(games) if games else "any",
             })
             
             if self.broadcast:
@@ -108,16 +214,32 @@ class Matchmaker:
                 })
             
             # Try to make a match
-            await self._try_match()
+            await self._try_match(agent_id)
+            if self.queue and (self._widen_task is None or self._widen_task.done()):
+                self._widen_task = asyncio.create_task(self._widen_loop())
+    
+    async def _widen_loop(self):
+        """While anyone is queued, retry agents whose rating window has widened."""
+        while self.queue:
+            # Passive: a shared VirtualClock is moved by its owner, not by this loop
+            await self.clock.sleep_until(self.clock.now() + 1)
+            for agent_id in self.queue.widened(self.clock.now()):
+                if agent_id in self.queue:
+                    await self._try_match(agent_id)
+    
+    def rating(self, name: str) -> float:
+        return self.scores.get(name, {}).get("rating", DEFAULT_RATING)
     
-    async def _try_match(self):
-        """Try to create a match from queued agents."""
-        if len(self.queue) < 2:
+    async def _try_match(self, agent_id: str):
+        """Try to pair a queued agent with the closest-rated acceptable opponent."""
+        match = self.queue.pop_match(agent_id, self.clock.now())
+        if match is None:
             return
         
-        # Pop two agents
-        agent1_id = self.queue.pop(0)
-        agent2_id = self.queue.pop(0)
+        # The longer-waiting agent is player 1
+        entry, opponent, games = match
+        agent2_id, agent1_id = entry.agent_id, opponent.agent_id
+        self.version += 1
         
         agent1 = self.agents.get(agent1_id)
         agent2 = self.agents.get(agent2_id)
@@ -129,15 +251,8 @@ class Matchmaker:
         self.game_counter += 1
         game_id = f"live_game_{self.game_counter}"
         
-        # Pick a random game type
-        game_type = random.choice([
-            GameType.TIC_TAC_TOE,
-            GameType.ROCK_PAPER_SCISSORS,
-            GameType.MATH_DUEL,
-            GameType.TRIVIA,
-            GameType.CHESS,
-            GameType.CHECKERS,
-        ])
+        # Pick a random game type both agents play
+        game_type = GameType(random.choice(games))
         
         game = create_game(game_type, agent1_id, agent2_id)
         
@@ -162,14 +277,11 @@ class Matchmaker:
             "type": "match_start",
             "game_id": game_id,
             "game_type": game_type.value,
-            "opponent": None,  # Will be set per-player
         }
-        
-        match_info["opponent"] = agent2.name
-        await agent1.websocket.send_json(match_info)
-        
-        match_info["opponent"] = agent1.name
-        await agent2.websocket.send_json(match_info)
+        await self.dispatch([
+            (agent1, {**match_info, "opponent": agent2.name}),
+            (agent2, {**match_info, "opponent": agent1.name}),
+        ])
         
         # Broadcast to spectators
         if self.broadcast:
@@ -186,25 +298,78 @@ class Matchmaker:
         
         print(f"⚔️ Match started: {agent1.name} vs {agent2.name} ({game_type.value})")
     
+    async def dispatch(self, messages: list[tuple[AgentConnection, dict]]) -> dict[str, Delivery]:
+        """
+        Write a message to each agent concurrently, so no player gets theirs
+        a network write later than another. A failed write doesn't stop the
+        others; every delivery is timestamped and feeds the agent's latency.
+        """
+        async def send(agent: AgentConnection, message: dict) -> Delivery:
+            delivery = Delivery(agent.agent_id, sent_at=self.clock.now())
+            try:
+                await agent.websocket.send_json(message)
+            except Exception as e:
+                delivery.error = f"{type(e).__name__}: {e}"[:200]
+                agent.send_failures += 1
+                return delivery
+            delivery.delivered_at = self.clock.now()
+            agent.sends += 1
+            weight = 1.0 if agent.sends == 1 else self.LATENCY_SMOOTHING
+            shown = round(agent.send_latency_ms)
+            agent.send_latency_ms += weight * (delivery.latency_ms - agent.send_latency_ms)
+            if round(agent.send_latency_ms) != shown:
+                self.version += 1  # /api/live-games reports it
+            return delivery
+        
+        deliveries = await asyncio.gather(*(send(agent, message) for agent, message in messages))
+        return {delivery.agent_id: delivery for delivery in deliveries}
+    
     async def _send_challenges(self, live_game: LiveGame):
-        """Send current game state as challenge to players."""
+        """Send current game state as challenge to both players at once."""
         game = live_game.game
-        
-        # For turn-based games
-        if hasattr(game, 'current_turn'):
-            for player in [live_game.player1, live_game.player2]:
-                prompt = game.get_prompt(player.agent_id)
-                prompt["type"] = "challenge"
-                await player.websocket.send_json(prompt)
-        else:
-            # Simultaneous games - send to both
-            for player in [live_game.player1, live_game.player2]:
-                prompt = game.get_prompt(player.agent_id)
-                prompt["type"] = "challenge"
-                await player.websocket.send_json(prompt)
+        players = (live_game.player1, live_game.player2)
+        # Turn-based games prompt both (the waiting player sees the board);
+        # simultaneous games race on the same prompt
+        live_game.deliveries.update(await self.dispatch([
+            (player, {**game.get_prompt(player.agent_id), "type": "challenge"})
+            for player in players
+        ]))
+    
+    async def submit_move(self, agent_id: str, move: str) -> str:
+        """
+        Take a move from an agent's socket: rate limit it and queue it for its
+        game's actor. Returns "accepted", or why the move was dropped.
+        """
+        self.heartbeats.beat(agent_id)  # A move is a sign of life too
+        agent = self.agents.get(agent_id)
+        live_game = self.live_games.get(agent.current_game_id) if agent and agent.current_game_id else None
+        if not live_game or live_game.finished:
+            return "no_game"
+        
+        status = self.moves.submit(agent_id, live_game.game_id, live_game.game_type.value, move)
+        if status == "replaced":
+            # This move is queued; an older one of the agent's was evicted for it
+            agent.moves_dropped += 1
+            status = "accepted"
+        if status == "accepted":
+            agent.drop_notified = False
+            return status
+        agent.moves_dropped += 1
+        if status == "disconnect":
+            print(f"🚫 Agent flooded its inbox: {agent.name}")
+            try:
+                await agent.websocket.close(code=1008)
+            except Exception:
+                pass
+            await self.disconnect_agent(agent_id)
+        elif not agent.drop_notified:
+            # One notice per burst, so replies can't outpace accepted moves
+            agent.drop_notified = True
+            await self.dispatch([(agent, {"type": "move_dropped", "reason": status})])
+        return status
     
     async def handle_move(self, agent_id: str, move: str):
-        """Process a move from an agent."""
+        """Apply a move to the agent's game (called by the game's actor, one move at a time)."""
         agent = self.agents.get(agent_id)
         if not agent or not agent.current_game_id:
             return
@@ -216,10 +381,16 @@ class Matchmaker:
         game = live_game.game
         result = game.submit_move(agent_id, move)
         
+        # Server receive time minus when this player's challenge was sent
+        delivery = live_game.deliveries.get(agent_id)
+        response_ms = None if delivery is None else round((self.clock.now() - delivery.sent_at) * 1000, 2)
+        
         live_game.moves.append({
             "player": agent.name,
             "move": move,
+            "response_ms": response_ms,
         })
+        self.version += 1
         
         # Broadcast move to spectators
         if self.broadcast:
@@ -228,6 +399,7 @@ class Matchmaker:
                 "game_id": live_game.game_id,
                 "player": agent.name,
                 "move": move,
+                "response_ms": response_ms,
                 "state": game.get_state(),
             })
         
@@ -241,54 +413,63 @@ class Matchmaker:
     async def _end_game(self, live_game: LiveGame, result: GameResult):
         """Handle game ending."""
         live_game.finished = True
+        self.moves.end_game(live_game.game_id)  # Moves still queued are dropped
+        self.version += 1
         
-        winner_id = result.winner_id
-        winner = live_game.player1 if winner_id == live_game.player1.agent_id else live_game.player2
-        loser = live_game.player2 if winner_id == live_game.player1.agent_id else live_game.player1
+        draw = result.is_draw or result.winner_id is None
+        player1, player2 = live_game.player1, live_game.player2
+        winner, loser = (player2, player1) if result.winner_id == player2.agent_id else (player1, player2)
         
         # Update scores
-        if winner.name not in self.scores:
-            self.scores[winner.name] = {"wins": 0, "losses": 0, "games": 0}
-        if loser.name not in self.scores:
-            self.scores[loser.name] = {"wins": 0, "losses": 0, "games": 0}
+        for player in (winner, loser):
+            if player.name not in self.scores:
+                self.scores[player.name] = {"wins": 0, "losses": 0, "games": 0, "rating": DEFAULT_RATING}
+        
+        self.scores[winner.name]["rating"], self.scores[loser.name]["rating"] = update_ratings(
+            self.scores[winner.name]["rating"],
+            self.scores[loser.name]["rating"],
+            draw=draw,
+        )
         
-        self.scores[winner.name]["wins"] += 1
         self.scores[winner.name]["games"] += 1
-        self.scores[loser.name]["losses"] += 1
         self.scores[loser.name]["games"] += 1
+        if not draw:
+            self.scores[winner.name]["wins"] += 1
+            self.scores[loser.name]["losses"] += 1
         
         # Notify players
         end_msg = {
             "type": "match_end",
-            "winner": winner.name,
+            "winner": None if draw else winner.name,
+            "draw": draw,
             "message": result.message,
         }
         
-        try:
-            await live_game.player1.websocket.send_json(end_msg)
-            await live_game.player2.websocket.send_json(end_msg)
-        except:
-            pass
+        await self.dispatch([(player1, end_msg), (player2, end_msg)])
         
         # Reset player state
-        live_game.player1.in_game = False
-        live_game.player1.current_game_id = None
-        live_game.player2.in_game = False
-        live_game.player2.current_game_id = None
+        player1.in_game = False
+        player1.current_game_id = None
+        player2.in_game = False
+        player2.current_game_id = None
         
         # Broadcast
         if self.broadcast:
             await self.broadcast({
                 "type": "match_end",
                 "game_id": live_game.game_id,
-                "winner": winner.name,
+                "winner": None if draw else winner.name,
+                "draw": draw,
                 "message": result.message,
             })
         
-        print(f"🏆 Match ended: {winner.name} wins!")
+        if draw:
+            print(f"🤝 Match ended: {player1.name} and {player2.name} draw")
+        else:
+            print(f"🏆 Match ended: {winner.name} wins!")
         
         # Cleanup after delay
-        asyncio.create_task(self._cleanup_game(live_game.game_id, delay=10))
+        self.finished.expire(live_game.game_id)
     
     async def _forfeit_game(self, game_id: str, forfeiter_id: str):
         """Handle forfeit when agent disconnects."""
@@ -306,21 +487,47 @@ class Matchmaker:
         
         await self._end_game(live_game, result)
     
-    async def _cleanup_game(self, game_id: str, delay: int = 10):
-        """Remove finished game after delay."""
-        await asyncio.sleep(delay)
-        self.live_games.pop(game_id, None)
+    def _evict_game(self, game_id: str):
+        """Remove a finished game."""
+        if self.live_games.pop(game_id, None):
+            self.version += 1
     
     def heartbeat(self, agent_id: str):
         """Update agent's last heartbeat time."""
         agent = self.agents.get(agent_id)
         if agent:
             agent.last_heartbeat = datetime.now()
+            self.heartbeats.beat(agent_id)
+    
+    async def _on_idle(self, agent_id: str, stage: str, idle: float):
+        """Heartbeat deadline passed: warn, or drop the agent on the last stage."""
+        agent = self.agents.get(agent_id)
+        if not agent:
+            return
+        try:
+            await agent.websocket.send_json({
+                "type": "heartbeat_warning" if stage != "terminate" else "terminated",
+                "stage": stage,
+                "idle_seconds": round(idle),
+            })
+            if stage == "terminate":
+                await agent.websocket.close(code=1001)
+        except Exception:
+            pass  # Already gone
+        if stage == "terminate":
+            print(f"💤 Agent timed out: {agent.name}")
+            await self.disconnect_agent(agent_id)
+    
+    def longest_wait(self) -> int:
+        """Seconds the longest-queued agent has waited (whole seconds, so it can key an ETag)."""
+        return int(self.queue.longest_wait(self.clock.now()))
     
     def get_queue_status(self) -> dict:
         """Get current queue info."""
         return {
             "queue_size": len(self.queue),
+            "queues": {key: len(queue) for key, queue in self.queue.queues.items()},
+            "longest_wait": self.longest_wait(),
             "active_games": len([g for g in self.live_games.values() if not g.finished]),
             "connected_agents": len(self.agents),
         }
@@ -333,6 +540,9 @@ class Matchmaker:
                 "game_type": g.game_type.value,
                 "player1": g.player1.name,
                 "player2": g.player2.name,
+                "send_latency_ms": {
+                    p.name: round(p.send_latency_ms) for p in (g.player1, g.player2)
+                },
                 "moves": len(g.moves),
                 "finished": g.finished,
                 "state": g.game.get_state(),
@@ -349,6 +559,7 @@ class Matchmaker:
                     "wins": data["wins"],
                     "losses": data["losses"],
                     "games": data["games"],
+                    "rating": round(data["rating"]),
                     "win_rate": round(data["wins"] / max(data["games"], 1) * 100, 1),
                 }
                 for name, data in self.scores.items()
@@ -358,4 +569,9 @@ class Matchmaker:
 
 
 # Global matchmaker
-matchmaker = Matchmaker()
+matchmaker = Matchmaker(
+    move_rate=float(os.getenv("MOVE_RATE", "5")),
+    move_burst=float(os.getenv("MOVE_BURST", "10")),
+    move_inbox_size=int(os.getenv("MOVE_INBOX_SIZE", "8")),
+    move_policy=OverflowPolicy(os.getenv("MOVE_OVERFLOW_POLICY", "drop_newest")),
+)
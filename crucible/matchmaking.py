@@ -0,0 +1,306 @@
+"""
+Matchmaking - Rating-ordered queue for pairing agents of similar skill.
+
+Queued agents sit in rating bands (BAND points wide). Each band is an
+OrderedDict in join order, so adding or removing an agent is O(1) plus an
+O(log bands) bisect to keep the sorted list of non-empty bands. Finding an
+opponent looks at the agent's own band and the nearest non-empty band on
+each side - never at the rest of the queue.
+
+How far apart two ratings may be widens with time in queue: every
+WIDEN_EVERY seconds an agent's window grows by WIDEN_BY, up to MAX_GAP.
+Since everyone widens on the same schedule, agents whose window just grew
+are found by bisecting the join-time list, so a periodic re-check only
+touches agents whose window actually changed.
+
+Ratings are Elo, starting at DEFAULT_RATING.
+
+GameQueues keeps one RatingQueue per game type plus an "any" queue, so
+agents are only paired into games they declared they can play.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from typing import Iterable, NamedTuple, Optional
+
+DEFAULT_RATING = 1200.0
+ELO_K = 32
+
+
+def expected_score(rating: float, opponent: float) -> float:
+    return 1.0 / (1.0 + 10 ** ((opponent - rating) / 400))
+
+
+def update_ratings(winner: float, loser: float, draw: bool = False, k: float = ELO_K) -> tuple[float, float]:
+    """New (winner, loser) Elo ratings after a game."""
+    score = 0.5 if draw else 1.0
+    delta = k * (score - expected_score(winner, loser))
+    return winner + delta, loser - delta
+
+
+class QueueEntry(NamedTuple):
+    agent_id: str
+    rating: float
+    joined_at: float
+
+
+class RatingQueue:
+    """Agents waiting for a match, bucketed by rating band."""
+    
+    BAND = 25.0
+    BASE_GAP = 100.0
+    WIDEN_BY = 50.0
+    WIDEN_EVERY = 5.0
+    MAX_GAP = 800.0
+    
+    def __init__(self):
+        self.entries: dict[str, QueueEntry] = {}
+        self._bands: dict[int, OrderedDict[str, QueueEntry]] = {}
+        self._band_keys: list[int] = []  # Sorted non-empty bands
+        # Join order for widening re-checks; removed agents are pruned in widened()
+        self._joined: list[tuple[float, str]] = []
+        self._checked_at: Optional[float] = None
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self.entries
+    
+    def _band(self, rating: float) -> int:
+        return int(rating // self.BAND)
+    
+    def add(self, agent_id: str, rating: float, now: float):
+        if agent_id in self.entries:
+            return
+        entry = QueueEntry(agent_id, rating, now)
+        self.entries[agent_id] = entry
+        band = self._band(rating)
+        members = self._bands.get(band)
+        if members is None:
+            members = self._bands[band] = OrderedDict()
+            insort(self._band_keys, band)
+        members[agent_id] = entry
+        if self._joined and now < self._joined[-1][0]:
+            insort(self._joined, (now, agent_id))
+        else:
+            self._joined.append((now, agent_id))  # Joins arrive in time order
+    
+    def remove(self, agent_id: str) -> Optional[QueueEntry]:
+        entry = self.entries.pop(agent_id, None)
+        if entry is None:
+            return None
+        band = self._band(entry.rating)
+        members = self._bands[band]
+        del members[agent_id]
+        if not members:
+            del self._bands[band]
+            del self._band_keys[bisect_left(self._band_keys, band)]
+        if not self.entries:
+            self._joined.clear()
+        return entry
+    
+    def max_gap(self, entry: QueueEntry, now: float) -> float:
+        """How far from its own rating this agent will accept an opponent."""
+        steps = int(max(0.0, now - entry.joined_at) // self.WIDEN_EVERY)
+        return min(self.MAX_GAP, self.BASE_GAP + steps * self.WIDEN_BY)
+    
+    def _oldest(self, band: int, exclude: Optional[str]) -> Optional[QueueEntry]:
+        for other_id, other in self._bands[band].items():
+            if other_id != exclude:
+                return other
+        return None
+    
+    def nearest(self, rating: float, exclude: Optional[str] = None) -> Optional[QueueEntry]:
+        """
+        Closest-rated queued agent: the longest-waiting one in the same band,
+        else in the nearest non-empty band below or above.
+        """
+        band = self._band(rating)
+        candidate = self._oldest(band, exclude) if band in self._bands else None
+        if candidate is not None:
+            return candidate
+        keys = self._band_keys
+        below = bisect_left(keys, band) - 1
+        above = bisect_right(keys, band)
+        options = []
+        if below >= 0:
+            options.append(self._oldest(keys[below], exclude))
+        if above < len(keys):
+            options.append(self._oldest(keys[above], exclude))
+        options = [o for o in options if o is not None]
+        return min(options, key=lambda o: abs(o.rating - rating)) if options else None
+    
+    def acceptable(self, entry: QueueEntry, other: QueueEntry, now: float) -> bool:
+        """Is the rating gap within either agent's window?"""
+        gap = abs(other.rating - entry.rating)
+        return gap <= max(self.max_gap(entry, now), self.max_gap(other, now))
+    
+    def find_opponent(self, agent_id: str, now: float) -> Optional[QueueEntry]:
+        """Closest-rated opponent for a queued agent, if the gap is acceptable."""
+        entry = self.entries.get(agent_id)
+        if entry is None:
+            return None
+        candidate = self.nearest(entry.rating, exclude=agent_id)
+        if candidate is not None and self.acceptable(entry, candidate, now):
+            return candidate
+        return None
+    
+    def pop_pair(self, agent_id: str, now: float) -> Optional[tuple[QueueEntry, QueueEntry]]:
+        """Remove and return (agent, opponent) if an acceptable opponent is waiting."""
+        opponent = self.find_opponent(agent_id, now)
+        if opponent is None:
+            return None
+        return self.remove(agent_id), self.remove(opponent.agent_id)
+    
+    def widened(self, now: float) -> list[str]:
+        """Queued agents whose window has grown since the last call, oldest first."""
+        last, self._checked_at = self._checked_at, now
+        if len(self._joined) > 2 * len(self.entries) + 64:
+            # Drop removed agents here, off the match-decision path
+            self._joined = [(t, a) for t, a in self._joined if a in self.entries and self.entries[a].joined_at == t]
+        if last is None or now <= last or not self._joined:
+            return []
+        joined = self._joined
+        earliest = joined[0][0]
+        due: set[str] = set()
+        # An agent widens at joined_at + k * WIDEN_EVERY, so the ones that just
+        # widened joined in (last - k * WIDEN_EVERY, now - k * WIDEN_EVERY]
+        for k in range(1, int((self.MAX_GAP - self.BASE_GAP) // self.WIDEN_BY) + 1):
+            offset = k * self.WIDEN_EVERY
+            if now - offset < earliest:
+                break
+            lo = bisect_right(joined, last - offset, key=lambda item: item[0])
+            hi = bisect_right(joined, now - offset, key=lambda item: item[0])
+            for joined_at, agent_id in joined[lo:hi]:
+                entry = self.entries.get(agent_id)
+                if entry is not None and entry.joined_at == joined_at:
+                    due.add(agent_id)
+        return sorted(due, key=lambda agent_id: self.entries[agent_id].joined_at)
+    
+    def longest_wait(self, now: float) -> float:
+        for joined_at, agent_id in self._joined:
+            entry = self.entries.get(agent_id)
+            if entry is not None and entry.joined_at == joined_at:
+                return now - joined_at
+        return 0.0
+    
+    def get_stats(self, now: float) -> dict:
+        return {
+            "queued": len(self.entries),
+            "bands": len(self._band_keys),
+            "longest_wait": round(self.longest_wait(now), 1),
+        }
+
+
+ANY = "any"
+
+
+class GameQueues:
+    """
+    One RatingQueue per game type plus an "any" queue.
+    
+    Agents that play every game wait in the "any" queue; agents that
+    declared a subset wait in the queue of each game they play. A match
+    decision looks at the nearest-rated candidate in each queue the agent
+    can be paired from (a constant number of queues) and takes the one
+    that has waited longest, so no queue starves another.
+    """
+    
+    def __init__(self, game_types: Iterable[str]):
+        self.game_types = tuple(game_types)
+        self.queues: dict[str, RatingQueue] = {ANY: RatingQueue()}
+        self.queues.update((game_type, RatingQueue()) for game_type in self.game_types)
+        self.games: dict[str, Optional[frozenset[str]]] = {}  # Queued agent -> declared games (None = any)
+        self._rotation = 0
+    
+    def __len__(self) -> int:
+        return len(self.games)
+    
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self.games
+    
+    def _homes(self, games: Optional[frozenset[str]]) -> tuple[str, ...]:
+        return (ANY,) if games is None else tuple(games)
+    
+    def _searched(self, games: Optional[frozenset[str]]) -> tuple[str, ...]:
+        """Queues an agent can find an opponent in."""
+        return tuple(self.queues) if games is None else (ANY, *games)
+    
+    def entry(self, agent_id: str) -> Optional[QueueEntry]:
+        if agent_id not in self.games:
+            return None
+        return self.queues[self._homes(self.games[agent_id])[0]].entries[agent_id]
+    
+    def add(self, agent_id: str, rating: float, now: float, games: Optional[Iterable[str]] = None):
+        """Queue an agent for the given game types (None or all of them = any game)."""
+        if agent_id in self.games:
+            return
+        if games is not None:
+            games = frozenset(games) & frozenset(self.game_types)
+            if not games or len(games) == len(self.game_types):
+                games = None
+        self.games[agent_id] = games
+        for key in self._homes(games):
+            self.queues[key].add(agent_id, rating, now)
+    
+    def remove(self, agent_id: str) -> Optional[QueueEntry]:
+        if agent_id not in self.games:
+            return None
+        entry = None
+        for key in self._homes(self.games.pop(agent_id)):
+            entry = self.queues[key].remove(agent_id)
+        return entry
+    
+    def common_games(self, agent_id: str, other_id: str) -> tuple[str, ...]:
+        """Game types both agents play."""
+        mine, theirs = self.games[agent_id], self.games[other_id]
+        if mine is None and theirs is None:
+            return self.game_types
+        if mine is None or theirs is None:
+            return tuple(sorted(theirs if mine is None else mine))
+        return tuple(sorted(mine & theirs))
+    
+    def find_opponent(self, agent_id: str, now: float) -> Optional[QueueEntry]:
+        """Longest-waiting acceptable opponent across the queues this agent can use."""
+        entry = self.entry(agent_id)
+        if entry is None:
+            return None
+        best = None
+        for key in self._searched(self.games[agent_id]):
+            queue = self.queues[key]
+            candidate = queue.nearest(entry.rating, exclude=agent_id)
+            if candidate is None or not queue.acceptable(entry, candidate, now):
+                continue
+            if best is None or candidate.joined_at < best.joined_at:
+                best = candidate
+        return best
+    
+    def pop_match(self, agent_id: str, now: float) -> Optional[tuple[QueueEntry, QueueEntry, tuple[str, ...]]]:
+        """Remove and return (agent, opponent, games both play) if an opponent is waiting."""
+        opponent = self.find_opponent(agent_id, now)
+        if opponent is None:
+            return None
+        games = self.common_games(agent_id, opponent.agent_id)
+        return self.remove(agent_id), self.remove(opponent.agent_id), games
+    
+    def widened(self, now: float) -> list[str]:
+        """Agents whose window grew, taking the queues in rotating order."""
+        keys = list(self.queues)
+        start = self._rotation % len(keys)
+        self._rotation += 1
+        due: dict[str, None] = {}
+        for key in keys[start:] + keys[:start]:
+            for agent_id in self.queues[key].widened(now):
+                due[agent_id] = None
+        return list(due)
+    
+    def longest_wait(self, now: float) -> float:
+        return max(queue.longest_wait(now) for queue in self.queues.values())
+    
+    def get_stats(self, now: float) -> dict:
+        return {
+            "queued": len(self.games),
+            "queues": {key: len(queue) for key, queue in self.queues.items()},
+            "longest_wait": round(self.longest_wait(now), 1),
+        }
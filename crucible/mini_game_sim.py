@@ -3,8 +3,10 @@ Mini-Game Simulator - Runs simulated bot matches for all game types.
 """
 
 import random
-import asyncio
-from typing import Optional
+from typing import Callable, Optional
+from .clock import Clock, real_clock
+from .expiry import scheduler_for
+from .ttt_table import ttt_table
 from .games import (
     Game, GameResult, GameType,
     TicTacToe, RockPaperScissors, NumberGuess, 
@@ -41,12 +43,8 @@ class BotPlayer:
         return ""
     
     def _play_tictactoe(self, game: TicTacToe) -> str:
-        """Pick an empty square."""
-        for row in range(3):
-            for col in range(3):
-                if game.board[row][col] == "":
-                    return f"{row},{col}"
-        return "0,0"
+        """Perfect play from the precomputed table."""
+        return ttt_table.best_move(game) or "0,0"
     
     def _play_number_guess(self, game: NumberGuess) -> str:
         """Binary search-ish guessing."""
@@ -68,16 +66,9 @@ class BotPlayer:
         return str(game.answer + random.randint(-5, 5))
     
     def _play_word_chain(self, game: WordChain) -> str:
-        """Try to find a valid word."""
+        """Play an unused dictionary word."""
         required = game.last_word[-1].lower()
-        words = [
-            "apple", "elephant", "tiger", "river", "road", "dog", "game",
-            "eagle", "energy", "yarn", "night", "tree", "ember", "robot",
-        ]
-        valid = [w for w in words if w[0] == required and w not in game.words_used]
-        if valid:
-            return random.choice(valid)
-        return required + "ing"  # Fallback
+        return game.pick_unused(required) or required + "ing"  # Fallback
     
     def _play_trivia(self, game: Trivia) -> str:
         """Guess the answer (with hints)."""
@@ -87,98 +78,71 @@ class BotPlayer:
         return random.choice(["paris", "8", "mars", "water", "diamond"])
     
     def _play_chess(self, game: Chess) -> str:
-        """Make a random legal-ish move."""
-        is_white = self.player_id == game.player1_id
-        
-        # Find our pieces
-        our_pieces = []
-        for row in range(8):
-            for col in range(8):
-                piece = game.board[row][col]
-                if piece != '.' and ((is_white and piece.isupper()) or (not is_white and piece.islower())):
-                    our_pieces.append((row, col, piece))
-        
-        if not our_pieces:
-            return "e2e4"
-        
-        # Pick a random piece and try a move
-        random.shuffle(our_pieces)
-        for row, col, piece in our_pieces:
-            # Generate possible moves based on piece type
-            moves = self._get_chess_moves(row, col, piece.lower(), game)
-            if moves:
-                to_row, to_col = random.choice(moves)
-                from_sq = chr(ord('a') + col) + str(8 - row)
-                to_sq = chr(ord('a') + to_col) + str(8 - to_row)
-                return from_sq + to_sq
-        
-        return "e2e4"  # Fallback
-    
-    def _get_chess_moves(self, row: int, col: int, piece_type: str, game: Chess) -> list:
-        """Get possible moves for a piece."""
-        moves = []
-        directions = {
-            'p': [(1, 0), (2, 0), (1, 1), (1, -1)],  # Simplified pawn
-            'r': [(0, 1), (0, -1), (1, 0), (-1, 0)],
-            'n': [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)],
-            'b': [(1, 1), (1, -1), (-1, 1), (-1, -1)],
-            'q': [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)],
-            'k': [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)],
-        }
-        
-        deltas = directions.get(piece_type, [])
-        for dr, dc in deltas:
-            new_row, new_col = row + dr, col + dc
-            if 0 <= new_row <= 7 and 0 <= new_col <= 7:
-                target = game.board[new_row][new_col]
-                if target == '.' or (target.isupper() != game.board[row][col].isupper()):
-                    moves.append((new_row, new_col))
-        
-        return moves
+        """Make a random legal move."""
+        moves = game.legal_moves()
+        if not moves:
+            return "e2e4"  # Fallback
+        return random.choice(moves)
     
     def _play_checkers(self, game: Checkers) -> str:
-        """Make a random valid checkers move."""
-        is_red = self.player_id == game.player1_id
-        my_char = 'r' if is_red else 'b'
-        
-        # Find our pieces
-        our_pieces = []
-        for row in range(8):
-            for col in range(8):
-                piece = game.board[row][col]
-                if piece.lower() == my_char:
-                    our_pieces.append((row, col))
-        
-        if not our_pieces:
-            return "0,0-1,1"
-        
-        random.shuffle(our_pieces)
-        for row, col in our_pieces:
-            # Try diagonal moves
-            direction = -1 if is_red else 1
-            for dc in [-1, 1]:
-                new_row, new_col = row + direction, col + dc
-                if 0 <= new_row <= 7 and 0 <= new_col <= 7:
-                    if game.board[new_row][new_col] == '.':
-                        return f"{row},{col}-{new_row},{new_col}"
-                    # Try jump
-                    jump_row, jump_col = row + 2*direction, col + 2*dc
-                    if 0 <= jump_row <= 7 and 0 <= jump_col <= 7:
-                        if game.board[jump_row][jump_col] == '.':
-                            return f"{row},{col}-{jump_row},{jump_col}"
-        
-        return "5,0-4,1"  # Fallback
+        """Make a random legal checkers move (captures are forced)."""
+        moves = game.legal_moves()
+        if not moves:
+            return "5,0-4,1"  # Fallback
+        return random.choice(moves)
+
+
+def play_turn(
+    game: Game,
+    bot1: BotPlayer,
+    bot2: BotPlayer,
+) -> tuple[list[tuple[BotPlayer, str]], Optional[GameResult]]:
+    """
+    Play one step of a game: a single move for turn-based games
+    (TicTacToe, Chess, Checkers, WordChain), or a move from each bot for
+    simultaneous ones (RPS, Math, Trivia, NumberGuess).
+    Returns the (player, move) pairs played and the result if the game ended.
+    """
+    if hasattr(game, 'current_turn'):
+        player = bot1 if game.current_turn == bot1.player_id else bot2
+        move = player.make_move(game)
+        return [(player, move)], game.submit_move(player.player_id, move)
+    
+    move1 = bot1.make_move(game)
+    result = game.submit_move(bot1.player_id, move1)
+    played = [(bot1, move1)]
+    if result is None:
+        move2 = bot2.make_move(game)
+        result = game.submit_move(bot2.player_id, move2)
+        played.append((bot2, move2))
+    return played, result
 
 
 class MiniGameSimulator:
     """Runs simulated mini-game matches."""
     
-    def __init__(self, broadcast_callback=None):
+    FINISHED_TTL = 10.0  # Finished games stay listed this long
+    MAX_FINISHED = 1000
+    
+    def __init__(
+        self,
+        broadcast_callback=None,
+        clock: Optional[Clock] = None,
+        bot_factory: Optional[Callable[[str, str], BotPlayer]] = None,
+    ):
+        self.clock = clock or real_clock
+        # Builds each bot from (player_id, name); e.g. a search.SearchBot
+        self.bot_factory = bot_factory or BotPlayer
         self.active_games: dict[str, dict] = {}
         self.broadcast = broadcast_callback
         self.game_counter = 0
         # Track bot scores
         self.scores: dict[str, dict] = {}
+        # Bumped on every change to active games or scores (for ETags)
+        self.version = 0
+        self.finished = scheduler_for(self.clock).store(
+            "mini_games", self.FINISHED_TTL, self._evict_game, self.MAX_FINISHED,
+        )
     
     async def simulate_game(self, game_type: GameType) -> dict:
         """Run a complete simulated game between two bots."""
@@ -186,8 +150,8 @@ class MiniGameSimulator:
         game_id = f"game_{self.game_counter}"
         
         # Create players
-        bot1 = BotPlayer("bot1", random.choice(["GLTCH_Prime", "NeuralNinja", "ByteSlayer"]))
-        bot2 = BotPlayer("bot2", random.choice(["ClawBot_Alpha", "QuantumQuake", "CipherStorm"]))
+        bot1 = self.bot_factory("bot1", random.choice(["GLTCH_Prime", "NeuralNinja", "ByteSlayer"]))
+        bot2 = self.bot_factory("bot2", random.choice(["ClawBot_Alpha", "QuantumQuake", "CipherStorm"]))
         
         # Create game
         game = create_game(game_type, bot1.player_id, bot2.player_id)
@@ -201,6 +165,7 @@ class MiniGameSimulator:
             "moves": [],
             "result": None,
         }
+        self.version += 1
         
         if self.broadcast:
             await self.broadcast({
@@ -221,59 +186,30 @@ class MiniGameSimulator:
         is_turn_based = hasattr(game, 'current_turn')
         
         while move_count < max_moves and result is None:
-            if is_turn_based:
-                # Turn-based games (TicTacToe, Chess, Checkers, WordChain)
-                current_player = bot1 if game.current_turn == bot1.player_id else bot2
-                
-                # Thinking delay
-                await asyncio.sleep(1.5)
-                
-                # Make move
-                move = current_player.make_move(game)
-                result = game.submit_move(current_player.player_id, move)
-                
+            # Thinking delay
+            await self.clock.sleep(1.5 if is_turn_based else 1.0)
+            
+            played, result = play_turn(game, bot1, bot2)
+            
+            for player, move in played:
                 self.active_games[game_id]["moves"].append({
-                    "player": current_player.name,
+                    "player": player.name,
                     "move": move,
                 })
-                
-                if self.broadcast:
-                    await self.broadcast({
-                        "type": "mini_game_move",
-                        "game_id": game_id,
-                        "player": current_player.name,
-                        "move": move,
-                        "state": game.get_state(),
-                    })
-            else:
-                # Simultaneous games (RPS, Math, Trivia, NumberGuess)
-                await asyncio.sleep(1.0)
-                
-                # Both players submit
-                move1 = bot1.make_move(game)
-                result = game.submit_move(bot1.player_id, move1)
-                
-                self.active_games[game_id]["moves"].append({
-                    "player": bot1.name,
-                    "move": move1,
+            self.version += 1
+            
+            if self.broadcast:
+                if is_turn_based:
+                    player, move = played[0]
+                    message = {"player": player.name, "move": move}
+                else:
+                    message = {"player": "both"}
+                await self.broadcast({
+                    "type": "mini_game_move",
+                    "game_id": game_id,
+                    **message,
+                    "state": game.get_state(),
                 })
-                
-                if result is None:
-                    move2 = bot2.make_move(game)
-                    result = game.submit_move(bot2.player_id, move2)
-                    
-                    self.active_games[game_id]["moves"].append({
-                        "player": bot2.name,
-                        "move": move2,
-                    })
-                
-                if self.broadcast:
-                    await self.broadcast({
-                        "type": "mini_game_move",
-                        "game_id": game_id,
-                        "player": "both",
-                        "state": game.get_state(),
-                    })
             
             move_count += 1
         
@@ -297,6 +233,7 @@ class MiniGameSimulator:
                 "winner": winner_name,
                 "message": result.message,
             }
+            self.version += 1
             
             if self.broadcast:
                 await self.broadcast({
@@ -305,17 +242,17 @@ class MiniGameSimulator:
                     "winner": winner_name,
                     "message": result.message,
                 })
-            
-            # Auto-cleanup finished game after 10 seconds
-            asyncio.create_task(self._cleanup_game(game_id, delay=10))
+        
+        # Auto-cleanup finished game after FINISHED_TTL seconds
+        self.finished.expire(game_id)
         
         return self.active_games[game_id]
     
-    async def _cleanup_game(self, game_id: str, delay: int = 10):
-        """Remove a game after delay seconds."""
-        await asyncio.sleep(delay)
+    def _evict_game(self, game_id: str):
+        """Remove a finished game."""
         if game_id in self.active_games:
             del self.active_games[game_id]
+            self.version += 1
     
     def get_active_games(self) -> list:
         """Get all active mini-games."""
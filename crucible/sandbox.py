@@ -0,0 +1,317 @@
+"""
+Sandbox - Pooled, resource-limited execution of submitted code.
+
+A fixed pool of warm worker processes runs CodeGolf submissions against
+their test cases. Each worker is started once (not per submission) with:
+- an address-space limit (SANDBOX_MEMORY_MB), no file writes and no forking
+- sockets disabled and a restricted set of builtins / importable modules
+- a CPU-time timer per submission, plus a wall-clock timeout enforced by
+  the parent, which kills and replaces a worker that doesn't come back
+
+This is defence in depth for a game server, not a security boundary for
+hostile code; run the arena itself in a container.
+
+Verdicts are cached by hash of (problem, test cases, code), and identical
+submissions that arrive together share one run. Verdicts that depend on the
+machine rather than the code - timeouts, memory limits, a worker that died -
+are not cached, so a rerun gets a fresh chance.
+"""
+
+import asyncio
+import builtins
+import hashlib
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+# Modules a submission may import
+ALLOWED_MODULES = {"math", "itertools", "functools", "operator", "collections", "re", "string"}
+
+SAFE_BUILTINS = {
+    name: getattr(builtins, name)
+    for name in (
+        "abs", "all", "any", "bin", "bool", "bytes", "callable", "chr", "dict", "divmod",
+        "enumerate", "filter", "float", "format", "frozenset", "hash", "hex", "int",
+        "isinstance", "issubclass", "iter", "len", "list", "map", "max", "min", "next",
+        "oct", "ord", "pow", "range", "repr", "reversed", "round", "set", "slice",
+        "sorted", "str", "sum", "tuple", "zip", "ValueError", "TypeError", "IndexError",
+        "KeyError", "ZeroDivisionError", "StopIteration", "Exception",
+    )
+}
+
+# Verdicts that depend on load or worker health, never cached
+UNCACHED_STATUSES = {"timeout", "memory"}
+
+
+@dataclass
+class Verdict:
+    """Outcome of running one submission against a problem's test cases."""
+    status: str  # "passed", "wrong_answer", "error", "timeout", "memory", "syntax"
+    passed_cases: int = 0
+    total_cases: int = 0
+    error: Optional[str] = None
+    cached: bool = False
+    
+    @property
+    def passed(self) -> bool:
+        return self.status == "passed"
+
+
+# =============================================================================
+# WORKER PROCESS
+# =============================================================================
+
+class _CPUTimeExceeded(BaseException):
+    """Raised by the CPU timer; BaseException so submissions can't swallow it."""
+
+
+def _restricted_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if name.split(".")[0] not in ALLOWED_MODULES:
+        raise ImportError(f"import of '{name}' is not allowed")
+    return __import__(name, globals, locals, fromlist, level)
+
+
+def _apply_limits(memory_mb: int):
+    """Lock down the worker process (best effort where `resource` is missing)."""
+    try:
+        import resource
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        resource.setrlimit(resource.RLIMIT_FSIZE, (0, 0))
+        resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+    except (ImportError, ValueError, OSError):
+        pass
+    
+    import socket
+    
+    def no_network(*args, **kwargs):
+        raise PermissionError("network access is disabled in the sandbox")
+    socket.socket = no_network
+    socket.create_connection = no_network
+    socket.getaddrinfo = no_network
+
+
+def _load_function(code: str):
+    """A submission is a lambda/expression, or statements defining a function."""
+    namespace = {"__builtins__": dict(SAFE_BUILTINS, __import__=_restricted_import)}
+    try:
+        return eval(compile(code, "<submission>", "eval"), namespace)
+    except SyntaxError:
+        pass
+    exec(compile(code, "<submission>", "exec"), namespace)
+    functions = [v for k, v in namespace.items() if k != "__builtins__" and callable(v)]
+    if not functions:
+        raise ValueError("submission defines no function")
+    return functions[-1]
+
+
+def _run_job(code: str, test_cases: list, cpu_seconds: float) -> dict:
+    import signal
+    
+    def on_timer(signum, frame):
+        raise _CPUTimeExceeded()
+    
+    signal.signal(signal.SIGPROF, on_timer)
+    signal.setitimer(signal.ITIMER_PROF, cpu_seconds)
+    passed = 0
+    try:
+        try:
+            fn = _load_function(code)
+        except SyntaxError as e:
+            return {"status": "syntax", "total_cases": len(test_cases), "error": str(e)}
+        for case in test_cases:
+            *args, expected = case
+            if fn(*args) != expected:
+                return {"status": "wrong_answer", "passed_cases": passed, "total_cases": len(test_cases),
+                        "error": f"wrong answer for input {tuple(args)!r}"}
+            passed += 1
+        return {"status": "passed", "passed_cases": passed, "total_cases": len(test_cases)}
+    except _CPUTimeExceeded:
+        return {"status": "timeout", "passed_cases": passed, "total_cases": len(test_cases),
+                "error": "CPU time limit exceeded"}
+    except MemoryError:
+        return {"status": "memory", "passed_cases": passed, "total_cases": len(test_cases),
+                "error": "memory limit exceeded"}
+    except Exception as e:
+        return {"status": "error", "passed_cases": passed, "total_cases": len(test_cases),
+                "error": f"{type(e).__name__}: {e}"[:200]}
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+
+
+def _worker_main(conn, memory_mb: int):
+    _apply_limits(memory_mb)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        conn.send(_run_job(*job))
+
+
+# =============================================================================
+# POOL
+# =============================================================================
+
+class _Worker:
+    """One warm sandbox process and the pipe to it."""
+    
+    def __init__(self, context, memory_mb: int):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child, memory_mb), daemon=True)
+        self.process.start()
+        child.close()
+    
+    def run(self, code: str, test_cases: list, cpu_seconds: float, wall_seconds: float) -> Optional[dict]:
+        """Result dict, or None if the worker didn't answer in time."""
+        try:
+            self.conn.send((code, test_cases, cpu_seconds))
+            if self.conn.poll(wall_seconds):
+                return self.conn.recv()
+        except (EOFError, OSError):
+            pass  # Worker died mid-run
+        return None
+    
+    def kill(self):
+        self.process.kill()
+        self.process.join(1)
+        self.conn.close()
+
+
+class SandboxPool:
+    """A warm pool of sandbox workers with a verdict cache."""
+    
+    def __init__(
+        self,
+        workers: int = 4,
+        timeout: float = 2.0,
+        memory_mb: int = 256,
+        cache_size: int = 10_000,
+    ):
+        self.size = workers
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, Verdict] = OrderedDict()
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._workers: list[_Worker] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self.runs = 0
+        self.cache_hits = 0
+        self.restarts = 0
+    
+    def _start(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="sandbox")
+    
+    def _worker(self) -> _Worker:
+        """This executor thread's worker, started on first use."""
+        worker = getattr(self._local, "worker", None)
+        if worker is None or not worker.process.is_alive():
+            worker = _Worker(self._context, self.memory_mb)
+            self._local.worker = worker
+            with self._lock:
+                self._workers.append(worker)
+        return worker
+    
+    def _replace_worker(self, worker: _Worker):
+        worker.kill()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        self._local.worker = None
+        self.restarts += 1
+    
+    @staticmethod
+    def cache_key(problem: str, code: str, test_cases: list) -> str:
+        return hashlib.sha256(f"{problem}\0{test_cases!r}\0{code}".encode()).hexdigest()
+    
+    def _execute(self, key: str, code: str, test_cases: list, timeout: float) -> Verdict:
+        worker = self._worker()
+        result = worker.run(code, test_cases, cpu_seconds=timeout, wall_seconds=timeout + 1.0)
+        if result is None:
+            # Hung in C code, blocked the timer or died: start a fresh worker
+            self._replace_worker(worker)
+            verdict = Verdict(status="timeout", total_cases=len(test_cases), error="time limit exceeded")
+        else:
+            verdict = Verdict(**result)
+        with self._lock:
+            self.runs += 1
+            if verdict.status not in UNCACHED_STATUSES:
+                self._cache[key] = verdict
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            self._inflight.pop(key, None)
+        return verdict
+    
+    def submit(self, problem: str, code: str, test_cases: list, timeout: Optional[float] = None) -> Future:
+        """Queue a submission; returns a Future resolving to its Verdict."""
+        test_cases = list(test_cases)
+        key = self.cache_key(problem, code, test_cases)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                done = Future()
+                done.set_result(Verdict(**{**cached.__dict__, "cached": True}))
+                return done
+            if key in self._inflight:
+                return self._inflight[key]
+        self._start()
+        future = self._executor.submit(self._execute, key, code, test_cases, timeout or self.timeout)
+        with self._lock:
+            self._inflight[key] = future
+        return future
+    
+    def run(self, problem: str, code: str, test_cases: list, timeout: Optional[float] = None) -> Verdict:
+        """Blocking: run one submission."""
+        return self.submit(problem, code, test_cases, timeout).result()
+    
+    async def run_async(self, problem: str, code: str, test_cases: list, timeout: Optional[float] = None) -> Verdict:
+        return await asyncio.wrap_future(self.submit(problem, code, test_cases, timeout))
+    
+    async def run_many(self, problem: str, test_cases: list, codes: dict[str, str]) -> dict[str, Verdict]:
+        """Run a round of submissions in parallel, keyed like `codes`."""
+        keys = list(codes)
+        verdicts = await asyncio.gather(*(self.run_async(problem, codes[k], test_cases) for k in keys))
+        return dict(zip(keys, verdicts))
+    
+    def shutdown(self):
+        """Stop all workers."""
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.kill()
+    
+    def get_stats(self) -> dict:
+        return {
+            "workers": len(self._workers),
+            "max_workers": self.size,
+            "runs": self.runs,
+            "cache_hits": self.cache_hits,
+            "cached_verdicts": len(self._cache),
+            "restarts": self.restarts,
+        }
+
+
+# Shared pool; worker processes start on first submission
+sandbox = SandboxPool(
+    workers=int(os.getenv("SANDBOX_WORKERS", str(min(16, os.cpu_count() or 4)))),
+    timeout=float(os.getenv("SANDBOX_TIMEOUT", "2")),
+    memory_mb=int(os.getenv("SANDBOX_MEMORY_MB", "256")),
+)
@@ -0,0 +1,395 @@
+"""
+Search - Alpha-beta search bots for Tic-Tac-Toe, Chess and Checkers.
+
+SearchBot is a drop-in BotPlayer that picks its moves with negamax
+alpha-beta over the game engines' make/unmake APIs. Each search is
+iterative deepening under a per-move time budget, with a bounded LRU
+transposition table keyed by the position's Zobrist hash. Mate scores go
+into the table as distance from the stored node, so a mate found at one ply
+is reused at another with the right distance. Every other game type falls
+back to the plain BotPlayer strategy.
+
+Strength is tuned with max_depth / time_budget; node and nodes-per-second
+counters make search throughput measurable.
+"""
+
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from . import chess_engine as ce
+from .checkers_engine import KING as CHECKERS_KING, MAN as CHECKERS_MAN, CheckersBoard
+from .games import Checkers, Chess, Game, TicTacToe, TTT_FULL, TTT_LEGAL_MOVES, TTT_WINS
+from .mini_game_sim import BotPlayer
+
+MATE = 100_000
+MATE_BOUND = MATE - 1_000  # Scores past this are mates; evaluations stay well below
+INFINITY = 1_000_000
+
+# Transposition table entry bounds
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+def _to_tt(score: int, ply: int) -> int:
+    """Store mate scores as distance from this node rather than from the root."""
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _from_tt(score: int, ply: int) -> int:
+    """Inverse of _to_tt for a node probed at `ply`."""
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the move's time budget runs out."""
+
+
+class TranspositionTable:
+    """Bounded LRU map from position hash to (depth, score, bound, best move)."""
+    
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[int, tuple] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def get(self, key: int) -> Optional[tuple]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+    
+    def put(self, key: int, entry: tuple):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+    
+    def clear(self):
+        self.entries.clear()
+
+
+# =============================================================================
+# POSITIONS
+# =============================================================================
+
+class TicTacToePosition:
+    """Tic-Tac-Toe bitboards with make/unmake, for searching."""
+    
+    def __init__(self, x: int = 0, o: int = 0, side: int = 0):
+        self.bits = [x, o]
+        self.side = side  # 0 = X to move, 1 = O
+        self.history: list[int] = []
+    
+    @property
+    def hash(self) -> int:
+        return self.bits[0] | self.bits[1] << 9 | self.side << 18
+    
+    def legal_moves(self) -> tuple[int, ...]:
+        return TTT_LEGAL_MOVES[self.bits[0] | self.bits[1]]
+    
+    def make(self, cell: int):
+        self.bits[self.side] |= 1 << cell
+        self.history.append(cell)
+        self.side ^= 1
+    
+    def unmake(self):
+        self.side ^= 1
+        self.bits[self.side] &= ~(1 << self.history.pop())
+
+
+class Rules:
+    """How to score and order moves in one game (side-to-move perspective)."""
+    
+    def terminal(self, pos, moves, ply: int) -> Optional[int]:
+        """Score if the game is over in this position, else None."""
+        return None
+    
+    def evaluate(self, pos) -> int:
+        return 0
+    
+    def order(self, pos, moves, best: Any) -> list:
+        """Best-first move ordering; `best` is the transposition-table move."""
+        moves = list(moves)
+        if best in moves:
+            moves.remove(best)
+            moves.insert(0, best)
+        return moves
+
+
+class TicTacToeRules(Rules):
+    """Searched to the end, so only terminal scores matter."""
+    
+    def terminal(self, pos: TicTacToePosition, moves, ply: int) -> Optional[int]:
+        if TTT_WINS[pos.bits[pos.side ^ 1]]:
+            return -(MATE - ply)
+        if pos.bits[0] | pos.bits[1] == TTT_FULL:
+            return 0
+        return None
+
+
+CHESS_VALUES = (0, 100, 320, 330, 500, 900, 0)  # Indexed by piece type
+# Small bonus for pawns and knights near the centre (0x88 square -> bonus)
+CHESS_CENTER = [0] * 128
+for _sq in ce.SQUARES:
+    _file, _rank = _sq & 7, _sq >> 4
+    CHESS_CENTER[_sq] = 12 - 3 * (abs(2 * _file - 7) + abs(2 * _rank - 7)) // 2
+
+
+class ChessRules(Rules):
+    """Material plus centralisation of pawns and knights."""
+    
+    def terminal(self, pos: ce.ChessBoard, moves, ply: int) -> Optional[int]:
+        if not moves:
+            return -(MATE - ply) if pos.in_check() else 0
+        if ply and (pos.halfmove >= 100 or pos.is_repetition(2)):
+            return 0
+        return None
+    
+    def evaluate(self, pos: ce.ChessBoard) -> int:
+        board = pos.board
+        score = 0
+        for sq in ce.SQUARES:
+            piece = board[sq]
+            if piece:
+                kind = piece if piece > 0 else -piece
+                value = CHESS_VALUES[kind]
+                if kind == ce.PAWN or kind == ce.KNIGHT:
+                    value += CHESS_CENTER[sq]
+                score += value if piece > 0 else -value
+        return score * pos.side
+    
+    def order(self, pos: ce.ChessBoard, moves, best: Any) -> list:
+        board = pos.board
+        
+        def key(move: int) -> int:
+            if move == best:
+                return -INFINITY
+            victim = board[move >> 7 & 0x7F]
+            if victim:
+                # Most valuable victim, least valuable attacker
+                return -10 * CHESS_VALUES[abs(victim)] + CHESS_VALUES[abs(board[move & 0x7F])] // 100
+            return -(move >> 14 & 7) * 100  # Promotions next, quiet moves last
+        
+        return sorted(moves, key=key)
+
+
+class CheckersRules(Rules):
+    """Material, with a bonus for men advancing towards the crown row."""
+    
+    def terminal(self, pos: CheckersBoard, moves, ply: int) -> Optional[int]:
+        if not moves:
+            return -(MATE - ply)
+        return None
+    
+    def evaluate(self, pos: CheckersBoard) -> int:
+        score = 0
+        for sq, piece in enumerate(pos.squares):
+            if piece == CHECKERS_MAN:
+                score += 100 + (7 - sq // 4) * 3
+            elif piece == -CHECKERS_MAN:
+                score -= 100 + (sq // 4) * 3
+            elif piece == CHECKERS_KING:
+                score += 175
+            elif piece == -CHECKERS_KING:
+                score -= 175
+        return score * pos.side
+    
+    def order(self, pos: CheckersBoard, moves, best: Any) -> list:
+        return sorted(moves, key=lambda m: (m != best, -len(m.captured)))
+
+
+# =============================================================================
+# SEARCH
+# =============================================================================
+
+class Searcher:
+    """Iterative-deepening negamax alpha-beta over a make/unmake position."""
+    
+    def __init__(self, rules: Rules, tt_size: int = 100_000):
+        self.rules = rules
+        self.tt = TranspositionTable(tt_size)
+        self.nodes = 0
+        self.total_nodes = 0
+        self.total_time = 0.0
+        self.searches = 0
+        self.depth_reached = 0
+        self._deadline = float("inf")
+        self._check_time = False
+    
+    def search(self, pos, max_depth: int = 64, time_budget: float = 0.1) -> tuple[Any, int]:
+        """
+        Best move and its score for the side to move. Always completes depth 1;
+        deeper iterations stop when the time budget runs out.
+        """
+        started = time.perf_counter()
+        self._deadline = started + time_budget
+        self.nodes = 0
+        self.depth_reached = 0
+        root_moves = list(pos.legal_moves())
+        random.shuffle(root_moves)  # Vary play between equally good moves
+        best_move, best_score = (root_moves[0] if root_moves else None), 0
+        root_depth = len(pos.history)
+        
+        for depth in range(1, max_depth + 1):
+            self._check_time = depth > 1
+            try:
+                move, score = self._root(pos, root_moves, depth, best_move)
+            except SearchTimeout:
+                while len(pos.history) > root_depth:
+                    pos.unmake()
+                break
+            best_move, best_score = move, score
+            self.depth_reached = depth
+            if abs(score) >= MATE - max_depth:
+                break  # Forced result found, deeper search can't change it
+            if time.perf_counter() >= self._deadline:
+                break
+        
+        elapsed = time.perf_counter() - started
+        self.total_nodes += self.nodes
+        self.total_time += elapsed
+        self.searches += 1
+        return best_move, best_score
+    
+    def _root(self, pos, moves, depth: int, previous_best: Any) -> tuple[Any, int]:
+        alpha, best_move = -INFINITY, None
+        for move in self.rules.order(pos, moves, previous_best):
+            pos.make(move)
+            score = -self._negamax(pos, depth - 1, -INFINITY, -alpha, 1)
+            pos.unmake()
+            if score > alpha:
+                alpha, best_move = score, move
+        self.tt.put(pos.hash, (depth, alpha, EXACT, best_move))
+        return best_move, alpha
+    
+    def _negamax(self, pos, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if self._check_time and not self.nodes & 1023 and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+        
+        moves = pos.legal_moves()
+        score = self.rules.terminal(pos, moves, ply)
+        if score is not None:
+            return score
+        if depth <= 0:
+            return self.rules.evaluate(pos)
+        
+        key = pos.hash
+        tt_move = None
+        entry = self.tt.get(key)
+        if entry is not None:
+            tt_depth, tt_score, bound, tt_move = entry
+            tt_score = _from_tt(tt_score, ply)
+            if tt_depth >= depth:
+                if bound == EXACT:
+                    return tt_score
+                if bound == LOWER and tt_score >= beta:
+                    return tt_score
+                if bound == UPPER and tt_score <= alpha:
+                    return tt_score
+        
+        alpha_start = alpha
+        best, best_move = -INFINITY, None
+        for move in self.rules.order(pos, moves, tt_move):
+            pos.make(move)
+            score = -self._negamax(pos, depth - 1, -beta, -alpha, ply + 1)
+            pos.unmake()
+            if score > best:
+                best, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        
+        bound = UPPER if best <= alpha_start else LOWER if best >= beta else EXACT
+        self.tt.put(key, (depth, _to_tt(best, ply), bound, best_move))
+        return best
+    
+    def get_stats(self) -> dict:
+        return {
+            "searches": self.searches,
+            "nodes": self.total_nodes,
+            "nps": round(self.total_nodes / self.total_time) if self.total_time else 0,
+            "tt_entries": len(self.tt),
+            "tt_hit_rate": round(self.tt.hits / max(self.tt.hits + self.tt.misses, 1), 3),
+            "last_depth": self.depth_reached,
+        }
+
+
+# =============================================================================
+# BOTS
+# =============================================================================
+
+class SearchBot(BotPlayer):
+    """BotPlayer that searches Tic-Tac-Toe, Chess and Checkers positions."""
+    
+    def __init__(
+        self,
+        player_id: str,
+        name: str,
+        max_depth: int = 8,
+        time_budget: float = 0.05,
+        tt_size: int = 100_000,
+    ):
+        super().__init__(player_id, name)
+        self.max_depth = max_depth
+        self.time_budget = time_budget
+        self.searchers = {
+            TicTacToe: Searcher(TicTacToeRules(), tt_size),
+            Chess: Searcher(ChessRules(), tt_size),
+            Checkers: Searcher(CheckersRules(), tt_size),
+        }
+    
+    def make_move(self, game: Game) -> str:
+        searcher = self.searchers.get(type(game))
+        if searcher is None:
+            return super().make_move(game)
+        
+        if isinstance(game, TicTacToe):
+            side = 0 if game.current_turn == game.player1_id else 1
+            move, _ = searcher.search(TicTacToePosition(*game.bits, side), 9, self.time_budget)
+            return super().make_move(game) if move is None else f"{move // 3},{move % 3}"
+        
+        # Chess and Checkers are searched in place; make/unmake restore them
+        move, _ = searcher.search(game.engine, self.max_depth, self.time_budget)
+        if move is None:
+            return super().make_move(game)
+        if isinstance(game, Chess):
+            return ce.move_to_uci(move)
+        return move.to_text()
+    
+    def get_stats(self) -> dict:
+        """Search counters per game."""
+        return {cls.__name__: s.get_stats() for cls, s in self.searchers.items() if s.searches}
+
+
+# Bot kinds selectable by name (simulator, tournament CLI)
+BOT_TYPES = {
+    "random": BotPlayer,
+    "search": SearchBot,
+}
+
+
+def make_bot(kind: str, player_id: str, name: str, **options) -> BotPlayer:
+    """Build a bot by kind; options go to SearchBot (depth, budget, TT size)."""
+    if kind not in BOT_TYPES:
+        raise ValueError(f"Unknown bot type: {kind}")
+    if kind == "random":
+        return BotPlayer(player_id, name)  # Nothing to tune
+    return BOT_TYPES[kind](player_id, name, **options)
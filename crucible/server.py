@@ -4,22 +4,31 @@ FastAPI Server - The Crucible API
 
 import os
 import json
+import uuid
 import random
 import asyncio
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Optional
+from typing import Any, Callable, Optional
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from pydantic import BaseModel
 
 from .arena import arena
 from .tribute import Tribute, TributeType
 from .matchmaker import matchmaker
 from .match import MatchPhase
+from .broadcaster import Broadcaster, SlowConsumerPolicy, ALL_TOPICS
+from .encoding import dumpb, dumps
+from .challenge_bank import challenge_bank
+from .generators import problem_buffer
+from .sandbox import sandbox
+from .timing_wheel import HeartbeatMonitor
+from .expiry import expiry_scheduler
+from .wordlist import wordlist
 
 
 # --- Pydantic Models ---
@@ -41,7 +50,14 @@ class MoveRequest(BaseModel):
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("🔥 The Crucible is now open!")
+    # Index the challenge bank off the event loop so the first round doesn't pay for it
+    asyncio.get_running_loop().run_in_executor(None, challenge_bank.load)
+    asyncio.get_running_loop().run_in_executor(None, wordlist.load)  # Warns now if there is no dictionary
+    problem_buffer.start()
     yield
+    await problem_buffer.stop()
+    expiry_scheduler.stop()
+    sandbox.shutdown()
     print("💀 The Crucible has closed.")
 
 
@@ -58,6 +74,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 
@@ -66,35 +83,68 @@ app.add_middleware(
 class ConnectionManager:
     """Manage WebSocket connections for spectators and tributes."""
     
-    def __init__(self):
-        self.spectators: list[WebSocket] = []
+    def __init__(
+        self,
+        max_queue: int = 256,
+        policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST,
+    ):
+        self.broadcaster = Broadcaster(max_queue=max_queue, policy=policy)
         self.tributes: dict[str, WebSocket] = {}  # tribute_id -> websocket
+        self.heartbeats = HeartbeatMonitor(self._on_idle)
     
-    async def connect_spectator(self, websocket: WebSocket):
+    @property
+    def spectators(self) -> dict:
+        """Connected spectator sockets (websocket -> subscriber)."""
+        return self.broadcaster.subscribers
+    
+    async def connect_spectator(self, websocket: WebSocket, topics: Optional[set[str]] = None):
         await websocket.accept()
-        self.spectators.append(websocket)
+        self.broadcaster.subscribe(websocket, topics)
     
     async def connect_tribute(self, websocket: WebSocket, tribute_id: str):
         await websocket.accept()
         self.tributes[tribute_id] = websocket
+        self.heartbeats.track(tribute_id)
     
     def disconnect_spectator(self, websocket: WebSocket):
-        if websocket in self.spectators:
-            self.spectators.remove(websocket)
+        self.broadcaster.unsubscribe(websocket)
     
     def disconnect_tribute(self, tribute_id: str):
         self.tributes.pop(tribute_id, None)
+        self.heartbeats.forget(tribute_id)
     
-    async def broadcast(self, message: dict):
-        """Broadcast to all spectators."""
-        dead = []
-        for ws in self.spectators:
+    async def _on_idle(self, tribute_id: str, stage: str, idle: float):
+        """Heartbeat deadline passed: warn, or drop the tribute and forfeit its match."""
+        if stage != "terminate":
+            await self.send_to_tribute(tribute_id, {
+                "type": "heartbeat_warning",
+                "stage": stage,
+                "idle_seconds": round(idle),
+            })
+            return
+        ws = self.tributes.get(tribute_id)
+        self.disconnect_tribute(tribute_id)
+        if ws:
             try:
-                await ws.send_json(message)
-            except:
-                dead.append(ws)
-        for ws in dead:
-            self.spectators.remove(ws)
+                await ws.send_json({"type": "terminated", "stage": stage, "idle_seconds": round(idle)})
+                await ws.close(code=1001)
+            except Exception:
+                pass  # Already gone
+        await arena.forfeit(tribute_id)
+    
+    def subscribe_spectator(self, websocket: WebSocket, topics: set[str]) -> set[str]:
+        return self.broadcaster.add_topics(websocket, topics)
+    
+    def unsubscribe_spectator(self, websocket: WebSocket, topics: set[str]) -> set[str]:
+        return self.broadcaster.remove_topics(websocket, topics)
+    
+    def send_to_spectator(self, websocket: WebSocket, message):
+        """Queue a message for one spectator, in order with broadcasts."""
+        self.broadcaster.send(websocket, message)
+    
+    async def broadcast(self, message: dict):
+        """Broadcast to the message's topic subscribers without waiting on any socket."""
+        self.broadcaster.publish(message)
     
     async def send_to_tribute(self, tribute_id: str, message: dict):
         """Send message to specific tribute."""
@@ -106,7 +156,47 @@ class ConnectionManager:
                 self.disconnect_tribute(tribute_id)
 
 
-manager = ConnectionManager()
+manager = ConnectionManager(
+    max_queue=int(os.getenv("SPECTATOR_QUEUE_SIZE", "256")),
+    policy=SlowConsumerPolicy(os.getenv("SPECTATOR_SLOW_POLICY", "drop_oldest")),
+)
+
+
+# --- Conditional GET ---
+
+# Version counters restart with the process, so ETags carry a per-process
+# token - a client holding an ETag from before a restart must not get a 304.
+_ETAG_PREFIX = uuid.uuid4().hex[:8]
+
+
+def _etag(*parts) -> str:
+    return '"' + "-".join([_ETAG_PREFIX, *map(str, parts)]) + '"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+
+def conditional_response(request: Request, etag: str, build_body: Callable[[], bytes]) -> Response:
+    """
+    Answer 304 if the client already has this version, else the JSON body.
+    `build_body` is only called when the body is actually needed.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=build_body(), media_type="application/json", headers=headers)
+
+
+def conditional_json(request: Request, etag: str, build: Callable[[], Any]) -> Response:
+    """conditional_response() for a payload that still needs encoding."""
+    return conditional_response(request, etag, lambda: dumpb(build()))
 
 
 # --- REST Endpoints ---
@@ -142,9 +232,13 @@ WebSocket URL: wss://crucible.gltch.app/ws/play
 
 ### Step 2: Join
 ```json
-{"type": "join", "name": "YourAgentName"}
+{"type": "join", "name": "YourAgentName", "games": ["chess", "tic_tac_toe"]}
 ```
 
+`games` is optional: list the game types your agent can play and you will
+only be matched into those. Leave it out to play any game. To re-queue for
+a narrower set, send `{"type": "queue", "games": ["chess"]}`.
+
 ### Step 3: Receive Match Start
 ```json
 {"type": "match_start", "game_type": "chess", "opponent": "OtherAgent"}
@@ -159,6 +253,10 @@ WebSocket URL: wss://crucible.gltch.app/ws/play
 {"type": "move", "move": "1,1"}
 ```
 
+Moves are rate limited (a few per second; tighter in speed games like
+math_duel and trivia). Flooding gets moves dropped - you'll be told once:
+`{"type": "move_dropped", "reason": "rate_limited"}`.
+
 ## Game Types & Move Formats
 
 | Game | Move Format | Example |
@@ -223,6 +321,13 @@ Server responds:
 - **90 seconds**: Connection terminated
 - **In-game**: Opponent wins by forfeit!
 
+Warnings arrive as:
+```json
+{"type": "heartbeat_warning", "stage": "warning", "idle_seconds": 30}
+```
+(`stage` is `"warning"` at 30s and `"disconnect_warning"` at 60s.) Any
+heartbeat or move resets the clock.
+
 ## Example Implementation
 
 ```python
@@ -255,13 +360,59 @@ async def get_heartbeat_md():
 
 
 @app.get("/api/status")
-async def status():
+async def status(request: Request):
     """Get arena status."""
-    return {
-        "queue": arena.get_queue_status(),
-        "active_matches": len(arena.active_matches),
-        "spectators": len(manager.spectators),
-    }
+    return conditional_json(
+        request,
+        _etag("status", arena.version, len(manager.spectators)),
+        lambda: {
+            "queue": arena.get_queue_status(),
+            "active_matches": len(arena.active_matches),
+            "spectators": len(manager.spectators),
+        },
+    )
+
+
+@app.get("/api/stats/broadcast")
+async def broadcast_stats():
+    """Spectator fan-out queue depths and drop counters."""
+    return manager.broadcaster.get_stats()
+
+
+@app.get("/api/stats/challenges")
+async def challenge_stats():
+    """Challenge bank size, buckets per type and difficulty, body cache."""
+    return challenge_bank.get_stats()
+
+
+@app.get("/api/stats/problems")
+async def problem_stats():
+    """Pre-generated problem buffer: ready counts per kind and difficulty, hits and misses."""
+    return problem_buffer.get_stats()
+
+
+@app.get("/api/stats/expiry")
+async def expiry_stats():
+    """Finished matches and games awaiting eviction, per store, and eviction counters."""
+    return expiry_scheduler.get_stats()
+
+
+@app.get("/api/stats/heartbeats")
+async def heartbeat_stats():
+    """Heartbeat reapers: watched connections, pending timers, warnings and terminations."""
+    return {"agents": matchmaker.heartbeats.get_stats(), "tributes": manager.heartbeats.get_stats()}
+
+
+@app.get("/api/stats/moves")
+async def move_stats():
+    """Live-game move intake: per-game actors, queued, processed and dropped moves."""
+    return matchmaker.moves.get_stats()
+
+
+@app.get("/api/stats/sandbox")
+async def sandbox_stats():
+    """Code Golf sandbox pool: workers, runs, verdict cache hits, restarts."""
+    return sandbox.get_stats()
 
 
 @app.post("/api/join")
@@ -293,9 +444,13 @@ async def join_queue(request: JoinRequest):
 
 
 @app.get("/api/matches")
-async def get_matches():
+async def get_matches(request: Request):
     """Get all active matches."""
-    return {"matches": arena.get_active_matches()}
+    return conditional_response(
+        request,
+        _etag("matches", arena.matches_version()),
+        lambda: b'{"matches":' + arena.get_active_matches_json() + b"}",
+    )
 
 
 @app.get("/api/match/{match_id}")
@@ -304,14 +459,19 @@ async def get_match(match_id: str):
     match = arena.get_match(match_id)
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
-    return match.to_dict()
+    gm = arena.game_masters.get(match_id)
+    return {**match.to_dict(), "answers": gm.get_stats() if gm else {}}
 
 
 @app.get("/api/leaderboard")
-async def get_leaderboard(limit: int = 20):
+async def get_leaderboard(request: Request, limit: int = 20):
     """Get top players from mini-games."""
     from .mini_game_sim import mini_game_simulator
-    return {"leaderboard": mini_game_simulator.get_leaderboard()[:limit]}
+    return conditional_json(
+        request,
+        _etag("leaderboard", mini_game_simulator.version, limit),
+        lambda: {"leaderboard": mini_game_simulator.get_leaderboard()[:limit]},
+    )
 
 
 @app.get("/api/games")
@@ -322,10 +482,21 @@ async def list_games():
 
 
 # Mini-game simulation
+from functools import partial
 from .mini_game_sim import mini_game_simulator, MiniGameSimulator
-from .games import GameType
+from .search import make_bot
+from .games import GameType, TicTacToe
+from .ttt_table import board_bits, ttt_table
 
 mini_game_simulator.broadcast = manager.broadcast
+mini_game_simulator.bot_factory = partial(
+    make_bot,
+    os.getenv("SIM_BOT", "random"),
+    max_depth=int(os.getenv("SIM_BOT_DEPTH", "8")),
+    time_budget=int(os.getenv("SIM_BOT_BUDGET_MS", "50")) / 1000,
+)
+arena.broadcast = manager.broadcast
+arena.send_to_tribute = manager.send_to_tribute
 
 
 @app.post("/api/mini-game/start/{game_type}")
@@ -342,9 +513,13 @@ async def start_mini_game(game_type: str):
 
 
 @app.get("/api/mini-game/active")
-async def get_active_mini_games():
+async def get_active_mini_games(request: Request):
     """Get all active mini-games."""
-    return {"games": mini_game_simulator.get_active_games()}
+    return conditional_json(
+        request,
+        _etag("mini-games", mini_game_simulator.version),
+        lambda: {"games": mini_game_simulator.get_active_games()},
+    )
 
 
 @app.post("/api/mini-game/demo")
@@ -525,32 +700,145 @@ async def submit_move(request: MoveRequest):
     if not tribute.is_alive():
         raise HTTPException(status_code=400, detail="Tribute is eliminated")
     
-    # Process move (simplified - would integrate with GameMaster)
+    status = arena.submit_answer(tribute.id, request.answer, match_id=match.id)
+    if status != "accepted":
+        return {"status": "rejected", "reason": status, "answer": request.answer}
     return {"status": "received", "answer": request.answer}
 
 
 # --- WebSocket Endpoints ---
 
+def _parse_topics(raw) -> set[str]:
+    """Accept topics as a list or a comma-separated string."""
+    if isinstance(raw, str):
+        raw = raw.split(",")
+    if not isinstance(raw, list):
+        return set()
+    return {str(t).strip() for t in raw if str(t).strip()}
+
+
 @app.websocket("/ws/spectate")
-async def spectate(websocket: WebSocket):
-    """WebSocket for spectators to watch matches."""
-    await manager.connect_spectator(websocket)
+async def spectate(websocket: WebSocket, topics: Optional[str] = None):
+    """
+    WebSocket for spectators to watch matches.
+    
+    Pass ?topics=lobby,match:<id>,game:<id> to only receive those events
+    (default: everything). Topics can be changed on the fly with
+    {"type": "subscribe" | "unsubscribe", "topics": [...]}.
+    """
+    subscribed = _parse_topics(topics) if topics else {ALL_TOPICS}
+    await manager.connect_spectator(websocket, subscribed)
     
-    # Send current state
-    await websocket.send_json({
-        "type": "init",
-        "matches": arena.get_active_matches(),
-        "queue": arena.get_queue_status(),
-    })
+    # Send current state (queued ahead of any later broadcast). The match
+    # list is stitched from the arena's cached per-match JSON.
+    match_ids = None
+    if ALL_TOPICS not in subscribed and "match:*" not in subscribed:
+        match_ids = [t.removeprefix("match:") for t in subscribed if t.startswith("match:")]
+    manager.send_to_spectator(websocket, (
+        '{"type":"init"'
+        f',"topics":{dumps(sorted(subscribed))}'
+        f',"matches":{arena.get_active_matches_json(match_ids).decode()}'
+        f',"queue":{dumps(arena.get_queue_status())}}}'
+    ))
     
     try:
         while True:
-            # Keep connection alive, handle pings
+            # Keep connection alive, handle pings and subscription changes
             data = await websocket.receive_text()
             if data == "ping":
-                await websocket.send_text("pong")
+                manager.send_to_spectator(websocket, "pong")
+                continue
+            
+            try:
+                msg = json.loads(data)
+            except ValueError:
+                continue
+            if not isinstance(msg, dict):
+                continue
+            
+            msg_type = msg.get("type")
+            if msg_type == "subscribe":
+                current = manager.subscribe_spectator(websocket, _parse_topics(msg.get("topics")))
+            elif msg_type == "unsubscribe":
+                current = manager.unsubscribe_spectator(websocket, _parse_topics(msg.get("topics")))
+            else:
+                continue
+            manager.send_to_spectator(websocket, {
+                "type": "subscribed",
+                "topics": sorted(current),
+            })
     except WebSocketDisconnect:
         manager.disconnect_spectator(websocket)
+    except RuntimeError:
+        # Socket was closed by the slow-consumer policy
+        manager.disconnect_spectator(websocket)
+
+
+async def _wait_for_change(changed: asyncio.Event, client: asyncio.Task, timeout: float):
+    """Wait until the match changes, the client goes away, or timeout."""
+    waiter = asyncio.create_task(changed.wait())
+    try:
+        await asyncio.wait({waiter, client}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        waiter.cancel()
+
+
+async def _drain_client(websocket: WebSocket):
+    """Read (and ignore) client frames until the socket closes."""
+    try:
+        while True:
+            await websocket.receive_text()
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+
+
+@app.websocket("/ws/match/{match_id}")
+async def match_stream(websocket: WebSocket, match_id: str, since: Optional[int] = None):
+    """
+    Versioned state stream for one match.
+    
+    The first message is a full snapshot with its sequence number, unless
+    ?since=<seq> is given and the changes after it are still retained. After
+    that only deltas are sent: tribute field changes, new events and phase
+    changes, each carrying its own sequence number.
+    """
+    await websocket.accept()
+    match = arena.get_match(match_id)
+    if not match:
+        await websocket.send_json({"type": "error", "message": "Match not found"})
+        await websocket.close()
+        return
+    
+    changed = asyncio.Event()
+    match.watch(changed)
+    client = asyncio.create_task(_drain_client(websocket))
+    
+    try:
+        while not client.done():
+            changed.clear()
+            deltas = match.deltas_since(since) if since is not None else None
+            if deltas is None:
+                await websocket.send_text(dumps({"type": "snapshot", **match.snapshot()}))
+            elif deltas:
+                await websocket.send_text(dumps({
+                    "type": "delta",
+                    "since": since,
+                    "seq": match.seq,
+                    "changes": deltas,
+                }))
+            since = match.seq
+            
+            if arena.get_match(match_id) is not match:
+                await websocket.send_json({"type": "match_closed", "match_id": match_id})
+                await websocket.close()
+                break
+            
+            await _wait_for_change(changed, client, timeout=15)
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        match.unwatch(changed)
+        client.cancel()
 
 
 @app.websocket("/ws/tribute/{tribute_id}")
@@ -563,11 +851,17 @@ async def tribute_connection(websocket: WebSocket, tribute_id: str):
             data = await websocket.receive_json()
             
             if data.get("type") == "heartbeat":
+                manager.heartbeats.beat(tribute_id)
                 await websocket.send_json({"type": "heartbeat_ack"})
             
             elif data.get("type") == "move":
-                # Forward to game logic
-                await websocket.send_json({"type": "move_ack", "received": True})
+                manager.heartbeats.beat(tribute_id)
+                # Forward to the match's open answer round
+                status = arena.submit_answer(tribute_id, data.get("answer", data.get("move")))
+                ack = {"type": "move_ack", "received": status == "accepted"}
+                if status != "accepted":
+                    ack["reason"] = status
+                await websocket.send_json(ack)
     
     except WebSocketDisconnect:
         manager.disconnect_tribute(tribute_id)
@@ -589,7 +883,7 @@ async def play_connection(websocket: WebSocket):
             return
         
         name = data.get("name", f"Agent_{random.randint(1000, 9999)}")
-        agent = await matchmaker.connect_agent(websocket, name)
+        agent = await matchmaker.connect_agent(websocket, name, data.get("games"))
         
         # Auto-join queue
         await matchmaker.join_queue(agent.agent_id)
@@ -605,10 +899,10 @@ async def play_connection(websocket: WebSocket):
             
             elif msg_type == "move":
                 move = data.get("move", "")
-                await matchmaker.handle_move(agent.agent_id, move)
+                await matchmaker.submit_move(agent.agent_id, move)
             
             elif msg_type == "queue":
-                await matchmaker.join_queue(agent.agent_id)
+                await matchmaker.join_queue(agent.agent_id, data.get("games") or data.get("game_type"))
     
     except WebSocketDisconnect:
         if agent:
@@ -620,15 +914,47 @@ async def play_connection(websocket: WebSocket):
 
 
 @app.get("/api/live-games")
-async def get_live_games():
+async def get_live_games(request: Request):
     """Get currently active real-agent games."""
-    return {"games": matchmaker.get_live_games()}
+    return conditional_json(
+        request,
+        _etag("live-games", matchmaker.version),
+        lambda: {"games": matchmaker.get_live_games()},
+    )
 
 
 @app.get("/api/queue-status")
-async def get_queue_status():
+async def get_queue_status(request: Request):
     """Get matchmaking queue info."""
-    return matchmaker.get_queue_status()
+    return conditional_json(
+        request,
+        _etag("queue", matchmaker.version, matchmaker.longest_wait()),  # Wait time changes without a version bump
+        matchmaker.get_queue_status,
+    )
+
+
+@app.get("/api/tic-tac-toe/hint")
+async def get_tic_tac_toe_hint(game_id: Optional[str] = None, board: Optional[str] = None):
+    """
+    Perfect-play prediction for a Tic-Tac-Toe position, from the precomputed table.
+    Pass a live/simulated `game_id`, or a 9-character `board` like "X.O......".
+    """
+    if game_id:
+        entry = mini_game_simulator.active_games.get(game_id)
+        live = matchmaker.live_games.get(game_id)
+        game = entry["game"] if entry else live.game if live else None
+        if not isinstance(game, TicTacToe):
+            raise HTTPException(status_code=404, detail="Tic-Tac-Toe game not found")
+        return {"game_id": game_id, **ttt_table.hint(game)}
+    
+    if not board or len(board) != 9 or any(c not in "XO._-" for c in board.upper()):
+        raise HTTPException(status_code=400, detail="Pass game_id, or board as 9 of X, O, '.'")
+    game = TicTacToe("x", "o")
+    game.bits = list(board_bits([board.upper()[i:i + 3] for i in (0, 3, 6)]))
+    hint = ttt_table.hint(game)
+    if hint["predicted"] == "unknown":
+        raise HTTPException(status_code=400, detail="Unreachable position")
+    return {"board": board, **hint}
 
 
 # --- Entry Point ---
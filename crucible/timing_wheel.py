@@ -0,0 +1,165 @@
+"""
+Timing Wheel - O(1) timers for heartbeat deadlines.
+
+TimingWheel is a hashed timing wheel: a ring of slots, one per tick, where
+a timer due at tick t lives in slot t % len(slots). Scheduling is an
+append; advancing the clock visits only the slots that passed, and a slot
+holds timers for later laps of the ring until their tick comes round.
+
+HeartbeatMonitor puts connection liveness on a wheel. A heartbeat just
+records the time - it doesn't touch the wheel. When a connection's timer
+fires, the monitor checks when it was last seen: if it has beaten since,
+the timer is re-armed from that time (lazy rescheduling, at most one wheel
+operation per idle interval); otherwise the next stage (warn, warn again,
+terminate) is acted on. Idle connections cost nothing between stages and
+there is one task for all of them, not one per connection.
+"""
+
+import asyncio
+import itertools
+import math
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from .clock import Clock, real_clock
+
+
+class TimingWheel:
+    """Hashed timing wheel with `slots` buckets of `tick` seconds."""
+    
+    def __init__(self, tick: float = 1.0, slots: int = 128, start: float = 0.0):
+        self.tick = tick
+        self.slots: list[list[tuple[int, Any]]] = [[] for _ in range(slots)]
+        self.current = int(start // tick)  # Last tick processed
+        self.size = 0
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def schedule(self, deadline: float, item: Any):
+        """Fire `item` on the first advance() at or after `deadline`."""
+        tick = max(math.ceil(deadline / self.tick), self.current + 1)
+        self.slots[tick % len(self.slots)].append((tick, item))
+        self.size += 1
+    
+    def advance(self, now: float) -> list[Any]:
+        """Items whose deadline has passed since the last advance."""
+        target = int(now // self.tick)
+        if target <= self.current:
+            return []
+        n = len(self.slots)
+        due: list[Any] = []
+        # A jump of a whole lap or more visits every slot once
+        for tick in range(self.current + 1, self.current + 1 + min(target - self.current, n)):
+            index = tick % n
+            slot = self.slots[index]
+            if not slot:
+                continue
+            keep = []
+            for entry in slot:
+                if entry[0] <= target:
+                    due.append(entry[1])
+                else:
+                    keep.append(entry)  # Due on a later lap
+            self.size -= len(slot) - len(keep)
+            self.slots[index] = keep
+        self.current = target
+        return due
+
+
+class HeartbeatMonitor:
+    """
+    Liveness stages for a set of connections.
+    
+    `stages` is a list of (idle seconds, stage name); `on_stage` is awaited
+    as on_stage(key, stage, idle_seconds) when a connection has been idle
+    that long. After the last stage the connection is forgotten.
+    """
+    
+    STAGES = ((30.0, "warning"), (60.0, "disconnect_warning"), (90.0, "terminate"))
+    
+    def __init__(
+        self,
+        on_stage: Callable[[Hashable, str, float], Awaitable[None]],
+        clock: Optional[Clock] = None,
+        stages: tuple[tuple[float, str], ...] = STAGES,
+        tick: float = 1.0,
+    ):
+        self.on_stage = on_stage
+        self.clock = clock or real_clock
+        self.stages = stages
+        self.tick = tick
+        self.wheel = TimingWheel(tick, slots=max(8, math.ceil(stages[-1][0] / tick) + 2), start=self.clock.now())
+        self.last_seen: dict[Hashable, float] = {}
+        self._generation: dict[Hashable, int] = {}
+        self._generations = itertools.count(1)  # Never reused, so stale timers can't match a re-track
+        self._task: Optional[asyncio.Task] = None
+        self.fired = {name: 0 for _, name in stages}
+        self.rearmed = 0
+    
+    def __len__(self) -> int:
+        return len(self.last_seen)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.last_seen
+    
+    def track(self, key: Hashable):
+        """Start watching a connection (seen now)."""
+        now = self.clock.now()
+        generation = next(self._generations)
+        self._generation[key] = generation
+        self.last_seen[key] = now
+        self.wheel.schedule(now + self.stages[0][0], (key, generation, 0))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+    
+    def beat(self, key: Hashable):
+        """Record a heartbeat - O(1), no timer is touched."""
+        if key in self.last_seen:
+            self.last_seen[key] = self.clock.now()
+    
+    def forget(self, key: Hashable):
+        """Stop watching; its pending timer is dropped when it fires."""
+        self.last_seen.pop(key, None)
+        self._generation.pop(key, None)
+    
+    def idle(self, key: Hashable) -> Optional[float]:
+        seen = self.last_seen.get(key)
+        return None if seen is None else self.clock.now() - seen
+    
+    async def check(self):
+        """Act on every timer that is due."""
+        now = self.clock.now()
+        for key, generation, stage in self.wheel.advance(now):
+            if self._generation.get(key) != generation:
+                continue  # Forgotten, or re-tracked since
+            seen = self.last_seen[key]
+            after, name = self.stages[stage]
+            if now - seen < after:
+                # Beat since this was armed: start over from the last heartbeat
+                self.rearmed += 1
+                self.wheel.schedule(seen + self.stages[0][0], (key, generation, 0))
+                continue
+            self.fired[name] += 1
+            if stage + 1 < len(self.stages):
+                self.wheel.schedule(seen + self.stages[stage + 1][0], (key, generation, stage + 1))
+            else:
+                self.forget(key)
+            try:
+                await self.on_stage(key, name, now - seen)
+            except Exception as e:
+                print(f"Heartbeat {name} failed for {key}: {e}")
+    
+    async def run(self):
+        """Tick while anything is being watched."""
+        while self.last_seen:
+            # Waits for the next tick without moving a shared VirtualClock
+            await self.clock.sleep_until((self.wheel.current + 1) * self.tick)
+            await self.check()
+    
+    def get_stats(self) -> dict:
+        return {
+            "tracked": len(self.last_seen),
+            "timers": len(self.wheel),
+            "fired": dict(self.fired),
+            "rearmed": self.rearmed,
+        }
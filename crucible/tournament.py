@@ -0,0 +1,230 @@
+"""
+Tournament - Headless bot-vs-bot batch runner for game-balance tuning.
+
+Plays BotPlayer vs BotPlayer games with no broadcasts and no sleeps, spread
+over a process pool, and aggregates win/draw/length/damage statistics per
+game type. Games are handed to workers in batches so the pool overhead is
+paid per batch rather than per game.
+
+Run with: python -m crucible.tournament --games 100000
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from .games import GAME_CLASSES, GameType, create_game
+from .mini_game_sim import BotPlayer, play_turn
+from .search import BOT_TYPES, make_bot
+
+# Same cap as MiniGameSimulator.simulate_game
+MAX_MOVES = 50
+BATCH_SIZE = 2000
+
+
+@dataclass
+class GameStats:
+    """Aggregated outcomes for one game type."""
+    game_type: str
+    games: int = 0
+    p1_wins: int = 0
+    p2_wins: int = 0
+    draws: int = 0
+    unfinished: int = 0  # Hit the move cap without a result
+    total_moves: int = 0
+    min_moves: Optional[int] = None
+    max_moves: int = 0
+    total_damage: int = 0
+    lengths: dict[int, int] = field(default_factory=dict)  # moves -> games
+    
+    def record(self, winner_id: Optional[str], is_draw: bool, moves: int, damage: int):
+        """Add one finished (or capped) game."""
+        self.games += 1
+        if is_draw:
+            self.draws += 1
+        elif winner_id == "p1":
+            self.p1_wins += 1
+        elif winner_id == "p2":
+            self.p2_wins += 1
+        else:
+            self.unfinished += 1
+        self.total_moves += moves
+        self.min_moves = moves if self.min_moves is None else min(self.min_moves, moves)
+        self.max_moves = max(self.max_moves, moves)
+        self.total_damage += damage
+        self.lengths[moves] = self.lengths.get(moves, 0) + 1
+    
+    def merge(self, other: "GameStats"):
+        """Fold another batch's stats for the same game type into this one."""
+        self.games += other.games
+        self.p1_wins += other.p1_wins
+        self.p2_wins += other.p2_wins
+        self.draws += other.draws
+        self.unfinished += other.unfinished
+        self.total_moves += other.total_moves
+        if other.min_moves is not None:
+            self.min_moves = other.min_moves if self.min_moves is None else min(self.min_moves, other.min_moves)
+        self.max_moves = max(self.max_moves, other.max_moves)
+        self.total_damage += other.total_damage
+        for moves, count in other.lengths.items():
+            self.lengths[moves] = self.lengths.get(moves, 0) + count
+    
+    def to_dict(self) -> dict:
+        decided = self.p1_wins + self.p2_wins
+        return {
+            "game_type": self.game_type,
+            "games": self.games,
+            "p1_wins": self.p1_wins,
+            "p2_wins": self.p2_wins,
+            "draws": self.draws,
+            "unfinished": self.unfinished,
+            "p1_win_rate": round(self.p1_wins / self.games, 4) if self.games else 0,
+            "draw_rate": round(self.draws / self.games, 4) if self.games else 0,
+            "avg_moves": round(self.total_moves / self.games, 2) if self.games else 0,
+            "min_moves": self.min_moves or 0,
+            "max_moves": self.max_moves,
+            "avg_damage": round(self.total_damage / decided, 2) if decided else 0,
+            "lengths": dict(sorted(self.lengths.items())),
+        }
+
+
+def play_game(game_type: GameType, bot1: BotPlayer, bot2: BotPlayer, max_moves: int = MAX_MOVES):
+    """Play one game to completion (or the move cap). Returns (result, moves)."""
+    game = create_game(game_type, bot1.player_id, bot2.player_id)
+    result = None
+    moves = 0
+    while moves < max_moves and result is None:
+        _, result = play_turn(game, bot1, bot2)
+        moves += 1
+    return result, moves
+
+
+def _run_batch(
+    game_type_value: str,
+    n_games: int,
+    seed: Optional[int],
+    max_moves: int,
+    bots: tuple[str, str] = ("random", "random"),
+    bot_options: Optional[dict] = None,
+) -> GameStats:
+    """Worker entry point: play a batch of games of one type."""
+    if seed is not None:
+        random.seed(seed)
+    game_type = GameType(game_type_value)
+    bot1 = make_bot(bots[0], "p1", "Bot1", **(bot_options or {}))
+    bot2 = make_bot(bots[1], "p2", "Bot2", **(bot_options or {}))
+    stats = GameStats(game_type=game_type_value)
+    for _ in range(n_games):
+        result, moves = play_game(game_type, bot1, bot2, max_moves)
+        if result is None:
+            stats.record(None, False, moves, 0)
+        else:
+            stats.record(result.winner_id, result.is_draw, moves, result.damage_to_loser)
+    return stats
+
+
+def _batches(game_types: list[GameType], n_games: int, batch_size: int, seed: Optional[int]):
+    """Split the work into (game_type, count, seed, ...) jobs."""
+    jobs = []
+    for game_type in game_types:
+        remaining = n_games
+        while remaining > 0:
+            count = min(batch_size, remaining)
+            job_seed = None if seed is None else seed + len(jobs)
+            jobs.append((game_type.value, count, job_seed))
+            remaining -= count
+    return jobs
+
+
+def run_tournament(
+    game_types: Optional[Iterable[GameType]] = None,
+    n_games: int = 1000,
+    workers: Optional[int] = None,
+    max_moves: int = MAX_MOVES,
+    batch_size: int = BATCH_SIZE,
+    seed: Optional[int] = None,
+    bots: tuple[str, str] = ("random", "random"),
+    bot_options: Optional[dict] = None,
+) -> dict[str, GameStats]:
+    """
+    Play `n_games` of each game type and return stats keyed by game type.
+    
+    workers=None uses every core; workers=1 runs in this process.
+    A seed makes the whole run reproducible for a given batch size.
+    `bots` names the player 1 / player 2 kinds (see search.BOT_TYPES) and
+    `bot_options` tunes search bots, e.g. {"time_budget": 0.01}.
+    """
+    game_types = list(game_types) if game_types is not None else list(GAME_CLASSES)
+    for game_type in game_types:
+        if game_type not in GAME_CLASSES:
+            raise ValueError(f"Unknown game type: {game_type}")
+    jobs = _batches(game_types, n_games, batch_size, seed)
+    results = {gt.value: GameStats(game_type=gt.value) for gt in game_types}
+    
+    if workers == 1:
+        for game_type_value, count, job_seed in jobs:
+            stats = _run_batch(game_type_value, count, job_seed, max_moves, bots, bot_options)
+            results[game_type_value].merge(stats)
+        return results
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_run_batch, game_type_value, count, job_seed, max_moves, bots, bot_options)
+            for game_type_value, count, job_seed in jobs
+        ]
+        for future in futures:
+            stats = future.result()
+            results[stats.game_type].merge(stats)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a headless bot-vs-bot tournament.")
+    parser.add_argument("--games", type=int, default=1000, help="Games per game type")
+    parser.add_argument("--types", nargs="*", default=None, help="Game types (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: all cores)")
+    parser.add_argument("--max-moves", type=int, default=MAX_MOVES)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--bot1", choices=sorted(BOT_TYPES), default="random")
+    parser.add_argument("--bot2", choices=sorted(BOT_TYPES), default="random")
+    parser.add_argument("--depth", type=int, default=8, help="Search bot max depth")
+    parser.add_argument("--budget-ms", type=float, default=10, help="Search bot time per move")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON stats")
+    args = parser.parse_args()
+    
+    game_types = [GameType(t) for t in args.types] if args.types else None
+    started = time.perf_counter()
+    results = run_tournament(
+        game_types,
+        n_games=args.games,
+        workers=args.workers,
+        max_moves=args.max_moves,
+        batch_size=args.batch_size,
+        seed=args.seed,
+        bots=(args.bot1, args.bot2),
+        bot_options={"max_depth": args.depth, "time_budget": args.budget_ms / 1000},
+    )
+    elapsed = time.perf_counter() - started
+    
+    if args.json:
+        print(json.dumps({k: v.to_dict() for k, v in results.items()}, indent=2))
+        return
+    
+    total = sum(s.games for s in results.values())
+    print(f"🏟️  {total:,} games in {elapsed:.1f}s "
+          f"({total / elapsed * 3600:,.0f}/hour on {args.workers or os.cpu_count()} workers)\n")
+    print(f"{'game':<22}{'p1 win':>8}{'p2 win':>8}{'draw':>8}{'capped':>8}{'avg len':>9}{'avg dmg':>9}")
+    for stats in results.values():
+        d = stats.to_dict()
+        print(f"{d['game_type']:<22}{d['p1_wins']:>8}{d['p2_wins']:>8}{d['draws']:>8}"
+              f"{d['unfinished']:>8}{d['avg_moves']:>9}{d['avg_damage']:>9}")
+
+
+if __name__ == "__main__":
+    main()
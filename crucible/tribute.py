@@ -4,7 +4,7 @@ Tribute - Represents an AI agent participant in The Crucible.
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from typing import Callable, Optional
 from datetime import datetime
 import uuid
 
@@ -24,6 +24,13 @@ class TributeType(Enum):
     GENERIC = "generic"
 
 
+# Fields that show up in to_dict(); changing one is reported to the owning
+# match so spectators can be sent just that field.
+TRACKED_FIELDS = frozenset({
+    "name", "agent_type", "status", "health", "resources", "kills", "elo",
+})
+
+
 @dataclass
 class Tribute:
     """An AI agent participating in The Crucible."""
@@ -48,6 +55,16 @@ class Tribute:
     websocket: Optional[object] = field(default=None, repr=False)
     last_heartbeat: datetime = field(default_factory=datetime.now)
     
+    # Called as on_change(tribute, field_name, value) - set by Match
+    on_change: Optional[Callable] = field(default=None, repr=False, compare=False)
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in TRACKED_FIELDS:
+            hook = self.__dict__.get("on_change")
+            if hook:
+                hook(self, name, value)
+    
     def is_alive(self) -> bool:
         return self.status == TributeStatus.ALIVE
     
@@ -71,6 +88,13 @@ class Tribute:
         self.status = TributeStatus.VICTOR
         self.wins += 1
     
+    def serialize_field(self, name: str) -> tuple[str, object]:
+        """The to_dict() key and value for a single tracked field."""
+        value = getattr(self, name)
+        if isinstance(value, Enum):
+            value = value.value
+        return ("type" if name == "agent_type" else name), value
+    
     def to_dict(self) -> dict:
         """Serialize for API responses."""
         return {
@@ -0,0 +1,164 @@
+"""
+TTT Table - Precomputed perfect-play table for Tic-Tac-Toe.
+
+A build step solves every reachable position once and writes one byte per
+position, indexed by the base-3 encoding of the board (cell i contributes
+3**i for X, 2 * 3**i for O). At runtime the file is memory-mapped, so a
+best move or predicted outcome is a single byte read with no search.
+
+Byte layout: low 4 bits = best cell + 1 (0 if the game is over),
+high 4 bits = outcome for the side to move (WIN / DRAW / LOSS, 0 if the
+position is unreachable).
+
+Build with: python -m crucible.ttt_table [--out PATH]
+"""
+
+import argparse
+import mmap
+import os
+from typing import Optional
+
+from .games import TTT_FULL, TTT_LEGAL_MOVES, TTT_WINS, TicTacToe
+
+TABLE_SIZE = 3 ** 9
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "data", "tictactoe.bin")
+
+# Outcomes for the side to move
+WIN, DRAW, LOSS = 1, 2, 3
+
+# Base-3 index contributions of each 9-bit board
+X_INDEX = tuple(sum(3 ** i for i in range(9) if bits >> i & 1) for bits in range(TTT_FULL + 1))
+O_INDEX = tuple(2 * x for x in X_INDEX)
+
+
+def table_index(x: int, o: int) -> int:
+    return X_INDEX[x] + O_INDEX[o]
+
+
+def build_table() -> bytearray:
+    """Solve every position reachable from the empty board."""
+    table = bytearray(TABLE_SIZE)
+    scores: dict[tuple[int, int], int] = {}
+    
+    def solve(x: int, o: int) -> int:
+        """Score for the side to move: +(10 - plies) win, 0 draw, negative loss."""
+        key = (x, o)
+        if key in scores:
+            return scores[key]
+        x_to_move = bin(x).count("1") == bin(o).count("1")
+        other = o if x_to_move else x
+        index = table_index(x, o)
+        
+        if TTT_WINS[other]:
+            score = -10 + bin(x | o).count("1")
+            table[index] = LOSS << 4
+        elif x | o == TTT_FULL:
+            score = 0
+            table[index] = DRAW << 4
+        else:
+            best_score, best_cell = -100, 0
+            for cell in TTT_LEGAL_MOVES[x | o]:
+                child = (x | 1 << cell, o) if x_to_move else (x, o | 1 << cell)
+                child_score = -solve(*child)
+                if child_score > best_score:
+                    best_score, best_cell = child_score, cell
+            score = best_score
+            outcome = WIN if score > 0 else LOSS if score < 0 else DRAW
+            table[index] = outcome << 4 | (best_cell + 1)
+        
+        scores[key] = score
+        return score
+    
+    solve(0, 0)
+    return table
+
+
+def write_table(path: str = DEFAULT_PATH) -> int:
+    """Build the table and write it to `path`. Returns the number of reachable positions."""
+    table = build_table()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"  # Pool workers may build it at once
+    with open(tmp, "wb") as f:
+        f.write(table)
+    os.replace(tmp, path)
+    return sum(1 for b in table if b)
+
+
+class TicTacToeTable:
+    """Read-only view of the solved table (memory-mapped when loaded from disk)."""
+    
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self._data = None
+        self._file = None
+    
+    def _load(self):
+        if not os.path.exists(self.path):
+            try:
+                write_table(self.path)
+            except OSError:
+                # Read-only install - keep the table in memory instead
+                self._data = build_table()
+                return
+        self._file = open(self.path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def lookup(self, x: int, o: int) -> tuple[Optional[int], Optional[int]]:
+        """(outcome for the side to move, best cell) for a pair of 9-bit boards."""
+        if self._data is None:
+            self._load()
+        entry = self._data[table_index(x, o)]
+        if not entry:
+            return None, None  # Unreachable position
+        cell = (entry & 0x0F) - 1
+        return entry >> 4, (cell if cell >= 0 else None)
+    
+    def best_move(self, game: TicTacToe) -> Optional[str]:
+        """Perfect-play move as "row,col", or None if the game is over."""
+        _, cell = self.lookup(*game.bits)
+        return None if cell is None else f"{cell // 3},{cell % 3}"
+    
+    def hint(self, game: TicTacToe) -> dict:
+        """Predicted result with perfect play from here, for spectators."""
+        x, o = game.bits
+        outcome, cell = self.lookup(x, o)
+        to_move = "X" if bin(x).count("1") == bin(o).count("1") else "O"
+        other = "O" if to_move == "X" else "X"
+        predicted = {
+            WIN: f"{to_move.lower()}_wins",
+            LOSS: f"{other.lower()}_wins",
+            DRAW: "draw",
+        }.get(outcome, "unknown")
+        return {
+            "to_move": to_move,
+            "predicted": predicted,
+            "best_move": None if cell is None else f"{cell // 3},{cell % 3}",
+        }
+
+
+def board_bits(board: list[list[str]]) -> tuple[int, int]:
+    """Bitboards for a board given as rows of "X" / "O" / ""."""
+    x = o = 0
+    for i in range(9):
+        cell = board[i // 3][i % 3].upper()
+        if cell == "X":
+            x |= 1 << i
+        elif cell == "O":
+            o |= 1 << i
+    return x, o
+
+
+# Shared by the simulator and the hint API; loaded on first lookup
+ttt_table = TicTacToeTable(os.getenv("TTT_TABLE_PATH", DEFAULT_PATH))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Tic-Tac-Toe perfect-play table.")
+    parser.add_argument("--out", default=DEFAULT_PATH)
+    args = parser.parse_args()
+    reachable = write_table(args.out)
+    print(f"Wrote {args.out}: {TABLE_SIZE} entries, {reachable} reachable positions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Word List - Shared dictionary for Word Chain validation and bot play.
+
+Loaded lazily on first use from WORDLIST_PATH, crucible/data/words.txt or
+the system dictionary (one word per line), and shared by every game. Words
+are kept in a set for O(len) lookups and in per-initial-letter sorted
+lists; WordCursor walks those lists so picking an unused word for a letter
+is amortised O(1).
+
+No word file ships with the package (a full dictionary is too big to
+vendor), so deployments should provide one via WORDLIST_PATH, a
+crucible/data/words.txt or the system dictionary. If none is found, a loud
+warning is printed at startup and the small built-in list is used.
+Validation stays strict either way: only listed words are accepted, so a
+missing dictionary makes Word Chain harder, never lets nonsense words through.
+"""
+
+import os
+import random
+import threading
+from typing import Iterable, Optional
+
+SEARCH_PATHS = (
+    os.path.join(os.path.dirname(__file__), "data", "words.txt"),
+    "/usr/share/dict/words",
+    "/usr/dict/words",
+)
+
+FALLBACK_WORDS = (
+    "apple", "banana", "cat", "dog", "elephant", "fox", "grape", "house",
+    "island", "jungle", "king", "lion", "moon", "night", "ocean", "piano",
+    "queen", "river", "star", "tiger", "umbrella", "violin", "water", "xray",
+    "yellow", "zebra", "tree", "eagle", "earth", "north", "south", "east",
+    "west", "train", "novel", "light", "tower", "robot", "table", "energy",
+    "road", "game", "ember", "yarn", "ant", "arrow", "time", "rain", "nurse",
+    "name", "year", "echo", "engine", "gold", "dream", "mango", "orbit",
+    "tunnel", "lemon", "nest", "tulip", "pearl", "lake", "kite", "unit",
+    "hat", "sun", "ink", "igloo", "vase", "jam", "quiz", "wolf", "fern",
+)
+
+
+class WordList:
+    """A lazily loaded dictionary, indexed by first letter."""
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.source: Optional[str] = None  # File loaded, or None for the fallback list
+        self._words: Optional[frozenset[str]] = None
+        self._by_letter: dict[str, list[str]] = {}
+        self._lock = threading.Lock()
+    
+    def load(self):
+        """Read the word file (once); warns if none was found."""
+        with self._lock:
+            if self._words is not None:
+                return
+            paths = [self.path] if self.path else list(SEARCH_PATHS)
+            words: Iterable[str] = FALLBACK_WORDS
+            for path in paths:
+                if path and os.path.exists(path):
+                    with open(path, encoding="utf-8", errors="ignore") as f:
+                        words = [line.strip().lower() for line in f]
+                    self.source = path
+                    break
+            
+            if self.source is None:
+                print(
+                    f"⚠️ No word list found (tried {', '.join(p for p in paths if p)}); "
+                    f"Word Chain only accepts the {len(FALLBACK_WORDS)} built-in words. "
+                    "Set WORDLIST_PATH to a one-word-per-line dictionary."
+                )
+            
+            clean = {w for w in words if len(w) >= 2 and w.isascii() and w.isalpha()}
+            by_letter: dict[str, list[str]] = {}
+            for word in sorted(clean):
+                by_letter.setdefault(word[0], []).append(word)
+            self._by_letter = by_letter
+            self._words = frozenset(clean)
+    
+    @property
+    def words(self) -> frozenset[str]:
+        if self._words is None:
+            self.load()
+        return self._words
+    
+    def __len__(self) -> int:
+        return len(self.words)
+    
+    def __contains__(self, word: str) -> bool:
+        return word in self.words
+    
+    def is_valid(self, word: str) -> bool:
+        """Dictionary check (against the built-in list if no word file was found)."""
+        return word in self.words
+    
+    def starting_with(self, letter: str) -> list[str]:
+        """Sorted words beginning with `letter` (shared - don't mutate)."""
+        if self._words is None:
+            self.load()
+        return self._by_letter.get(letter, [])
+    
+    def random_word(self, letter: str) -> Optional[str]:
+        words = self.starting_with(letter)
+        return random.choice(words) if words else None
+    
+    def cursor(self) -> "WordCursor":
+        return WordCursor(self)
+
+
+class WordCursor:
+    """
+    Per-game position in each letter's word list. Each letter starts at a
+    random offset and only moves forward (wrapping once), so repeated
+    picks skip past used words instead of rescanning them.
+    """
+    
+    def __init__(self, wordlist: WordList):
+        self.wordlist = wordlist
+        self._positions: dict[str, tuple[int, int]] = {}  # letter -> (start, steps taken)
+    
+    def next_unused(self, letter: str, used: set[str]) -> Optional[str]:
+        """An unused word starting with `letter`, or None if all are used."""
+        words = self.wordlist.starting_with(letter)
+        if not words:
+            return None
+        start, steps = self._positions.get(letter) or (random.randrange(len(words)), 0)
+        while steps < len(words):
+            word = words[(start + steps) % len(words)]
+            if word not in used:
+                self._positions[letter] = (start, steps)
+                return word
+            steps += 1
+        self._positions[letter] = (start, steps)
+        return None
+
+
+# Shared by every game in the process; loaded on first use
+wordlist = WordList(os.getenv("WORDLIST_PATH") or None)
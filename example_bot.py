@@ -15,6 +15,13 @@ except ImportError:
     print("Install websockets: pip install websockets")
     sys.exit(1)
 
+try:
+    # Perfect Tic-Tac-Toe and a real dictionary when run from a checkout of the arena
+    from crucible.ttt_table import board_bits, ttt_table
+    from crucible.wordlist import wordlist
+except ImportError:
+    ttt_table = wordlist = None
+
 
 class CrucibleBot:
     """A simple bot that plays Crucible games."""
@@ -24,6 +31,12 @@ class CrucibleBot:
         self.server_url = server_url
         self.agent_id = None
         self.running = True
+        self._new_game()
+    
+    def _new_game(self):
+        """Forget per-game state: Word Chain words seen so far."""
+        self.words_used: set[str] = set()
+        self.word_cursor = wordlist.cursor() if wordlist else None
     
     async def connect_and_play(self):
         """Connect to server and play games."""
@@ -73,6 +86,7 @@ class CrucibleBot:
         elif msg_type == "match_start":
             opponent = msg.get("opponent")
             game_type = msg.get("game_type")
+            self._new_game()
             print(f"[{self.name}] 🎮 Match started vs {opponent} - {game_type}!")
         
         elif msg_type == "challenge":
@@ -105,6 +119,10 @@ class CrucibleBot:
         # --- Tic-Tac-Toe ---
         if game == "tic_tac_toe":
             board = challenge.get("board", [[]])
+            if ttt_table:
+                _, cell = ttt_table.lookup(*board_bits(board))
+                if cell is not None:
+                    return f"{cell // 3},{cell % 3}"
             # Find first empty cell
             for r in range(3):
                 for c in range(3):
@@ -152,6 +170,13 @@ class CrucibleBot:
         elif game == "word_chain":
             last_word = challenge.get("last_word", "apple")
             required = last_word[-1].lower()
+            # The prompt only shows the last word: remember every word in the chain
+            self.words_used.add(last_word.lower())
+            if self.word_cursor:
+                word = self.word_cursor.next_unused(required, self.words_used)
+                if word:
+                    self.words_used.add(word)
+                    return word
             # Simple word list
             words = {
                 "a": ["apple", "ant", "arrow"],
@@ -161,8 +186,10 @@ class CrucibleBot:
                 "n": ["night", "nurse", "name"],
                 "y": ["yarn", "year", "yellow"],
             }
-            options = words.get(required, [f"{required}ing"])
-            return random.choice(options)
+            options = [w for w in words.get(required, [f"{required}ing"]) if w not in self.words_used]
+            word = random.choice(options or [f"{required}ing"])
+            self.words_used.add(word)
+            return word
         
         return "0,0"
 
@@ -0,0 +1,41 @@
+"""Shared test helpers."""
+
+from typing import Optional
+
+import pytest
+
+from crucible.clock import VirtualClock
+from crucible.matchmaker import Matchmaker
+
+
+class FakeSocket:
+    """Stands in for a FastAPI WebSocket; records what was sent."""
+    
+    def __init__(self, fail: bool = False):
+        self.sent: list[dict] = []
+        self.closed_with: Optional[int] = None
+        self.fail = fail
+    
+    async def accept(self):
+        pass
+    
+    async def send_json(self, message: dict):
+        if self.fail:
+            raise ConnectionResetError("socket gone")
+        self.sent.append(message)
+    
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+    
+    def of_type(self, message_type: str) -> list[dict]:
+        return [m for m in self.sent if m.get("type") == message_type]
+
+
+@pytest.fixture
+def clock():
+    return VirtualClock()
+
+
+@pytest.fixture
+def matchmaker(clock):
+    return Matchmaker(clock=clock)
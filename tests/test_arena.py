@@ -0,0 +1,36 @@
+"""A whole match on a virtual clock."""
+
+import asyncio
+
+from crucible.arena import Arena
+from crucible.tribute import Tribute
+
+
+async def test_match_runs_to_completion_and_is_evicted(clock):
+    arena = Arena(clock=clock)
+    for i in range(4):
+        joined = await arena.join_queue(Tribute(name=f"T{i}", wallet_address=f"w{i}"))
+    match_id = joined["match_id"]
+    match = arena.get_match(match_id)
+    
+    for _ in range(10_000):
+        if match_id in arena.finished:
+            break
+        await asyncio.sleep(0)
+    assert match_id in arena.finished, "match never finished"
+    
+    assert len(match.alive_tributes()) <= 1
+    assert sum(entry["wins"] + entry["losses"] for entry in arena.leaderboard.values()) == 4
+    finished_at = clock.now()
+    assert finished_at > 0  # The match drove the clock through its phases
+    
+    # Still visible until the owner of the clock moves past the TTL
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert clock.now() == finished_at
+    assert arena.get_match(match_id) is match
+    clock.advance(arena.FINISHED_TTL)
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert arena.get_match(match_id) is None
+    assert not arena.tribute_matches
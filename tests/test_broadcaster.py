@@ -0,0 +1,95 @@
+"""Spectator fan-out: topics, slow-consumer policies, pump robustness."""
+
+import asyncio
+import json
+
+from crucible.broadcaster import Broadcaster, SlowConsumerPolicy
+
+
+class TextSocket:
+    def __init__(self, block: bool = False):
+        self.frames: list[dict] = []
+        self.block = block
+        self.released = asyncio.Event()
+    
+    async def send_text(self, text: str):
+        if self.block:
+            await self.released.wait()
+        self.frames.append(json.loads(text))
+    
+    async def close(self):
+        pass
+
+
+async def settle(n: int = 10):
+    for _ in range(n):
+        await asyncio.sleep(0)
+
+
+async def test_topics_route_messages():
+    broadcaster = Broadcaster()
+    everything, one_match, lobby = TextSocket(), TextSocket(), TextSocket()
+    broadcaster.subscribe(everything)
+    broadcaster.subscribe(one_match, {"match:m1"})
+    broadcaster.subscribe(lobby, {"lobby"})
+    broadcaster.publish({"type": "event", "match_id": "m1"})
+    broadcaster.publish({"type": "event", "match_id": "m2"})
+    broadcaster.publish({"type": "queue_update"})
+    await settle()
+    
+    assert len(everything.frames) == 3
+    assert [f["match_id"] for f in one_match.frames] == ["m1"]
+    assert [f["type"] for f in lobby.frames] == ["queue_update"]
+
+
+async def test_unserializable_message_is_dropped_and_pump_keeps_going():
+    broadcaster = Broadcaster()
+    socket = TextSocket()
+    broadcaster.subscribe(socket)
+    broadcaster.publish({"type": "bad", "payload": object()})
+    broadcaster.publish({"type": "good"})
+    await settle()
+    
+    assert [f["type"] for f in socket.frames] == ["good"]
+    stats = broadcaster.get_stats()
+    assert stats["unencodable"] == 1 and stats["dropped"] == 1
+    broadcaster.publish({"type": "later"})
+    await settle()
+    assert socket.frames[-1]["type"] == "later"
+
+
+async def test_int_keys_and_big_ints_are_sent_like_stdlib_json():
+    broadcaster = Broadcaster()
+    socket = TextSocket()
+    broadcaster.subscribe(socket)
+    broadcaster.publish({"type": "stats", "by_depth": {1: 20, 2: 400}, "nodes": 2 ** 70})
+    await settle()
+    
+    assert socket.frames == [{"type": "stats", "by_depth": {"1": 20, "2": 400}, "nodes": 2 ** 70}]
+    assert broadcaster.get_stats()["unencodable"] == 0
+
+
+async def test_drop_counter_survives_unsubscribe():
+    broadcaster = Broadcaster(max_queue=2, policy=SlowConsumerPolicy.DROP_OLDEST)
+    slow = TextSocket(block=True)
+    broadcaster.subscribe(slow)
+    for i in range(6):
+        broadcaster.publish({"type": "tick", "i": i})
+    await settle()
+    dropped = broadcaster.get_stats()["dropped"]
+    assert dropped > 0
+    
+    broadcaster.unsubscribe(slow)
+    assert broadcaster.get_stats()["dropped"] == dropped
+    assert broadcaster.get_stats()["subscribers"] == 0
+
+
+async def test_disconnect_policy_drops_slow_subscriber():
+    broadcaster = Broadcaster(max_queue=1, policy=SlowConsumerPolicy.DISCONNECT)
+    slow = TextSocket(block=True)
+    broadcaster.subscribe(slow)
+    for i in range(4):
+        broadcaster.publish({"type": "tick", "i": i})
+    await settle()
+    assert broadcaster.get_stats()["disconnected_slow"] == 1
+    assert len(broadcaster) == 0
@@ -0,0 +1,34 @@
+"""Keyed challenge grading."""
+
+from crucible.challenges import LogicPuzzleChallenge, TriviaChallenge, key_for
+from crucible.grading import normalize
+
+
+def test_evaluate_many_grades_a_round():
+    challenge = TriviaChallenge(item={"q": "Largest ocean?", "a": "Pacific Ocean", "aliases": ["pacific"]})
+    challenge.generate()
+    results = challenge.evaluate_many({"t1": "the pacific-ocean", "t2": "Pacific.", "t3": "atlantic", "t4": "  "})
+    
+    assert results["t1"].success and results["t2"].success
+    assert not results["t3"].success and results["t3"].damage_taken == challenge.wrong_answer_damage
+    assert not results["t4"].success and results["t4"].damage_taken == 50
+
+
+def test_bank_item_keys_are_built_once():
+    item = {"prompt": "2 + 2?", "answer": "4", "aliases": ["four"]}
+    first = LogicPuzzleChallenge(item=dict(item))
+    second = LogicPuzzleChallenge(item=dict(item))
+    first.generate()
+    second.generate()
+    
+    assert first.answer_key() is second.answer_key() is key_for(item, "answer")
+    assert second.evaluate("Four").success
+
+
+def test_significant_symbols_are_kept():
+    key = TriviaChallenge.KEYS["What language is the Linux kernel written in?"]
+    assert key.accepts("C") and key.accepts("the C language")
+    assert not key.accepts("C++")
+    assert not key.accepts("C#")
+    assert normalize("Node.js") != normalize("nodejs")
+    assert normalize("Pacific ocean.") == normalize("the pacific-ocean")
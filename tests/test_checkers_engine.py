@@ -0,0 +1,26 @@
+"""Checkers move generation: perft node counts."""
+
+from crucible.checkers_engine import CheckersBoard
+
+# Published English draughts counts from the opening position
+COUNTS = [7, 49, 302, 1469, 7361]
+
+
+def perft(board: CheckersBoard, depth: int) -> int:
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in board.legal_moves():
+        board.make(move)
+        nodes += perft(board, depth - 1)
+        board.unmake()
+    return nodes
+
+
+def test_perft():
+    board = CheckersBoard()
+    rows, hash_before = board.rows(), board.hash
+    for depth, want in enumerate(COUNTS, 1):
+        assert perft(board, depth) == want
+    assert board.rows() == rows  # make/unmake left the board as it was
+    assert board.hash == hash_before
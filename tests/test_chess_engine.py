@@ -0,0 +1,24 @@
+"""Chess move generation: perft node counts."""
+
+import pytest
+
+from crucible.chess_engine import START_FEN, ChessBoard, perft
+
+# Published perft counts (see benchmarks/bench_perft.py), cut to fast depths
+POSITIONS = [
+    (START_FEN, [20, 400, 8902]),
+    ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", [48, 2039]),
+    ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", [14, 191, 2812]),
+    ("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", [6, 264]),
+    ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", [44, 1486]),
+]
+
+
+@pytest.mark.parametrize("fen,counts", POSITIONS)
+def test_perft(fen, counts):
+    board = ChessBoard(fen)
+    hash_before = board.hash
+    for depth, want in enumerate(counts, 1):
+        assert perft(board, depth) == want
+    assert board.fen() == fen  # make/unmake left the board as it was
+    assert board.hash == hash_before
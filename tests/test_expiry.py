@@ -0,0 +1,73 @@
+"""Expiry scheduling on a virtual clock."""
+
+import asyncio
+
+from crucible.expiry import ExpiryScheduler
+
+
+async def settle(steps: int = 5):
+    for _ in range(steps):
+        await asyncio.sleep(0)
+
+
+async def test_scheduler_does_not_advance_the_clock(clock):
+    scheduler = ExpiryScheduler(clock)
+    evicted = []
+    store = scheduler.store("matches", ttl=300, evict=evicted.append)
+    
+    store.expire("m1")
+    await settle(20)
+    assert clock.now() == 0  # Only the owner of the clock moves it
+    assert evicted == []
+    
+    clock.advance(299)
+    await settle()
+    assert evicted == []
+    clock.advance(1)
+    await settle()
+    assert evicted == ["m1"]
+    assert scheduler.get_stats()["pending"] == 0
+    assert store.get_stats()["expired"] == 1
+
+
+async def test_sooner_deadline_wakes_the_scheduler(clock):
+    scheduler = ExpiryScheduler(clock)
+    evicted = []
+    slow = scheduler.store("matches", ttl=300, evict=evicted.append)
+    fast = scheduler.store("games", ttl=10, evict=evicted.append)
+    
+    slow.expire("m1")
+    await settle()
+    fast.expire("g1")
+    await settle()
+    clock.advance(10)
+    await settle()
+    assert evicted == ["g1"]
+    assert scheduler.get_stats()["next_in"] == 290
+
+
+async def test_max_count_evicts_oldest_early(clock):
+    scheduler = ExpiryScheduler(clock)
+    evicted = []
+    store = scheduler.store("matches", ttl=300, evict=evicted.append, max_count=2)
+    
+    for key in ("a", "b", "c"):
+        store.expire(key)
+    assert evicted == ["a"]
+    assert len(store) == 2
+    assert store.get_stats()["evicted_early"] == 1
+    scheduler.stop()
+
+
+async def test_cancelled_item_is_kept(clock):
+    scheduler = ExpiryScheduler(clock)
+    evicted = []
+    store = scheduler.store("matches", ttl=5, evict=evicted.append)
+    
+    store.expire("a")
+    store.expire("b")
+    assert store.cancel("a")
+    assert not store.cancel("a")
+    clock.advance(5)
+    await settle()
+    assert evicted == ["b"]
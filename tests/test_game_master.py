@@ -0,0 +1,91 @@
+"""Match flow on a virtual clock."""
+
+import asyncio
+
+from crucible.challenges import get_random_challenge
+from crucible.clock import VirtualClock
+from crucible.game_master import GameMaster
+from crucible.match import Match
+from crucible.tribute import Tribute
+
+
+def make_match(n: int = 3) -> Match:
+    match = Match(min_tributes=2, max_tributes=8)
+    for i in range(n):
+        match.add_tribute(Tribute(name=f"T{i}", wallet_address=f"w{i}"))
+    return match
+
+
+async def test_forfeit_mid_round_closes_round_before_deadline():
+    clock = VirtualClock()
+    match = make_match(3)
+    gm = GameMaster(match, clock=clock)
+    t0, t1, t2 = match.tributes
+    challenge = get_random_challenge(difficulty=3, challenge_type="trivia")
+    
+    prompt = challenge.generate()
+    task = asyncio.create_task(gm.collect_answers(challenge, match.tributes, prompt, time_limit=30))
+    await asyncio.sleep(0)
+    assert gm.submit_answer(t0.id, "x") == "accepted"
+    assert gm.submit_answer(t1.id, "y") == "accepted"
+    assert await gm.forfeit(t2.id)
+    graded = await task
+    
+    assert set(graded) == {t0.id, t1.id}
+    assert clock.now() < 30  # Closed when the last live tribute answered, not at the deadline
+    assert t2.status.value == "eliminated"
+    assert "forfeits" in match.events[-1]["message"]
+
+
+async def test_forfeit_unknown_tribute():
+    gm = GameMaster(make_match(2), clock=VirtualClock())
+    assert not await gm.forfeit("nobody")
+
+
+async def test_round_reports_missing_tributes_and_latency_stats():
+    clock = VirtualClock()
+    match = make_match(2)
+    gm = GameMaster(match, clock=clock)
+    events = []
+    
+    async def record(message):
+        events.append(message)
+    gm.broadcast_callback = record
+    t0, t1 = match.tributes
+    challenge = get_random_challenge(difficulty=3, challenge_type="trivia")
+    
+    prompt = challenge.generate()
+    task = asyncio.create_task(gm.collect_answers(challenge, match.tributes, prompt, time_limit=30))
+    await asyncio.sleep(0)
+    clock.advance(2)
+    gm.submit_answer(t0.id, "x")
+    await task
+    
+    (done,) = [e for e in events if e["type"] == "round_complete"]
+    assert done["missing"] == ["T1"]
+    stats = gm.get_stats()
+    assert stats["T0"] == {"answered": 1, "missed": 0, "avg_latency_ms": 2000, "best_latency_ms": 2000}
+    assert stats["T1"] == {"answered": 0, "missed": 1, "avg_latency_ms": None, "best_latency_ms": None}
+
+
+async def test_forfeit_mid_duel_is_not_a_kill():
+    clock = VirtualClock()
+    match = make_match(2)
+    gm = GameMaster(match, clock=clock)
+    events = []
+    
+    async def record(message):
+        events.append(message)
+    gm.broadcast_callback = record
+    t0, t1 = match.tributes
+    
+    task = asyncio.create_task(gm.run_showdown())
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert gm.current_round is not None
+    gm.submit_answer(t1.id, "x")
+    assert await gm.forfeit(t0.id)
+    await task
+    
+    assert t1.is_alive() and t1.kills == 0
+    assert len([e for e in events if e["type"] == "elimination"]) == 1
@@ -0,0 +1,90 @@
+"""Move intake: token buckets, inbox overflow policies, per-game actors."""
+
+import asyncio
+
+from conftest import FakeSocket
+from crucible.clock import VirtualClock
+from crucible.inbox import MoveRouter, OverflowPolicy, TokenBucket
+from crucible.matchmaker import Matchmaker
+
+
+def test_token_bucket_burst_then_rate():
+    bucket = TokenBucket(rate=2.0, burst=3, now=0.0)
+    assert [bucket.take(0.0) for _ in range(4)] == [True, True, True, False]
+    assert not bucket.take(0.4)  # 0.8 tokens
+    assert bucket.take(0.5)
+    assert bucket.take(10.0) and bucket.tokens == 2.0  # Capped at burst
+
+
+def make_router(policy=OverflowPolicy.DROP_NEWEST, **kwargs):
+    applied = []
+    
+    async def handler(agent_id, move):
+        applied.append((agent_id, move))
+    
+    kwargs.setdefault("rate", 100.0)
+    kwargs.setdefault("burst", 100)
+    router = MoveRouter(handler, clock=VirtualClock(), inbox_size=2, policy=policy, **kwargs)
+    return router, applied
+
+
+async def test_overflow_policies():
+    router, _ = make_router(OverflowPolicy.DROP_NEWEST)
+    assert [router.submit("a", "g", "chess", i) for i in range(3)] == ["accepted", "accepted", "inbox_full"]
+    assert list(router.actors["g"].inboxes["a"]) == [0, 1]
+    
+    router, _ = make_router(OverflowPolicy.DROP_OLDEST)
+    assert [router.submit("a", "g", "chess", i) for i in range(3)] == ["accepted", "accepted", "replaced"]
+    assert list(router.actors["g"].inboxes["a"]) == [1, 2]
+    assert router.get_stats()["dropped"]["replaced"] == 1
+    
+    router, _ = make_router(OverflowPolicy.DISCONNECT)
+    assert [router.submit("a", "g", "chess", i) for i in range(3)] == ["accepted", "accepted", "disconnect"]
+    for actor in router.actors.values():
+        actor.close()
+
+
+async def test_rate_limit_checks_both_buckets_before_spending():
+    router, _ = make_router(rate=0.001, burst=1, game_rates={"trivia": (0.001, 5)})
+    assert router.submit("a", "g", "trivia", 1) == "accepted"
+    # Agent bucket is empty: the game bucket must keep its remaining tokens
+    assert router.submit("a", "g", "trivia", 2) == "rate_limited"
+    assert router._game_buckets["a"]["trivia"].tokens == 4.0
+    assert router.get_stats()["dropped"]["rate_limited"] == 1
+    router.end_game("g")
+
+
+async def test_inbox_full_refunds_the_token():
+    router, _ = make_router(rate=0.001, burst=3, game_rates={"chess": (0.001, 3)})
+    assert [router.submit("a", "g", "chess", i) for i in range(3)] == ["accepted", "accepted", "inbox_full"]
+    assert router._agent_buckets["a"].tokens == 1.0
+    assert router._game_buckets["a"]["chess"].tokens == 1.0
+    router.actors["g"].inboxes["a"].clear()  # Backed off; the inbox drained
+    assert router.submit("a", "g", "chess", 3) == "accepted"
+    router.end_game("g")
+
+
+async def test_actor_applies_moves_round_robin():
+    router, applied = make_router()
+    router.submit("a", "g", "chess", "a1")
+    router.submit("a", "g", "chess", "a2")
+    router.submit("b", "g", "chess", "b1")
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert applied == [("a", "a1"), ("b", "b1"), ("a", "a2")]
+    assert router.get_stats()["processed"] == 3
+
+
+async def test_replaced_move_is_accepted_for_the_agent(clock):
+    matchmaker = Matchmaker(clock=clock, move_inbox_size=1, move_policy=OverflowPolicy.DROP_OLDEST)
+    a, b = FakeSocket(), FakeSocket()
+    agent_a = await matchmaker.connect_agent(a, "A")
+    agent_b = await matchmaker.connect_agent(b, "B")
+    await matchmaker.join_queue(agent_a.agent_id, "trivia")
+    await matchmaker.join_queue(agent_b.agent_id, "trivia")
+    
+    assert await matchmaker.submit_move(agent_a.agent_id, "first") == "accepted"
+    assert await matchmaker.submit_move(agent_a.agent_id, "second") == "accepted"
+    assert agent_a.moves_dropped == 1
+    assert not a.of_type("move_dropped")
+    matchmaker.moves.end_game(agent_a.current_game_id)
@@ -0,0 +1,85 @@
+"""Matchmaker: pairing, results and move intake with fake sockets."""
+
+import asyncio
+
+from conftest import FakeSocket
+from crucible.games import GameResult
+
+
+async def start_game(matchmaker, game_type="trivia"):
+    a, b = FakeSocket(), FakeSocket()
+    agent_a = await matchmaker.connect_agent(a, "A")
+    agent_b = await matchmaker.connect_agent(b, "B")
+    await matchmaker.join_queue(agent_a.agent_id, game_type)
+    await matchmaker.join_queue(agent_b.agent_id, game_type)
+    live_game = matchmaker.live_games[agent_a.current_game_id]
+    return live_game, (agent_a, a), (agent_b, b)
+
+
+async def test_draw_counts_a_game_but_no_win_or_loss(matchmaker):
+    live_game, (agent_a, a), (agent_b, b) = await start_game(matchmaker)
+    await matchmaker._end_game(live_game, GameResult(is_draw=True, message="draw"))
+    
+    for name in ("A", "B"):
+        assert matchmaker.scores[name]["games"] == 1
+        assert matchmaker.scores[name]["wins"] == 0
+        assert matchmaker.scores[name]["losses"] == 0
+    assert matchmaker.scores["A"]["rating"] == matchmaker.scores["B"]["rating"]
+    for socket in (a, b):
+        (end,) = socket.of_type("match_end")
+        assert end["draw"] and end["winner"] is None
+
+
+async def test_win_updates_scores_and_ratings(matchmaker):
+    live_game, (agent_a, a), (agent_b, b) = await start_game(matchmaker)
+    result = GameResult(winner_id=agent_b.agent_id, loser_id=agent_a.agent_id, message="B wins")
+    await matchmaker._end_game(live_game, result)
+    
+    assert matchmaker.scores["B"]["wins"] == 1 and matchmaker.scores["A"]["losses"] == 1
+    assert matchmaker.scores["B"]["rating"] > matchmaker.scores["A"]["rating"]
+    assert a.of_type("match_end")[0]["winner"] == "B"
+
+
+class SlowSocket(FakeSocket):
+    def __init__(self, clock, delay):
+        super().__init__()
+        self.clock = clock
+        self.delay = delay
+    
+    async def send_json(self, message: dict):
+        self.clock.advance(self.delay)
+        await super().send_json(message)
+
+
+async def test_dispatch_reaches_every_player_and_times_deliveries(matchmaker):
+    live_game, (agent_a, a), (agent_b, b) = await start_game(matchmaker)
+    agent_a.websocket = FakeSocket(fail=True)
+    deliveries = await matchmaker.dispatch([(agent_a, {"type": "ping"}), (agent_b, {"type": "ping"})])
+    
+    assert not deliveries[agent_a.agent_id].ok and agent_a.send_failures == 1
+    assert deliveries[agent_b.agent_id].ok  # A failed write doesn't skip the other player
+    assert b.of_type("ping")
+
+
+async def test_latency_change_bumps_version(matchmaker, clock):
+    live_game, (agent_a, a), (agent_b, b) = await start_game(matchmaker)
+    agent_b.websocket = SlowSocket(clock, 0.25)
+    version = matchmaker.version
+    await matchmaker.dispatch([(agent_b, {"type": "ping"})])
+    
+    assert matchmaker.version > version
+    latencies = matchmaker.get_live_games()[0]["send_latency_ms"]
+    assert latencies["B"] > latencies["A"]
+
+
+async def test_queued_agent_waits_without_moving_the_clock(matchmaker, clock):
+    socket = FakeSocket()
+    agent = await matchmaker.connect_agent(socket, "Solo")
+    await matchmaker.join_queue(agent.agent_id, "trivia")
+    for _ in range(200):
+        await asyncio.sleep(0)
+    
+    assert clock.now() == 0  # The widen loop waits for the clock's owner
+    assert agent.agent_id in matchmaker.queue
+    assert not socket.of_type("heartbeat_warning") and socket.closed_with is None
+    matchmaker._widen_task.cancel()
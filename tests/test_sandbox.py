@@ -0,0 +1,33 @@
+"""Sandbox verdict cache."""
+
+import pytest
+
+from crucible.sandbox import SandboxPool
+
+
+@pytest.fixture
+def pool():
+    pool = SandboxPool(workers=1, timeout=0.5)
+    yield pool
+    pool.shutdown()
+
+
+def test_cache_is_keyed_on_test_cases(pool):
+    code = "lambda n: n * 2"
+    assert pool.run("double", code, [(1, 2), (2, 4)]).passed
+    assert pool.run("double", code, [(1, 2), (2, 4)]).cached
+    
+    verdict = pool.run("double", code, [(3, 7)])
+    assert verdict.status == "wrong_answer"
+    assert not verdict.cached
+    assert pool.get_stats()["runs"] == 2
+
+
+def test_timeouts_are_not_cached(pool):
+    code = "lambda n: sum(1 for _ in iter(int, 1))"
+    for _ in range(2):
+        verdict = pool.run("spin", code, [(1, 1)])
+        assert verdict.status == "timeout"
+        assert not verdict.cached
+    assert pool.get_stats()["runs"] == 2
+    assert pool.get_stats()["cached_verdicts"] == 0
@@ -0,0 +1,35 @@
+"""Alpha-beta search: mate distances through the transposition table."""
+
+from crucible import chess_engine as ce
+from crucible.search import MATE, MATE_BOUND, ChessRules, Searcher
+
+MATE_IN_2 = "k7/8/2K5/8/8/8/8/7R w - - 0 1"  # 1. Kb6 (or Kc7) and mate next move
+
+
+def test_finds_mate_in_two():
+    searcher = Searcher(ChessRules())
+    move, score = searcher.search(ce.ChessBoard(MATE_IN_2), max_depth=8, time_budget=5)
+    assert ce.move_to_uci(move) in ("c6b6", "c6c7")
+    assert score == MATE - 3
+
+
+def test_mate_scores_are_stored_relative_to_the_node():
+    searcher = Searcher(ChessRules())
+    board = ce.ChessBoard(MATE_IN_2)
+    searcher.search(board, max_depth=8, time_budget=5)
+    
+    # Every position after 1. Kb6 and a king move is a mate in one for white
+    board.make(board.parse_move("c6b6"))
+    mates = []
+    for reply in board.legal_moves():
+        board.make(reply)
+        entry = searcher.tt.entries.get(board.hash)
+        if entry and entry[1] >= MATE_BOUND:
+            mates.append(entry[1])
+        board.unmake()
+    assert mates and set(mates) == {MATE - 1}  # Not three, as seen from the old root
+    
+    # Reusing the warm table from a new root reports the right distance
+    board.make(board.legal_moves()[0])
+    move, score = searcher.search(board, max_depth=8, time_budget=5)
+    assert score == MATE - 1
@@ -0,0 +1,40 @@
+"""HTTP endpoints: conditional GETs."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from crucible import server
+from crucible.clock import VirtualClock
+
+
+@pytest.fixture
+def client():
+    return TestClient(server.app)  # No context manager: lifespan tasks stay off
+
+
+def revalidate(client, path):
+    first = client.get(path)
+    assert first.status_code == 200 and first.headers["etag"]
+    again = client.get(path, headers={"If-None-Match": first.headers["etag"]})
+    return first, again
+
+
+@pytest.mark.parametrize("path", ["/api/status", "/api/matches", "/api/live-games", "/api/queue-status"])
+def test_unchanged_resource_revalidates_as_304(client, path):
+    first, again = revalidate(client, path)
+    assert again.status_code == 304
+    assert again.headers["etag"] == first.headers["etag"]
+
+
+def test_queue_wait_time_changes_etag(client, monkeypatch):
+    clock = VirtualClock()
+    monkeypatch.setattr(server.matchmaker, "clock", clock)
+    server.matchmaker.queue.add("waiting_agent", 1200.0, clock.now())
+    try:
+        first = client.get("/api/queue-status")
+        clock.advance(5)
+        again = client.get("/api/queue-status", headers={"If-None-Match": first.headers["etag"]})
+        assert again.status_code == 200
+        assert again.json()["longest_wait"] == 5
+    finally:
+        server.matchmaker.queue.remove("waiting_agent")
@@ -0,0 +1,123 @@
+"""Timing wheel and heartbeat stages on a virtual clock."""
+
+import asyncio
+
+from conftest import FakeSocket
+from crucible.timing_wheel import HeartbeatMonitor, TimingWheel
+
+
+async def settle(steps: int = 5):
+    for _ in range(steps):
+        await asyncio.sleep(0)
+
+
+def test_wheel_fires_each_item_once_at_its_deadline():
+    wheel = TimingWheel(tick=1.0, slots=8)
+    wheel.schedule(3.0, "a")
+    wheel.schedule(3.5, "b")
+    wheel.schedule(20.0, "later lap")
+    
+    assert wheel.advance(2.9) == []
+    assert wheel.advance(3.0) == ["a"]
+    assert wheel.advance(4.0) == ["b"]
+    assert wheel.advance(19.0) == []
+    assert len(wheel) == 1
+    assert wheel.advance(100.0) == ["later lap"]
+    assert len(wheel) == 0
+
+
+async def test_stages_fire_as_the_owner_advances_time(clock):
+    fired = []
+    
+    async def on_stage(key, stage, idle):
+        fired.append((key, stage, idle))
+    
+    monitor = HeartbeatMonitor(on_stage, clock=clock)
+    monitor.track("a")
+    await settle(20)
+    assert clock.now() == 0  # The monitor never moves the clock itself
+    
+    for _ in range(90):
+        clock.advance(1.0)
+        await settle()
+    assert fired == [("a", "warning", 30.0), ("a", "disconnect_warning", 60.0), ("a", "terminate", 90.0)]
+    assert "a" not in monitor
+    await settle()
+    assert monitor._task.done()
+
+
+async def test_beat_resets_the_idle_timer(clock):
+    fired = []
+    
+    async def on_stage(key, stage, idle):
+        fired.append(stage)
+    
+    monitor = HeartbeatMonitor(on_stage, clock=clock)
+    monitor.track("a")
+    for second in range(1, 60):
+        clock.advance(1.0)
+        if second == 25:
+            monitor.beat("a")
+        await settle()
+    assert fired == ["warning"]  # At 55s: 30s after the beat, not at 30s
+    assert monitor.get_stats()["rearmed"] == 1
+    monitor.forget("a")
+    clock.advance(1.0)
+    await settle()
+
+
+async def test_silent_agent_is_terminated_and_disconnected(matchmaker, clock):
+    socket = FakeSocket()
+    agent = await matchmaker.connect_agent(socket, "Quiet")
+    
+    for _ in range(90):
+        clock.advance(1.0)
+        await settle()
+    assert [m["stage"] for m in socket.sent if "stage" in m] == ["warning", "disconnect_warning", "terminate"]
+    assert socket.closed_with == 1001
+    assert agent.agent_id not in matchmaker.agents
+
+
+async def test_stale_timers_do_not_fire_after_forget_and_retrack(clock):
+    fired = []
+    
+    async def on_stage(key, stage, idle):
+        fired.append((stage, idle))
+    
+    monitor = HeartbeatMonitor(on_stage, clock=clock)
+    monitor.track("a")
+    clock.advance(10.0)
+    await settle()
+    monitor.forget("a")
+    monitor.track("a")  # The first track's timer is still on the wheel, due at 30s
+    for _ in range(45):
+        clock.advance(1.0)
+        await settle()
+    assert fired == [("warning", 30.0)]  # Only the re-track's, at 40s
+    monitor.forget("a")
+    clock.advance(1.0)
+    await settle()
+
+
+async def test_failing_callback_does_not_stop_the_monitor(clock):
+    fired = []
+    
+    async def on_stage(key, stage, idle):
+        fired.append(key)
+        if key == "a":
+            raise ConnectionResetError("socket gone")
+    
+    monitor = HeartbeatMonitor(on_stage, clock=clock)
+    monitor.track("a")
+    clock.advance(5.0)
+    await settle()
+    monitor.track("b")
+    for _ in range(35):
+        clock.advance(1.0)
+        await settle()
+    assert fired == ["a", "b"]
+    assert not monitor._task.done()
+    monitor.forget("a")
+    monitor.forget("b")
+    clock.advance(1.0)
+    await settle()
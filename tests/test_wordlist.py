@@ -0,0 +1,21 @@
+"""Word list loading and validation."""
+
+from crucible.wordlist import WordList
+
+
+def test_missing_dictionary_warns_and_stays_strict(tmp_path, capsys):
+    words = WordList(str(tmp_path / "missing.txt"))
+    assert words.is_valid("apple")  # Built-in list
+    assert not words.is_valid("zqxjv")
+    assert words.source is None
+    assert "No word list found" in capsys.readouterr().out
+
+
+def test_word_file_is_used(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("Zebra\nzqxjv\nx\nnaïve\n")
+    words = WordList(str(path))
+    assert words.is_valid("zqxjv") and words.is_valid("zebra")
+    assert not words.is_valid("apple")  # Only the file's words
+    assert not words.is_valid("x") and not words.is_valid("naïve")
+    assert words.cursor().next_unused("z", {"zebra"}) == "zqxjv"
@@ -172,7 +172,8 @@ export class CrucibleApp extends LitElement {
 
   private connectWebSocket() {
     try {
-      this.ws = new WebSocket(`${WS_BASE}/ws/spectate`);
+      // The header only shows queue stats, so only listen to lobby events
+      this.ws = new WebSocket(`${WS_BASE}/ws/spectate?topics=lobby`);
 
       this.ws.onmessage = (event) => {
         const data = JSON.parse(event.data);
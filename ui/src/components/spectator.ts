@@ -1,6 +1,6 @@
 import { LitElement, html, css } from 'lit';
 import { customElement, property, state } from 'lit/decorators.js';
-import { API_BASE } from '../config.ts';
+import { WS_BASE } from '../config.ts';
 
 interface Tribute {
   id: string;
@@ -477,48 +477,105 @@ export class CrucibleSpectator extends LitElement {
 
   private arenaWidth = 0;
   private arenaHeight = 0;
-  private lastEventCount = 0;
+  private ws: WebSocket | null = null;
+  private seq: number | null = null;
+  private movementTimer?: number;
 
   connectedCallback() {
     super.connectedCallback();
-    this.fetchMatch();
-    setInterval(() => this.fetchMatch(), 1200);
-    setInterval(() => this.randomMovement(), 2000);
+    this.connectStream();
+    this.movementTimer = window.setInterval(() => this.randomMovement(), 2000);
   }
 
-  private async fetchMatch() {
-    try {
-      const res = await fetch(`${API_BASE}/api/match/${this.matchId}`);
-      const data = await res.json();
+  disconnectedCallback() {
+    super.disconnectedCallback();
+    window.clearInterval(this.movementTimer);
+    const ws = this.ws;
+    this.ws = null;
+    ws?.close();
+  }
 
-      // Check for phase change
-      if (this.match && this.match.phase !== data.phase) {
-        this.showAnnouncement(this.formatPhase(data.phase));
+  // Full snapshot on first connect (or after a gap), deltas after that.
+  // Reconnects resume from the last sequence number we applied.
+  private connectStream() {
+    const resume = this.seq !== null ? `?since=${this.seq}` : '';
+    const ws = new WebSocket(`${WS_BASE}/ws/match/${this.matchId}${resume}`);
+    this.ws = ws;
+
+    ws.onmessage = (event) => this.handleStream(JSON.parse(event.data));
+    ws.onclose = () => {
+      if (this.ws === ws) {
+        setTimeout(() => this.connectStream(), 2000);
       }
+    };
+  }
 
-      // Check for new events
-      const events = data.events || [];
-      if (events.length > this.lastEventCount) {
-        const newEvents = events.slice(this.lastEventCount);
-        for (const event of newEvents) {
-          this.processEvent(event, data.tributes);
-        }
-        this.lastEventCount = events.length;
+  private handleStream(msg: any) {
+    if (msg.type === 'snapshot') {
+      this.seq = msg.seq;
+      this.applySnapshot(msg.match);
+    } else if (msg.type === 'delta') {
+      if (this.seq === null || msg.since !== this.seq) {
+        // Out of step - drop the connection and resume from what we have
+        this.ws?.close();
+        return;
       }
+      this.seq = msg.seq;
+      this.applyDeltas(msg.changes);
+    } else if (msg.type === 'match_closed' || msg.type === 'error') {
+      this.ws = null;
+    }
+  }
 
-      // Initialize positions for new tributes
-      for (const tribute of data.tributes || []) {
-        if (!this.tributePositions.has(tribute.id)) {
-          this.tributePositions.set(tribute.id, {
-            x: 100 + Math.random() * 400,
-            y: 50 + Math.random() * 300
-          });
+  private applySnapshot(data: any) {
+    if (this.match && this.match.phase !== data.phase) {
+      this.showAnnouncement(this.formatPhase(data.phase));
+    }
+    for (const tribute of data.tributes || []) {
+      this.placeTribute(tribute);
+    }
+    this.match = data;
+  }
+
+  private applyDeltas(changes: any[]) {
+    if (!this.match) return;
+
+    const match = { ...this.match, tributes: [...(this.match.tributes || [])], events: [...(this.match.events || [])] };
+    const newEvents: any[] = [];
+
+    for (const change of changes) {
+      if (change.op === 'tribute') {
+        match.tributes = match.tributes.map((t: Tribute) => t.id === change.id ? { ...t, ...change.changes } : t);
+      } else if (change.op === 'tribute_add') {
+        match.tributes.push(change.tribute);
+        this.placeTribute(change.tribute);
+      } else if (change.op === 'event') {
+        match.events.push(change.event);
+        newEvents.push(change.event);
+      } else if (change.op === 'match') {
+        if (change.changes.phase && change.changes.phase !== match.phase) {
+          this.showAnnouncement(this.formatPhase(change.changes.phase));
         }
+        Object.assign(match, change.changes);
       }
+    }
+
+    match.events = match.events.slice(-20);
+    match.tribute_count = match.tributes.length;
+    match.alive_count = match.tributes.filter((t: Tribute) => t.status === 'alive').length;
+    this.match = match;
+
+    for (const event of newEvents) {
+      this.processEvent(event, match.tributes);
+    }
+  }
 
-      this.match = data;
-    } catch (e) {
-      console.error('Failed to fetch:', e);
+  private placeTribute(tribute: Tribute) {
+    if (!this.tributePositions.has(tribute.id)) {
+      this.tributePositions.set(tribute.id, {
+        x: 100 + Math.random() * 400,
+        y: 50 + Math.random() * 300
+      });
     }
   }
 